@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline artikel sekali jalan: Generate -> Humanize -> Tidy yang tumpang tindih.
+
+Draft dari generasi dipotong per paragraf begitu paragrafnya selesai, lalu
+tiap paragraf langsung di-humanize dan dirapihkan di thread pool sementara
+generasi masih jalan. Paragraf final keluar sesuai urutan aslinya.
+
+Ada juga pemecah artikel jadi jendela (window) yang dibatasi jumlah token,
+dipakai humanize paralel untuk artikel panjang.
+"""
+import re
+from collections import deque
+
+from concurrent_streams import make_executor
+from tidy_engine import ParagraphBuffer, split_paragraphs
+
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_long_paragraph(paragraph: str, max_chars: int) -> list:
+    """Pecah paragraf yang kepanjangan di batas kalimat (kalimat yang kepanjangan dibiarkan utuh)."""
+    if len(paragraph) <= max_chars:
+        return [paragraph]
+    pieces = []
+    current = ''
+    for sentence in _SENTENCE_BREAK_RE.split(paragraph):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_into_windows(text: str, max_chars: int) -> list:
+    """
+    Kelompokkan paragraf jadi jendela yang panjangnya maksimal `max_chars`.
+
+    Paragraf nggak pernah dipotong kecuali dia sendiri lebih panjang dari
+    `max_chars`; itu pun dipotong di batas kalimat.
+
+    Args:
+        text (str): Artikel lengkap.
+        max_chars (int): Batas karakter per jendela (jatah token x karakter per token).
+
+    Returns:
+        list: Tuple (teks jendela, pemisah ke jendela berikutnya). Pemisahnya
+        `'\\n\\n'` kalau jendela berakhir di batas paragraf, `' '` kalau di tengah
+        paragraf, dan `''` untuk jendela terakhir.
+    """
+    windows = []
+    current = []
+    size = 0
+    for paragraph in split_paragraphs(text):
+        pieces = _split_long_paragraph(paragraph, max_chars)
+        for piece_index, piece in enumerate(pieces):
+            if current and size + len(piece) > max_chars:
+                windows.append(['\n\n'.join(current), '\n\n' if piece_index == 0 else ' '])
+                current = []
+                size = 0
+            if piece_index > 0 and current:
+                current[-1] = f"{current[-1]} {piece}"  # Masih paragraf yang sama
+            else:
+                current.append(piece)
+            size += len(piece) + 2
+    if current:
+        windows.append(['\n\n'.join(current), ''])
+    return [tuple(window) for window in windows]
+
+
+def run_article_pipeline(draft_chunks, humanize, tidy, max_workers: int = 2, cancelled: tuple = ()):
+    """
+    Jalankan Generate -> Humanize -> Tidy secara streaming per paragraf.
+
+    Args:
+        draft_chunks (iterable): Potongan teks draft (misal stream generasi Ollama).
+        humanize (callable): `humanize(paragraf) -> str`. Boleh melempar exception.
+        tidy (callable): `tidy(teks) -> str`, dijalankan ke hasil humanize.
+        max_workers (int): Jumlah paragraf yang di-humanize bareng.
+        cancelled (tuple): Exception dari `humanize` yang artinya dibatalkan (bukan gagal):
+            paragrafnya nggak dikeluarkan sebagai final dan pipeline langsung berhenti.
+
+    Yields:
+        tuple: (tahap, teks, error). Tahap `'draft'` berisi chunk mentah dari
+        generasi; tahap `'final'` berisi satu paragraf yang sudah di-humanize &
+        dirapihkan, urut sesuai draft. Kalau humanize paragraf itu gagal, teksnya
+        pakai draft yang dirapihkan dan `error` berisi pesannya.
+
+    Raises:
+        Exception: Error dari `draft_chunks` (generasi gagal).
+    """
+    def _process(paragraph):
+        try:
+            return tidy(humanize(paragraph)), None
+        except cancelled:
+            raise
+        except Exception as e:
+            return tidy(paragraph), f"Humanize gagal: {e}"
+
+    buffer = ParagraphBuffer()
+    pending = deque()  # Future per paragraf, urut sesuai draft
+    executor = make_executor(max_workers, thread_name_prefix="wolf-article")
+    try:
+        for chunk in draft_chunks:
+            yield 'draft', chunk, None
+            for paragraph in buffer.feed(chunk):
+                pending.append(executor.submit(_process, paragraph))
+            # Keluarkan paragraf yang sudah beres tanpa nunggu generasi selesai
+            while pending and pending[0].done():
+                yield ('final',) + pending.popleft().result()
+        for paragraph in buffer.flush():
+            pending.append(executor.submit(_process, paragraph))
+        while pending:
+            yield ('final',) + pending.popleft().result()
+    except cancelled:
+        return # Hasil humanize yang kepotong nggak dianggap final
+    finally:
+        # Pipeline dihentikan (misal rerun): tutup stream generasi & buang antrian
+        close = getattr(draft_chunks, 'close', None)
+        if close is not None:
+            close()
+        executor.shutdown(wait=False, cancel_futures=True)
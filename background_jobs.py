@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Job background buat tugas panjang (artikel, humanize, audit massal).
+
+Job jalan di thread pool milik proses server, bukan di thread script
+Streamlit, jadi nggak ikut berhenti waktu script di-rerun atau tab browser
+putus. Output parsialnya ditampung di server (`Job.items`); UI cukup polling
+buffer itu lewat ID job dan bisa nyambung lagi kapan aja. Job yang sudah
+selesai disimpan sampai TTL-nya habis (di memori, plus cache disk kalau ada),
+jadi hasil inferensi yang sudah dibayar nggak hilang.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from generation_scheduler import CancelToken
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_ERROR = 'error'
+STATUS_CANCELLED = 'cancelled'
+FINISHED_STATUSES = (STATUS_DONE, STATUS_ERROR, STATUS_CANCELLED)
+
+
+class Job:
+    """
+    Satu job background beserta buffer output-nya. Aman dibaca dari thread lain
+    selagi job jalan.
+
+    Attributes:
+        id (str): ID job (buat nyambung lagi dari sesi lain / URL).
+        kind (str): Jenis job (misal `'article'`, `'humanize'`, `'audit'`).
+        label (str): Keterangan singkat buat ditampilkan.
+        owner: Pemilik job (misal ID klien browser).
+        status (str): `STATUS_*`.
+        items (list): Output parsial sesuai urutan keluar (chunk teks atau dict).
+        result: Hasil akhir (atau hasil parsial terakhir yang diset job).
+        error (str): Pesan error kalau gagal.
+        progress (tuple): (diterima, total) dari callback `track`.
+        queue_position (int): Posisi di antrean penjadwal generasi (0 = jalan).
+        detail (str): Keterangan progress tambahan.
+        cancel_token (CancelToken): Token batal job; oper ke helper generasi biar
+            generasi yang lagi antre / jalan (termasuk di thread worker) ikut berhenti.
+    """
+
+    def __init__(self, kind: str, label: str = None, owner=None, job_id: str = None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.label = label or kind
+        self.owner = owner
+        self.status = STATUS_QUEUED
+        self.items = []
+        self.result = None
+        self.error = None
+        self.progress = (0, None)
+        self.queue_position = 0
+        self.detail = ""
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_token = CancelToken()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self.cancel_token.cancelled
+
+    def cancel(self) -> None:
+        """Minta job berhenti (berlaku di chunk berikutnya; output yang sudah ada tetap disimpan)."""
+        self.cancel_token.cancel()
+
+    def emit(self, item) -> None:
+        """Tambah satu output parsial ke buffer."""
+        with self._lock:
+            self.items.append(item)
+
+    def read(self, offset: int = 0) -> list:
+        """Output parsial mulai indeks `offset` (buat polling bertahap)."""
+        with self._lock:
+            return self.items[offset:]
+
+    def text(self) -> str:
+        """Gabungan output parsial yang berupa teks."""
+        with self._lock:
+            return "".join(item for item in self.items if isinstance(item, str))
+
+    def track(self, received: int, total: int) -> None:
+        """Callback `on_progress(received, total)` helper generasi."""
+        self.progress = (received, total)
+
+    def queued(self, position: int) -> None:
+        """Callback `on_queue(posisi)` penjadwal generasi."""
+        self.queue_position = position
+
+    def iterate(self, iterable):
+        """
+        Iterasi `iterable` sampai habis atau job dibatalkan. Kalau dibatalkan,
+        generator sumbernya ditutup (misal stream Ollama ikut berhenti).
+        """
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                yield item
+                if self.cancel_requested:
+                    break
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def snapshot(self) -> dict:
+        """Keadaan job sebagai dict yang bisa di-serialize ke JSON."""
+        with self._lock:
+            items = list(self.items)
+        return {
+            'id': self.id, 'kind': self.kind, 'label': self.label, 'owner': self.owner, 'status': self.status,
+            'items': items, 'result': self.result, 'error': self.error, 'detail': self.detail,
+            'created_at': self.created_at, 'started_at': self.started_at, 'finished_at': self.finished_at,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> 'Job':
+        job = cls(data['kind'], data.get('label'), data.get('owner'), job_id=data['id'])
+        job.status = data['status']
+        job.items = data.get('items') or []
+        job.result = data.get('result')
+        job.error = data.get('error')
+        job.detail = data.get('detail') or ""
+        job.created_at = data.get('created_at') or job.created_at
+        job.started_at = data.get('started_at')
+        job.finished_at = data.get('finished_at')
+        return job
+
+    def status_row(self) -> dict:
+        """Ringkasan buat tabel daftar job."""
+        finished_at = self.finished_at or time.time()
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'label': self.label,
+            'status': self.status,
+            'output_items': len(self.items),
+            'seconds': round(finished_at - self.started_at, 1) if self.started_at else None,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """
+    Pengelola job background: antrean thread pool, daftar job per pemilik, dan
+    penyimpanan hasil sampai TTL habis.
+
+    Args:
+        max_workers (int): Job yang jalan bareng (generasi di dalamnya tetap
+            lewat penjadwal generasi bersama).
+        ttl_seconds (float): Umur job yang sudah selesai sebelum dibuang.
+        store (DiskCache): Tempat menyimpan job yang sudah selesai (biar tetap
+            bisa diambil setelah server restart). None = cuma di memori.
+        max_jobs (int): Batas job di memori; yang sudah selesai paling lama dibuang duluan.
+    """
+
+    def __init__(self, max_workers: int = 4, ttl_seconds: float = 6 * 3600, store=None, max_jobs: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wolf-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, run, label: str = None, owner=None) -> Job:
+        """
+        Jadwalkan job baru.
+
+        Args:
+            kind (str): Jenis job.
+            run (callable): `run(job) -> hasil`. Output parsial ditulis lewat
+                `job.emit`; exception bikin job berstatus error (output parsial tetap ada).
+            label (str): Keterangan singkat.
+            owner: Pemilik job (buat `jobs(owner)`).
+
+        Returns:
+            Job: Job yang baru dibuat (statusnya `queued` sampai dapat thread).
+        """
+        job = Job(kind, label, owner)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, run)
+        return job
+
+    def _run(self, job: Job, run) -> None:
+        if job.cancel_requested:
+            job.status = STATUS_CANCELLED
+        else:
+            job.status = STATUS_RUNNING
+            job.started_at = time.time()
+            try:
+                result = run(job)
+                if result is not None:
+                    job.result = result
+                job.status = STATUS_CANCELLED if job.cancel_requested else STATUS_DONE
+            except Exception as e:
+                job.error = str(e)
+                job.status = STATUS_ERROR
+                print(f"Job {job.kind} {job.id} gagal: {e}")  # Log error
+        job.queue_position = 0
+        job.finished_at = time.time()
+        if self.store is not None:
+            try:
+                self.store.set(job.id, job.snapshot())
+            except Exception as e:
+                print(f"Gagal simpan job {job.id}: {e}")  # Log error
+
+    def get(self, job_id: str):
+        """Job berdasarkan ID (dari memori, atau dari store kalau sudah nggak di memori). None kalau nggak ada."""
+        if not job_id:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        data = self.store.get(job_id) if self.store is not None else None
+        return Job.from_snapshot(data) if data else None
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def jobs(self, owner=None) -> list:
+        """Job di memori (milik `owner` kalau diisi), yang terbaru duluan."""
+        with self._lock:
+            self._prune()
+            jobs = [job for job in self._jobs.values() if owner is None or job.owner == owner]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def _prune(self) -> None:
+        """Buang job selesai yang TTL-nya habis, lalu yang paling lama kalau kebanyakan (panggil dengan lock)."""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and now - job.finished_at > self.ttl_seconds:
+                del self._jobs[job_id]
+        finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda job: job.finished_at)
+        while len(self._jobs) > self.max_jobs and finished:
+            del self._jobs[finished.pop(0).id]
+
+    def status(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in (STATUS_QUEUED, STATUS_RUNNING) + FINISHED_STATUSES}
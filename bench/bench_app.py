@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark overhead aplikasi terhadap server Ollama palsu & server HTML lokal.
+
+Fungsi tugas dari `seo_tasks` (keyword, meta title, SEO pack JSON, humanize, tidy,
+analisis SEO, cek SEO otomatis tanpa AI) dijalankan di beberapa level konkurensi. Yang dilaporkan:
+latensi p50/p95, TTFT p50, throughput, dan peak memory (tracemalloc), plus waktu
+import & run script penuh pertama (startup). Hasilnya disimpan sebagai JSON supaya bisa dibandingkan antar versi.
+
+Contoh:
+    python bench/bench_app.py                                  # Semua skenario, konkurensi 1/4/16
+    python bench/bench_app.py --scenarios keywords tidy --concurrency 1 8
+    python bench/bench_app.py --compare bench/results/lama.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from bench_tidy import make_article  # noqa: E402
+from fake_ollama import FakeOllamaServer  # noqa: E402
+from html_fixtures import HtmlFixtureServer  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SCENARIOS = ("keywords", "meta_title", "seo_pack", "humanize", "tidy", "analyze", "seo_rules")
+
+
+def _percentile(values: list, percent: float) -> float:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def _consume_stream(generator) -> dict:
+    """Habiskan generator stream; catat TTFT (chunk pertama) dan jumlah chunk."""
+    started = time.perf_counter()
+    ttft = None
+    chunks = 0
+    for _ in generator:
+        if ttft is None:
+            ttft = time.perf_counter() - started
+        chunks += 1
+    return {'ttft': ttft, 'chunks': chunks}
+
+
+def make_tasks(tasks_module, fixtures: HtmlFixtureServer) -> dict:
+    """Fungsi per skenario: `task(i) -> dict` (i = nomor request, biar prompt unik & nggak kena cache)."""
+    article = make_article(3000, seed=1, messy=False)
+    long_article = make_article(20000, seed=2)
+    return {
+        'keywords': lambda i: _consume_stream(tasks_module.stream_keywords(f"topik benchmark {i}", 10)),
+        'meta_title': lambda i: _consume_stream(tasks_module.stream_meta_title(f"topik benchmark {i}", 60)),
+        'seo_pack': lambda i: {'ttft': None, 'chunks': tasks_module.generate_seo_pack(f"topik benchmark {i}", 10, 3)['calls']},
+        'humanize': lambda i: _consume_stream(tasks_module.humanize_text(f"{i}. {article}")),
+        'tidy': lambda i: {'ttft': None, 'chunks': len(tasks_module.tidy_text(long_article))},
+        'analyze': lambda i: {'ttft': None, 'chunks': len(tasks_module.analyze_url(fixtures.page_url(i % fixtures.pages))['analysis'])},
+        'seo_rules': lambda i: {'ttft': None, 'chunks': tasks_module.analyze_url(fixtures.page_url(i % fixtures.pages),
+                                                                                mode='metrics')['rules']['words']},
+    }
+
+
+def measure_startup(runs: int = 3) -> dict:
+    """
+    Waktu satu run script penuh (`AppTest`, tanpa browser): run pertama (cold, termasuk
+    semua `cache_resource`) dan median run berikutnya di sesi baru.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    durations = []
+    for _ in range(max(runs, 1)):
+        app_test = AppTest.from_file(os.path.join(REPO_DIR, "streamlit_app.py"), default_timeout=120)
+        started = time.perf_counter()
+        app_test.run()
+        durations.append(time.perf_counter() - started)
+    return {
+        'first_run_seconds': round(durations[0], 3),
+        'warm_run_seconds': round(statistics.median(durations[1:]), 3) if len(durations) > 1 else None,
+    }
+
+
+def run_level(task, requests: int, concurrency: int) -> dict:
+    """Jalankan `requests` panggilan dengan `concurrency` worker, ukur latensi & memori."""
+    latencies = []
+    ttfts = []
+    errors = 0
+
+    def _one(i):
+        started = time.perf_counter()
+        result = task(i)
+        return time.perf_counter() - started, result
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(_one, i) for i in range(requests)]
+        for future in futures:
+            try:
+                latency, result = future.result()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(latency)
+            if result.get('ttft') is not None:
+                ttfts.append(result['ttft'])
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': errors,
+        'wall_seconds': round(wall, 3),
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else None,
+        'p50_seconds': round(_percentile(latencies, 50), 4) if latencies else None,
+        'p95_seconds': round(_percentile(latencies, 95), 4) if latencies else None,
+        'ttft_p50_seconds': round(statistics.median(ttfts), 4) if ttfts else None,
+        'peak_memory_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    baseline_rows = {}
+    if baseline:
+        for row in baseline.get('rows', []):
+            baseline_rows[(row['scenario'], row['concurrency'])] = row
+    header = f"{'skenario':<11} {'konk':>4} {'p50 (s)':>9} {'p95 (s)':>9} {'ttft p50':>9} {'req/s':>8} {'peak MB':>8} {'error':>5}"
+    if baseline_rows:
+        header += f" {'p50 vs lama':>12}"
+    print(header)
+    def _cell(value, width, digits=4):
+        return f"{value:>{width}.{digits}f}" if value is not None else f"{'-':>{width}}"
+
+    for row in results['rows']:
+        line = (f"{row['scenario']:<11} {row['concurrency']:>4} {_cell(row['p50_seconds'], 9)} {_cell(row['p95_seconds'], 9)} "
+                f"{_cell(row['ttft_p50_seconds'], 9)} {_cell(row['throughput_rps'], 8, 2)} {row['peak_memory_mb']:>8.2f} {row['errors']:>5}")
+        old = baseline_rows.get((row['scenario'], row['concurrency']))
+        if old and old.get('p50_seconds') and row['p50_seconds']:
+            line += f" {row['p50_seconds'] / old['p50_seconds']:>11.2f}x"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark overhead aplikasi dengan server Ollama palsu")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="Jumlah request per skenario per level")
+    parser.add_argument("--tps", type=float, default=200.0, help="Token per detik server palsu")
+    parser.add_argument("--ttft", type=float, default=0.05, help="TTFT server palsu (detik)")
+    parser.add_argument("--parallel", type=int, default=4, help="Slot paralel server palsu")
+    parser.add_argument("--max-tokens", type=int, default=128)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--startup-runs", type=int, default=3, help="Jumlah run script penuh buat ukur waktu startup (0 = lewati)")
+    parser.add_argument("--output", help="Path JSON hasil (default: bench/results/<waktu>-<rev>.json)")
+    parser.add_argument("--compare", help="JSON hasil lama buat dibandingkan")
+    args = parser.parse_args()
+
+    with FakeOllamaServer(tokens_per_second=args.tps, ttft=args.ttft, max_tokens=args.max_tokens,
+                          parallel=args.parallel, error_rate=args.error_rate) as ollama, HtmlFixtureServer() as fixtures:
+        # Harus diset sebelum seo_tasks di-import (konfigurasinya dibaca saat import)
+        os.environ["OLLAMA_HOST"] = ollama.url
+        os.environ["WOLF_CACHE_DIR"] = tempfile.mkdtemp(prefix="wolf-bench-")
+        os.environ["WOLF_GENERATION_CACHE"] = "0"  # Ukur jalur generasi, bukan replay cache
+        os.environ["WOLF_METRICS_LOG"] = ""
+        os.environ["WOLF_MODEL_WARMUP"] = "0"  # Warm-up nggak ngeblok, tapi jangan ikut makan slot server
+
+        import_started = time.perf_counter()
+        import seo_tasks
+        import_seconds = time.perf_counter() - import_started
+        import streamlit.logger
+        streamlit.logger.set_log_level("error")  # Mode bare Streamlit (AppTest) berisik soal ScriptRunContext
+        startup = measure_startup(args.startup_runs) if args.startup_runs else None
+
+        tasks = make_tasks(seo_tasks, fixtures)
+        rows = []
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                row = {'scenario': scenario}
+                row.update(run_level(tasks[scenario], args.requests, concurrency))
+                rows.append(row)
+                print(f"  {scenario} @ {concurrency}: p50 {row['p50_seconds']}s, {row['throughput_rps']} req/s", file=sys.stderr)
+
+    results = {
+        'revision': _git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'import_seconds': round(import_seconds, 3),
+        'startup': startup,
+        'server': {'tps': args.tps, 'ttft': args.ttft, 'parallel': args.parallel, 'max_tokens': args.max_tokens,
+                   'error_rate': args.error_rate},
+        'requests_per_level': args.requests,
+        'rows': rows,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print(f"Revisi {results['revision']}, import seo_tasks: {results['import_seconds']}s")
+    if startup:
+        print(f"Run script pertama: {startup['first_run_seconds']}s, run berikutnya: {startup['warm_run_seconds']}s")
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{results['revision']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=1)
+    print(f"Hasil disimpan: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark & cek golden untuk mesin "Rapihkan Teks".
+
+Contoh:
+    python bench/bench_tidy.py --check        # Bandingkan output dengan korpus golden
+    python bench/bench_tidy.py                # Benchmark 10k-100k karakter
+    python bench/bench_tidy.py --regen-golden # Tulis ulang golden dari implementasi lama
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tidy_engine import TidyEngine  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tidy_golden.json")
+
+
+def legacy_tidy(text_to_tidy: str) -> str:
+    """Implementasi `tidy_text` lama (baseline benchmark & sumber korpus golden)."""
+    cleaned_text = re.sub(r'[ \t]+', ' ', text_to_tidy)
+    cleaned_text = re.sub(r' +\n', '\n', cleaned_text)
+    cleaned_text = re.sub(r'\n +', '\n', cleaned_text)
+    cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
+    cleaned_text = re.sub(r'\s*([.,!?])\s*', r'\1 ', cleaned_text)
+    cleaned_text = re.sub(r'([.,!?]) $', r'\1', cleaned_text.strip())
+    cleaned_text = re.sub(r'\b(\w+)\s*-\s*(\w+)\b', r'\1-\2', cleaned_text)
+    replacements = {
+        r"\baku arium\b": "akuarium",
+        r"\bper hatian\b": "perhatian",
+        r"\bng gak\b": "nggak",
+        r"\bgak\b": "tidak",
+        r"\bgimana\b": "bagaimana"
+    }
+    for pattern, replacement in replacements.items():
+        cleaned_text = re.sub(pattern, replacement, cleaned_text, flags=re.IGNORECASE)
+    sentences = re.split('(?<=[.!?]) +', cleaned_text)
+    cleaned_text = ' '.join(sentence.capitalize() for sentence in sentences)
+    return cleaned_text.strip()
+
+
+_WORDS = ("slot gacor hari ini nih gue mau ngomongin soal *mood* yang pengen main game bikin happy "
+          "aku arium per hatian ng gak gak gimana kita semua tahu chance menang pola sequence "
+          "beneran arti e-commerce on - line Jakarta SEO keyword artikel").split()
+_MESSY_SEPARATORS = [" ", " ", " ", "  ", "\t", " , ", ". ", " .", "! ", " ?", "\n", "\n\n\n", " \n ", " - "]
+# Output LLM biasanya: kebanyakan spasi tunggal, sesekali tanda baca / paragraf / spasi nyasar
+_LLM_SEPARATORS = [" "] * 40 + [", ", ", ", ". ", ". ", "? ", ".\n\n", "  ", " ,", " - "]
+
+
+def make_article(length: int, seed: int = 0, messy: bool = True) -> str:
+    """
+    Bikin artikel sintetis sepanjang `length` karakter.
+
+    Args:
+        messy (bool): True = spasi & tanda baca berantakan di hampir tiap kata
+            (kasus terburuk), False = mirip output LLM biasa.
+    """
+    rng = random.Random(seed)
+    separators = _MESSY_SEPARATORS if messy else _LLM_SEPARATORS
+    parts = []
+    size = 0
+    while size < length:
+        part = rng.choice(_WORDS) + rng.choice(separators)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:length]
+
+
+def golden_inputs() -> list:
+    """Input korpus golden: kasus tepi + teks sintetis dengan seed tetap."""
+    inputs = [
+        "oke, ini dia teks yang sudah diubah gaya bahasa santai, alami, dan mudah dimengerti.\n\n"
+        "gue mau ngomongin \"slot gacor hari ini, \" nih, biar nggak bosen-bosen. \n"
+        "bayangin, kadang kita punya *mood* yang pengen main *game* yang bikin happy. jadi, arti \"gacor\"? \n",
+        "halo   dunia\t\tini  tes .",
+        "baris satu  \n   baris dua\n\n\n\n\nbaris tiga",
+        "tanda baca ,tanpa spasi.dan!gimana?ok",
+        "kata - kata dan on -line serta e- mail",
+        "rantai a - b - c - d - e dan x-y - z",
+        "Aku Arium, PER HATIAN, ng gak, Gak, GIMANA.",
+        "ngegak gakgak gak-gak nggak",
+        "JAKARTA adalah IBU KOTA. bandung juga KOTA!",
+        "   \n\n  spasi di awal dan akhir  \n\n  ",
+        "titik...banyak!!! tanya??? koma,,,",
+        "\"kutipan\" di awal. 'kutip' lagi? (kurung) juga!",
+        "angka 1.000.000 dan 3,14 serta 10 - 20",
+        "baris\r\nwindows\r\n\r\n\r\nlagi",
+        "unicode nbsp dan　ideografik . selesai",
+        "huruf khusus: gımana, ſ, İstanbul, KELVIN \u212a, ΟΔΟΣ. ǆungla",
+        "x",
+        ".",
+    ]
+    rng = random.Random(7)
+    for length in (200, 1000, 5000):
+        inputs.append(make_article(length, seed=length))
+    for _ in range(30):
+        inputs.append(make_article(rng.randint(20, 300), seed=rng.randint(0, 10 ** 6)))
+    return inputs
+
+
+def regen_golden() -> None:
+    corpus = [{"input": text, "expected": legacy_tidy(text)} for text in golden_inputs()]
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=1)
+    print(f"Golden ditulis: {len(corpus)} kasus -> {GOLDEN_PATH}")
+
+
+def check_golden() -> int:
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    engine = TidyEngine()
+    outputs = engine.tidy_many(case["input"] for case in corpus)
+    failures = [i for i, (case, output) in enumerate(zip(corpus, outputs)) if output != case["expected"]]
+    for i in failures:
+        print(f"BEDA di kasus #{i}:\n  input    : {corpus[i]['input']!r}\n  expected : {corpus[i]['expected']!r}\n  hasil    : {outputs[i]!r}")
+    print(f"Golden: {len(corpus) - len(failures)}/{len(corpus)} cocok")
+    return 1 if failures else 0
+
+
+def _best_of(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmark(lengths, repeat: int) -> None:
+    engine = TidyEngine()
+    print(f"{'profil':>7} {'karakter':>10} {'lama (ms)':>12} {'engine (ms)':>12} {'speedup':>8}")
+    for messy in (False, True):
+        for length in lengths:
+            text = make_article(length, seed=length, messy=messy)
+            if legacy_tidy(text) != engine.tidy(text):
+                print(f"PERINGATAN: output beda untuk artikel {length} karakter")
+            legacy_seconds = _best_of(legacy_tidy, text, repeat)
+            engine_seconds = _best_of(engine.tidy, text, repeat)
+            print(f"{'messy' if messy else 'llm':>7} {length:>10} {legacy_seconds * 1000:>12.2f} "
+                  f"{engine_seconds * 1000:>12.2f} {legacy_seconds / engine_seconds:>7.2f}x")
+
+    articles = [make_article(length, seed=i, messy=False) for i, length in enumerate(lengths * 10)]
+    started = time.perf_counter()
+    for article in articles:
+        legacy_tidy(article)
+    legacy_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    engine.tidy_many(articles)
+    engine_seconds = time.perf_counter() - started
+    print(f"tidy_many ({len(articles)} artikel): lama {legacy_seconds:.3f}s, engine {engine_seconds:.3f}s "
+          f"({legacy_seconds / engine_seconds:.2f}x)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark & cek golden TidyEngine")
+    parser.add_argument("--check", action="store_true", help="Cek output dengan korpus golden")
+    parser.add_argument("--regen-golden", action="store_true", help="Tulis ulang korpus golden dari implementasi lama")
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah pengulangan per ukuran (diambil yang tercepat)")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10_000, 30_000, 100_000])
+    args = parser.parse_args()
+
+    if args.regen_golden:
+        regen_golden()
+        return 0
+    if args.check:
+        return check_golden()
+    run_benchmark(args.lengths, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
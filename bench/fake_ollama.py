@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Server Ollama palsu buat benchmark: ngomong protokol streaming `/api/generate`,
+`/api/chat`, plus `/api/embed`, `/api/tags`, dan `/api/ps`, dengan kecepatan token, TTFT, slot paralel, dan
+error yang bisa diatur. Request dengan `format` dibalas objek JSON sesuai schema-nya. Jadi overhead aplikasi bisa diukur tanpa tergantung
+kecepatan model.
+
+Contoh:
+    python bench/fake_ollama.py --port 11434 --tps 50 --ttft 0.2
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBED_DIMENSIONS = 64
+_WORDS = ("oke jadi gini ya keyword seo artikel konten topik kopi santai banget nih "
+          "pembaca google halaman judul deskripsi menarik coba cek lagi").split()
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Klien yang nutup koneksi di tengah itu normal (cancel / jatah teks penuh)
+
+
+class FakeOllamaServer:
+    """
+    Server HTTP lokal yang meniru Ollama.
+
+    Args:
+        host (str): Alamat bind.
+        port (int): Port (0 = pilih port kosong otomatis).
+        tokens_per_second (float): Kecepatan token per request.
+        ttft (float): Jeda sebelum token pertama (detik), termasuk "prompt eval".
+        max_tokens (int): Batas token respons (selain `num_predict` dari request).
+        parallel (int): Jumlah request yang dilayani bareng (seperti OLLAMA_NUM_PARALLEL);
+            sisanya antre.
+        error_rate (float): Peluang request dibalas HTTP 500.
+        load_seconds (float): Waktu "load model" di request pertama.
+        seed (int): Seed buat error acak.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, tokens_per_second: float = 100.0,
+                 ttft: float = 0.05, max_tokens: int = 128, parallel: int = 4, error_rate: float = 0.0,
+                 load_seconds: float = 0.0, seed: int = 0):
+        self.tokens_per_second = tokens_per_second
+        self.ttft = ttft
+        self.max_tokens = max_tokens
+        self.error_rate = error_rate
+        self.load_seconds = load_seconds
+        self.model = 'gemma3:1b'
+        self.requests_served = 0
+        self._slots = threading.BoundedSemaphore(parallel)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._prefixes = set()  # System prompt yang "sudah ada di KV cache"
+        self._httpd = _QuietHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests_served += 1
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _load_delay(self) -> float:
+        with self._lock:
+            if self._loaded:
+                return 0.0
+            self._loaded = True
+            return self.load_seconds
+
+    def _prefix_cached(self, system: str) -> bool:
+        """Tiru KV cache awalan Ollama: system prompt yang sama kedua kalinya nggak dievaluasi ulang."""
+        if not system:
+            return False
+        with self._lock:
+            if system in self._prefixes:
+                return True
+            self._prefixes.add(system)
+            return False
+
+    def _tokens(self, prompt: str, num_predict) -> list:
+        count = self.max_tokens if not num_predict or num_predict < 0 else min(self.max_tokens, num_predict)
+        rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+        return [rng.choice(_WORDS) + (', ' if rng.random() < 0.1 else ' ') for _ in range(count)]
+
+    def _json_tokens(self, prompt: str, schema, num_predict) -> list:
+        """Output `format` JSON: objek sesuai schema (array string / string per properti), dipotong per ±4 karakter."""
+        rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+
+        def _phrase():
+            return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 6)))
+
+        properties = schema.get('properties', {}) if isinstance(schema, dict) else {}
+        value = {}
+        for name, spec in (properties or {'response': {'type': 'string'}}).items():
+            if spec.get('type') == 'array':
+                value[name] = [_phrase() for _ in range(spec.get('minItems') or 3)]
+            else:
+                value[name] = _phrase()
+        text = json.dumps(value, ensure_ascii=False)
+        count = self.max_tokens if not num_predict or num_predict < 0 else min(self.max_tokens, num_predict)
+        return [text[i:i + 4] for i in range(0, len(text), 4)][:count]
+
+    @staticmethod
+    def _apply_stop(tokens: list, stop) -> list:
+        """Opsi `stop`: output berhenti sebelum urutan stop pertama (urutannya sendiri nggak ikut), seperti Ollama."""
+        text = "".join(tokens)
+        cut = min([index for index in (text.find(sequence) for sequence in stop or [] if sequence) if index >= 0],
+                  default=None)
+        if cut is None:
+            return tokens
+        kept, length = [], 0
+        for token in tokens:
+            if length + len(token) >= cut:
+                kept.append(token[:cut - length])
+                break
+            kept.append(token)
+            length += len(token)
+        return [token for token in kept if token]
+
+    def _embedding(self, text: str) -> list:
+        """Vektor tiruan: jumlah vektor acak per kata, jadi teks yang kata-katanya mirip juga vektornya mirip."""
+        vector = [0.0] * EMBED_DIMENSIONS
+        for word in text.lower().split():
+            rng = random.Random(hashlib.sha256(word.encode('utf-8')).digest())
+            for i in range(EMBED_DIMENSIONS):
+                vector[i] += rng.gauss(0, 1)
+        return vector
+
+    def _final_stats(self, prompt: str, tokens: list, load_delay: float, eval_seconds: float, total_seconds: float,
+                     evaluated_chars: int = None) -> dict:
+        return {
+            'done': True,
+            'done_reason': ('stop' if len(tokens) < self.max_tokens else 'length') if prompt else 'load',
+            'total_duration': int(total_seconds * 1e9),
+            'load_duration': int(load_delay * 1e9),
+            'prompt_eval_count': max(1, (len(prompt) if evaluated_chars is None else evaluated_chars) // 4),
+            'prompt_eval_duration': int(self.ttft * 1e9),
+            'eval_count': len(tokens),
+            'eval_duration': int(eval_seconds * 1e9),
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith('/api/tags'):
+                    self._send_json(200, {'models': [{'name': server.model, 'model': server.model}]})
+                elif self.path.startswith('/api/ps'):
+                    loaded = [{'name': server.model, 'model': server.model, 'size': 0}] if server._loaded else []
+                    self._send_json(200, {'models': loaded})
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if self.path.startswith('/api/generate'):
+                    self._generate(request, chat=False)
+                elif self.path.startswith('/api/chat'):
+                    self._generate(request, chat=True)
+                elif self.path.startswith('/api/embed'):
+                    self._embed(request)
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def _generate(self, request: dict, chat: bool):
+                if server._should_fail():
+                    self._send_json(500, {'error': 'fake ollama: simulated failure'})
+                    return
+                if chat:
+                    messages = request.get('messages', [])
+                    system = messages[0].get('content', '') if messages and messages[0].get('role') == 'system' else ''
+                    prompt = "\n".join(message.get('content', '') for message in messages)
+                else:
+                    system = request.get('system', '')
+                    prompt = request.get('prompt', '')
+                full_prompt = f"{system}\n\n{prompt}" if system and not chat else prompt
+                evaluated_chars = len(full_prompt) - (len(system) if server._prefix_cached(system) else 0)
+                options = request.get('options') or {}
+                num_predict = options.get('num_predict')
+                if request.get('format') and (chat or prompt):
+                    tokens = server._json_tokens(prompt, request['format'], num_predict)
+                elif chat or prompt:
+                    tokens = server._tokens(prompt, num_predict)
+                else:
+                    tokens = []  # Prompt kosong = cuma load model (warm-up), seperti Ollama asli
+                tokens = server._apply_stop(tokens, options.get('stop'))
+                stream = request.get('stream', True)
+                with server._slots:  # Antre kalau semua slot paralel kepakai
+                    started = time.perf_counter()
+                    load_delay = server._load_delay()
+                    time.sleep(load_delay + server.ttft)
+                    eval_started = time.perf_counter()
+                    if stream:
+                        self.send_response(200)
+                        self.send_header('Content-Type', 'application/x-ndjson')
+                        self.send_header('Transfer-Encoding', 'chunked')
+                        self.end_headers()
+                    interval = 1.0 / server.tokens_per_second if server.tokens_per_second else 0
+                    next_at = time.perf_counter()
+                    try:
+                        for token in tokens:
+                            next_at += interval
+                            delay = next_at - time.perf_counter()
+                            if delay > 0:
+                                time.sleep(delay)
+                            if stream:
+                                self._write_chunk(self._chunk(token, chat, done=False))
+                        final = self._chunk('' if stream else ''.join(tokens), chat, done=True)
+                        final.update(server._final_stats(full_prompt if prompt else '', tokens, load_delay,
+                                                         time.perf_counter() - eval_started, time.perf_counter() - started,
+                                                         evaluated_chars))
+                        if stream:
+                            self._write_chunk(final)
+                            self.wfile.write(b'0\r\n\r\n')
+                        else:
+                            self._send_json(200, final)
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass  # Klien nutup stream di tengah (misal cancel / berhenti lebih awal)
+
+            def _embed(self, request: dict):
+                if server._should_fail():
+                    self._send_json(500, {'error': 'fake ollama: simulated failure'})
+                    return
+                texts = request.get('input') or []
+                texts = [texts] if isinstance(texts, str) else texts
+                started = time.perf_counter()
+                with server._slots:
+                    time.sleep(server.ttft)
+                    embeddings = [server._embedding(text) for text in texts]
+                self._send_json(200, {
+                    'model': request.get('model'),
+                    'embeddings': embeddings,
+                    'total_duration': int((time.perf_counter() - started) * 1e9),
+                    'load_duration': 0,
+                    'prompt_eval_count': sum(max(1, len(text) // 4) for text in texts),
+                })
+
+            def _chunk(self, text: str, chat: bool, done: bool) -> dict:
+                chunk = {'model': server.model, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ'), 'done': done}
+                if chat:
+                    chunk['message'] = {'role': 'assistant', 'content': text}
+                else:
+                    chunk['response'] = text
+                return chunk
+
+            def _write_chunk(self, payload: dict):
+                line = (json.dumps(payload) + '\n').encode('utf-8')
+                self.wfile.write(f"{len(line):X}\r\n".encode('ascii') + line + b'\r\n')
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server Ollama palsu buat benchmark")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--tps", type=float, default=100.0, help="Token per detik per request")
+    parser.add_argument("--ttft", type=float, default=0.05, help="Jeda sebelum token pertama (detik)")
+    parser.add_argument("--max-tokens", type=int, default=128)
+    parser.add_argument("--parallel", type=int, default=4, help="Slot paralel (seperti OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--load-seconds", type=float, default=0.0, help="Waktu load model di request pertama")
+    args = parser.parse_args()
+    server = FakeOllamaServer(args.host, args.port, args.tps, args.ttft, args.max_tokens, args.parallel,
+                              args.error_rate, args.load_seconds)
+    print(f"Fake Ollama jalan di {server.url} (Ctrl+C buat berhenti)")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Server HTML lokal buat benchmark analisis SEO: halaman contoh (dengan nav,
+script, heading, paragraf) di `/page/<n>.html` plus `/sitemap.xml`.
+Mendukung ETag / If-None-Match, jadi jalur 304 juga bisa diukur.
+"""
+import hashlib
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_WORDS = ("kopi arabika robusta seduh manual barista rasa aroma biji sangrai "
+          "petani kebun harga pasar tips cara memilih terbaik untuk pemula").split()
+
+
+def make_page_html(index: int, paragraphs: int = 40) -> str:
+    """Halaman HTML sintetis yang mirip halaman artikel sungguhan (ada nav, script, style, footer)."""
+    rng = random.Random(index)
+
+    def _sentence():
+        return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+
+    body = []
+    for i in range(paragraphs):
+        if i % 8 == 0:
+            body.append(f"<h2>{_sentence()}</h2>")
+        body.append(f"<p>{' '.join(_sentence() for _ in range(4))} <a href='/page/{i}.html'>baca juga</a></p>")
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>Halaman kopi {index}</title>
+<meta name="description" content="Panduan kopi nomor {index} buat pemula.">
+<style>body {{ font-family: sans-serif; }} {'.x{color:red}' * 200}</style>
+<script>var tracking = {list(range(300))};</script></head>
+<body><header><nav>{' '.join(f"<a href='/m{i}'>Menu {i}</a>" for i in range(30))}</nav></header>
+<main><h1>Panduan kopi {index}</h1>{''.join(body)}</main>
+<footer>{'Hak cipta dilindungi. ' * 50}</footer></body></html>"""
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Klien yang nutup koneksi di tengah itu normal (cancel / jatah teks penuh)
+
+
+class HtmlFixtureServer:
+    """
+    Server halaman contoh.
+
+    Args:
+        pages (int): Jumlah halaman di sitemap.
+        port (int): Port (0 = otomatis).
+    """
+
+    def __init__(self, pages: int = 50, host: str = '127.0.0.1', port: int = 0):
+        self.pages = pages
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._httpd = _QuietHTTPServer((host, port), self._make_handler())
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page_url(self, index: int) -> str:
+        return f"{self.url}/page/{index}.html"
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, name="html-fixtures", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests_served += 1
+                if self.path == '/sitemap.xml':
+                    locs = ''.join(f"<url><loc>{server.page_url(i)}</loc></url>" for i in range(server.pages))
+                    self._send(200, f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>',
+                               'application/xml')
+                elif self.path.startswith('/page/'):
+                    index = int(self.path.rsplit('/', 1)[-1].split('.')[0])
+                    html = make_page_html(index)
+                    etag = '"' + hashlib.sha1(html.encode('utf-8')).hexdigest() + '"'
+                    if self.headers.get('If-None-Match') == etag:
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    self._send(200, html, 'text/html; charset=utf-8', {'ETag': etag})
+                else:
+                    self._send(404, 'not found', 'text/plain')
+
+            def _send(self, status, text, content_type, headers=None):
+                body = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Klien berhenti baca lebih awal (jatah teks sudah penuh)
+
+        return Handler
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Batas panjang output streaming dalam karakter (misal meta title 60 karakter).
+
+Potongan teks dari model dilewatkan ke `CharBudget.feed`; teks yang keluar
+dijamin nggak lewat batas dan berhenti di batas yang rapi (akhir kata, atau
+akhir kalimat kalau ada yang cukup panjang). Begitu batasnya kelewatan,
+`exhausted` jadi True dan pemanggil bisa langsung nutup stream Ollama, jadi
+token sisanya nggak perlu dibayar.
+
+Urutan stop (`stop`, misal baris baru buat judul) juga dicek di sini, bukan
+lewat opsi `stop` Ollama: model sering membuka jawaban dengan baris kosong,
+dan stop di sisi Ollama bakal bikin hasilnya kosong. Spasi/baris baru di awal
+dibuang dulu, baru urutan stop berikutnya yang mengakhiri teks.
+
+Teks yang sudah keluar nggak bisa ditarik lagi, jadi ujung yang belum pasti
+rapi ditahan dulu: kata yang belum selesai, dan (mode kalimat, setelah
+`SENTENCE_HOLD` bagian batas) kalimat yang belum selesai.
+"""
+import re
+
+BOUNDARY_WORD = 'word'
+BOUNDARY_SENTENCE = 'sentence'
+SENTENCE_HOLD = 0.6  # Mode kalimat: mulai bagian ini dari batas, teks ditahan sampai akhir kalimat
+MIN_SENTENCE_SHARE = 0.5  # Potong di akhir kalimat cuma kalau hasilnya minimal segini dari batas
+TRAILING_CHARS = ' \t\r\n,;:-–—(/'  # Dibuang dari ujung potongan biar nggak gantung
+
+_SENTENCE_END_RE = re.compile(r'[.!?…](?=\s|$)')
+
+
+def _last_space(text: str, end: int) -> int:
+    """Indeks spasi terakhir sebelum `end` (-1 kalau nggak ada)."""
+    return max(text.rfind(char, 0, end) for char in ' \t\r\n')
+
+
+def _last_sentence_end(text: str, end: int) -> int:
+    """Posisi tepat setelah akhir kalimat terakhir di `text[:end]` (0 kalau nggak ada)."""
+    ends = [match.end() for match in _SENTENCE_END_RE.finditer(text, 0, end)]
+    return ends[-1] if ends else 0
+
+
+class CharBudget:
+    """
+    Penjaga batas karakter buat satu stream teks.
+
+    Args:
+        max_chars (int): Batas panjang teks (spasi di awal nggak dihitung).
+        boundary (str): `BOUNDARY_WORD` (potong di akhir kata) atau
+            `BOUNDARY_SENTENCE` (utamakan akhir kalimat, kalau nggak ada baru akhir kata).
+        stop (tuple): Urutan yang mengakhiri teks (setelah spasi di awal).
+
+    Attributes:
+        exhausted (bool): True kalau output model sudah lewat batas atau ketemu urutan stop (stream boleh ditutup).
+        trimmed (bool): True kalau ada teks yang dibuang karena lewat batas.
+    """
+
+    def __init__(self, max_chars: int, boundary: str = BOUNDARY_WORD, stop: tuple = ()):
+        if boundary not in (BOUNDARY_WORD, BOUNDARY_SENTENCE):
+            raise ValueError(f"Boundary '{boundary}' nggak dikenal.")
+        self.max_chars = max(int(max_chars), 1)
+        self.boundary = boundary
+        self.stop = tuple(sequence for sequence in stop if sequence)
+        self.exhausted = False
+        self.trimmed = False
+        self._text = ""
+        self._emitted = 0
+
+    @property
+    def text(self) -> str:
+        """Teks yang sudah dilepas ke pemanggil."""
+        return self._text[:self._emitted]
+
+    def _release(self, end: int) -> str:
+        end = max(end, self._emitted)
+        released, self._emitted = self._text[self._emitted:end], end
+        return released
+
+    def _cut(self) -> int:
+        """Posisi potong yang rapi, paling jauh `max_chars`."""
+        if len(self._text) > self.max_chars and not self._text[self.max_chars].isspace():
+            space = _last_space(self._text, self.max_chars + 1)
+            cut = space if space > 0 else self.max_chars  # Satu kata kepanjangan: terpaksa potong di tengah
+        else:
+            cut = self.max_chars
+        if self.boundary == BOUNDARY_SENTENCE:
+            sentence_end = _last_sentence_end(self._text, cut)
+            if sentence_end >= self.max_chars * MIN_SENTENCE_SHARE:
+                cut = sentence_end
+        while cut > self._emitted and self._text[cut - 1] in TRAILING_CHARS:
+            cut -= 1
+        return cut
+
+    def feed(self, chunk: str) -> str:
+        """Tambah potongan dari model; balikin teks yang sudah aman ditampilkan (bisa string kosong)."""
+        if self.exhausted or not chunk:
+            return ""
+        self._text += chunk if self._text else chunk.lstrip()
+        stops = [index for index in (self._text.find(sequence) for sequence in self.stop) if index >= 0]
+        if stops:
+            self._text = self._text[:min(stops)].rstrip()
+            self.exhausted = True
+            if len(self._text) <= self.max_chars:
+                return self._release(len(self._text))
+        if len(self._text) > self.max_chars:
+            self.exhausted = True
+            self.trimmed = True
+            return self._release(self._cut())
+        safe = _last_space(self._text, len(self._text))
+        if self.boundary == BOUNDARY_SENTENCE and len(self._text) >= self.max_chars * SENTENCE_HOLD:
+            safe = min(safe, max(_last_sentence_end(self._text, len(self._text)), self._emitted))
+        return self._release(safe)
+
+    def flush(self) -> str:
+        """Sisa teks yang ditahan, dipanggil waktu stream selesai normal (masih di dalam batas)."""
+        if self.exhausted:
+            return ""
+        return self._release(len(self._text.rstrip()))
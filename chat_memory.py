@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Memori chat dengan jendela konteks yang dibatasi token.
+
+Pesan terbaru dikirim apa adanya, sedangkan giliran yang lebih lama diringkas
+di background jadi satu pesan "memori". Jendelanya bergeser per blok (bukan
+per giliran), jadi awalan prompt (system + ringkasan + pesan lama) tetap sama
+di antara dua ringkasan dan bisa dipakai ulang dari KV cache Ollama.
+"""
+import uuid
+
+DEFAULT_CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4  # Kira-kira token template per pesan (role, penanda giliran)
+
+
+def estimate_tokens(text: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """Perkiraan kasar jumlah token dari panjang teks."""
+    return int(len(text) / chars_per_token) + 1
+
+
+def messages_tokens(messages: list, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """Perkiraan token untuk daftar pesan chat (`{'role', 'content'}`)."""
+    return sum(estimate_tokens(message['content'], chars_per_token) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+class ChatMemory:
+    """
+    Riwayat chat lengkap (buat ditampilkan) plus ringkasan bergulir (buat prompt).
+
+    Args:
+        history_token_budget (int): Jatah token untuk pesan yang dikirim apa adanya.
+            Kalau lewat, separuh yang paling lama dijadwalkan untuk diringkas.
+        chars_per_token (float): Rasio karakter per token model (boleh diperbarui
+            begitu rasio model yang dipakai sudah terkalibrasi).
+    """
+
+    def __init__(self, history_token_budget: int = 1200, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        self.history_token_budget = history_token_budget
+        self.chars_per_token = chars_per_token
+        self.session_id = uuid.uuid4().hex  # Kunci sticky routing: satu obrolan = satu host Ollama
+        self.messages = []
+        self.summary = ""
+        self.summarized_upto = 0  # Pesan sebelum indeks ini sudah masuk ringkasan
+        self._pending = None  # (future ringkasan, indeks potong)
+
+    def add(self, role: str, content: str) -> None:
+        """Tambah pesan ke riwayat."""
+        self.messages.append({'role': role, 'content': content})
+
+    @property
+    def summarizing(self) -> bool:
+        """True kalau ringkasan lagi dibuat di background."""
+        return self._pending is not None
+
+    def poll(self) -> None:
+        """Pakai hasil ringkasan background kalau sudah selesai (gagal = dicoba lagi nanti)."""
+        if self._pending is None or not self._pending[0].done():
+            return
+        future, cut = self._pending
+        self._pending = None
+        try:
+            self.summary = future.result()
+            self.summarized_upto = cut
+        except Exception as e:
+            print(f"Ringkasan chat gagal: {e}")  # Log error
+
+    def build_messages(self, system_prompt: str) -> list:
+        """
+        Susun pesan untuk `client.chat`: system prompt, ringkasan (kalau ada),
+        lalu pesan yang belum diringkas.
+
+        Kalau ringkasan belum siap dan pesan terbaru sudah lewat jatah, pesan
+        paling lama dilewati dulu supaya prompt tetap dalam batas.
+
+        Returns:
+            list: Pesan siap kirim.
+        """
+        self.poll()
+        recent = self.messages[self.summarized_upto:]
+        while len(recent) > 1 and messages_tokens(recent, self.chars_per_token) > self.history_token_budget:
+            recent = recent[1:]
+        prefix = [{'role': 'system', 'content': system_prompt}]
+        if self.summary:
+            prefix.append({'role': 'system', 'content': f"Ringkasan obrolan sebelumnya:\n{self.summary}"})
+        return prefix + recent
+
+    def schedule_summary(self, executor, summarize) -> bool:
+        """
+        Jadwalkan ringkasan di background kalau pesan yang belum diringkas sudah lewat jatah.
+
+        Args:
+            executor (Executor): Executor buat menjalankan `summarize`.
+            summarize (callable): `summarize(ringkasan_lama, pesan) -> str`.
+
+        Returns:
+            bool: True kalau ringkasan baru dijadwalkan.
+        """
+        self.poll()
+        if self._pending is not None:
+            return False
+        recent = self.messages[self.summarized_upto:]
+        if messages_tokens(recent, self.chars_per_token) <= self.history_token_budget:
+            return False
+        # Sisakan pesan terbaru kira-kira separuh jatah, minimal satu giliran (user + asisten)
+        cut = len(self.messages)
+        kept_tokens = 0
+        while cut > self.summarized_upto:
+            kept_tokens += messages_tokens(self.messages[cut - 1:cut], self.chars_per_token)
+            if kept_tokens > self.history_token_budget // 2 and len(self.messages) - cut >= 2:
+                break
+            cut -= 1
+        # Jendela sebaiknya mulai dari pesan user
+        while cut < len(self.messages) - 1 and self.messages[cut]['role'] != 'user':
+            cut += 1
+        if cut <= self.summarized_upto:
+            return False
+        future = executor.submit(summarize, self.summary, self.messages[self.summarized_upto:cut])
+        self._pending = (future, cut)
+        return True
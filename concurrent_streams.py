@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Utilitas untuk menjalankan beberapa generator streaming (misal stream Ollama)
+secara bersamaan di thread pool, lalu menggabungkan potongan teksnya
+ke satu generator di thread pemanggil (thread script Streamlit).
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # Supaya fungsi @st.cache_resource dkk tetap kenal sesi yang lagi jalan
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Dipakai tanpa Streamlit
+    add_script_run_ctx = get_script_run_ctx = None
+
+_DONE = object()
+_END = object()
+
+
+def make_executor(max_workers: int, thread_name_prefix: str = "wolf") -> ThreadPoolExecutor:
+    """
+    Bikin ThreadPoolExecutor yang thread-nya membawa konteks script Streamlit
+    pemanggil (kalau ada).
+
+    Args:
+        max_workers (int): Jumlah worker maksimum.
+        thread_name_prefix (str): Prefix nama thread (buat log/debug).
+
+    Returns:
+        ThreadPoolExecutor: Executor siap pakai.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True) if get_script_run_ctx is not None else None
+
+    def _init_worker():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix, initializer=_init_worker)
+
+
+def multiplex_streams(streams: dict, max_workers: int = None):
+    """
+    Jalankan beberapa generator sekaligus dan gabungkan hasilnya sesuai urutan datang.
+
+    Args:
+        streams (dict): Mapping kunci -> generator yang menghasilkan chunk.
+        max_workers (int): Jumlah generator yang jalan bareng. Default: semuanya.
+
+    Yields:
+        tuple: (kunci, chunk) begitu chunk dari generator mana pun tersedia.
+
+    Raises:
+        Exception: Error pertama yang muncul dari salah satu generator.
+    """
+    if not streams:
+        return
+
+    chunk_queue = queue.Queue()
+    stop_event = threading.Event()
+
+    def _pump(key, generator):
+        try:
+            for chunk in generator:
+                if stop_event.is_set():
+                    break
+                chunk_queue.put((key, chunk))
+        except Exception as e:
+            chunk_queue.put((key, e))
+        finally:
+            generator.close()  # Tutup stream (dan koneksi HTTP-nya) kalau berhenti di tengah
+            chunk_queue.put((key, _DONE))
+
+    executor = make_executor(max_workers or len(streams), thread_name_prefix="wolf-stream")
+    try:
+        for key, generator in streams.items():
+            executor.submit(_pump, key, generator)
+
+        remaining = len(streams)
+        while remaining:
+            key, item = chunk_queue.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield key, item
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def ordered_streams(streams: list, max_workers: int = None):
+    """
+    Jalankan beberapa generator sekaligus, tapi keluarkan chunk-nya sesuai urutan list.
+
+    Chunk generator yang lagi "giliran" langsung diteruskan; generator sesudahnya
+    sudah jalan duluan dan chunk-nya ditampung sampai gilirannya tiba.
+
+    Args:
+        streams (list): Generator yang menghasilkan chunk, sesuai urutan output.
+        max_workers (int): Jumlah generator yang jalan bareng. Default: semuanya.
+
+    Yields:
+        tuple: (indeks generator, chunk) urut per generator.
+
+    Raises:
+        Exception: Error pertama yang muncul dari salah satu generator.
+    """
+    def _with_end(generator):
+        yield from generator
+        yield _END  # Penanda generator ini sudah habis
+
+    buffers = [[] for _ in streams]
+    finished = [False] * len(streams)
+    head = 0
+    wrapped = {index: _with_end(generator) for index, generator in enumerate(streams)}
+    for index, chunk in multiplex_streams(wrapped, max_workers):
+        if chunk is _END:
+            finished[index] = True
+        elif index == head:
+            yield index, chunk
+        else:
+            buffers[index].append(chunk)
+        # Giliran maju: keluarkan dulu tampungan generator berikutnya
+        while head < len(streams) and finished[head]:
+            head += 1
+            if head < len(streams):
+                for buffered in buffers[head]:
+                    yield head, buffered
+                buffers[head] = []
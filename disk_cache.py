@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Cache disk sederhana (content-addressed) untuk hasil yang mahal dibuat,
+misalnya generasi Ollama.
+
+Setiap entri disimpan sebagai satu file JSON yang namanya hash SHA-256
+dari kuncinya. Waktu modifikasi file dipakai sebagai penanda akses terakhir,
+jadi eviksi LRU tetap jalan walau cache dipakai beberapa proses sekaligus.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Bikin kunci cache yang stabil dari beberapa bagian (model, prompt, opsi, dll).
+
+    Args:
+        *parts: Nilai apa saja yang bisa di-serialize ke JSON.
+
+    Returns:
+        str: Hash SHA-256 (hex) dari bagian-bagian tersebut.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """
+    Cache key-value di disk dengan batas ukuran (eviksi LRU) dan TTL.
+
+    Args:
+        directory (str): Folder tempat file cache disimpan.
+        max_bytes (int): Batas total ukuran file cache. Entri yang paling lama
+            nggak diakses dibuang duluan kalau batas ini kelewat.
+        ttl_seconds (float): Umur maksimum entri sejak dibuat. `None` berarti
+            entri nggak pernah kedaluwarsa.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024, ttl_seconds=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> str:
+        # Sharding 2 karakter pertama supaya satu folder nggak kebanyakan file
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _scan(self):
+        """List semua entri sebagai (path, ukuran, mtime)."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Mungkin baru dihapus proses lain
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str):
+        """
+        Ambil nilai dari cache.
+
+        Args:
+            key (str): Kunci cache (biasanya dari `make_cache_key`).
+
+        Returns:
+            Nilai yang tersimpan, atau None kalau nggak ada / sudah kedaluwarsa.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry.get('created_at', 0) > self.ttl_seconds:
+            self.delete(key)
+            return None
+
+        try:
+            os.utime(path, None)  # Tandai baru diakses (buat LRU)
+        except OSError:
+            pass
+        return entry.get('value')
+
+    def set(self, key: str, value) -> None:
+        """
+        Simpan nilai ke cache, lalu buang entri lama kalau ukuran kelewat batas.
+
+        Args:
+            key (str): Kunci cache.
+            value: Nilai yang bisa di-serialize ke JSON.
+        """
+        path = self._path(key)
+        data = json.dumps({'created_at': time.time(), 'value': value}, ensure_ascii=False).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return  # Entri segede ini nggak layak di-cache
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            # Tulis ke file sementara lalu rename, biar pembaca nggak dapet file setengah jadi
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        """Hapus satu entri dari cache (kalau ada)."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self._total_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Kosongkan seluruh cache."""
+        with self._lock:
+            for path, _, _ in self._scan():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """Ringkasan isi cache (jumlah entri & total ukuran)."""
+        entries = self._scan()
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes}
+
+    def _evict(self) -> None:
+        """Buang entri paling lama nggak diakses sampai total ukuran di bawah ~90% batas."""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Penjadwal generasi lintas sesi: membatasi jumlah generasi yang jalan bareng
+(sesuai slot paralel Ollama), mendahulukan tugas interaktif yang pendek,
+membagi giliran secara adil antar sesi browser, dan menolak request baru
+kalau antrean sudah kepanjangan (daripada nunggu sampai timeout). Request
+yang dibatalkan (`CancelToken`) langsung keluar dari antrean.
+"""
+import itertools
+import threading
+from contextlib import contextmanager
+
+PRIORITY_INTERACTIVE = 0  # Tugas pendek yang ditunggu user (meta, keyword, chat)
+PRIORITY_NORMAL = 1  # Olah teks & analisis
+PRIORITY_BULK = 2  # Generasi panjang & kerjaan background (artikel, batch, ringkasan)
+
+
+class SchedulerFullError(Exception):
+    """Antrean generasi penuh; request ditolak."""
+
+
+class GenerationCancelled(Exception):
+    """Request dibatalkan (lewat `CancelToken`) sebelum dapat slot."""
+
+
+class CancelToken:
+    """
+    Tanda batal yang bisa dibagi ke beberapa generasi sekaligus (misal semua
+    jendela humanize satu job). Aman di-set dari thread lain (tombol batal di UI);
+    generasi yang pegang token berhenti di chunk berikutnya, dan yang masih
+    antre langsung keluar dari antrean.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+
+class GenerationScheduler:
+    """
+    Antrean prioritas dengan batas generasi bersamaan.
+
+    Urutan giliran: prioritas dulu, lalu "putaran" sesi (request ke-n dari satu
+    sesi baru jalan setelah sesi lain dapat giliran ke-n juga), lalu urutan datang.
+    Jadi satu sesi yang ngantre banyak request nggak bisa menyerobot sesi lain.
+
+    Args:
+        max_concurrent (int): Generasi yang boleh jalan bareng (idealnya total
+            `OLLAMA_NUM_PARALLEL` semua host).
+        max_queue (int): Maksimal request yang menunggu; lebih dari ini ditolak.
+            None = tanpa batas (misal CLI yang sudah membatasi jumlah job-nya sendiri).
+        poll_interval (float): Jeda update posisi antrean ke `on_wait` (detik).
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 32, poll_interval: float = 0.5):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max_queue
+        self.poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._counter = itertools.count()
+        self._waiting = {}  # seq -> kunci urutan
+        self._session_load = {}  # Sesi -> request yang lagi jalan / antre
+        self.running = 0
+
+    def _position(self, seq: int) -> int:
+        """Posisi (mulai 1) tiket `seq` di antrean."""
+        key = self._waiting[seq]
+        return 1 + sum(1 for other in self._waiting.values() if other < key)
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_NORMAL, session_key=None, on_wait=None, cancel: CancelToken = None):
+        """
+        Tunggu giliran, tahan satu slot selama blok `with` jalan.
+
+        Args:
+            priority (int): `PRIORITY_*`; angka kecil didahulukan.
+            session_key: ID sesi buat pembagian giliran yang adil.
+            on_wait (callable): `on_wait(posisi)` selama menunggu, lalu `on_wait(0)`
+                begitu dapat slot. Dipanggil di thread yang menunggu.
+            cancel (CancelToken): Token batal; dicek tiap `poll_interval` selama menunggu.
+
+        Raises:
+            SchedulerFullError: Kalau antrean sudah penuh.
+            GenerationCancelled: Kalau `cancel` di-set sebelum dapat slot.
+        """
+        with self._condition:
+            if self.max_queue is not None and len(self._waiting) >= self.max_queue:
+                raise SchedulerFullError(
+                    f"Antrean generasi lagi penuh ({len(self._waiting)} request nunggu). Coba lagi sebentar ya.")
+            seq = next(self._counter)
+            session_round = self._session_load.get(session_key, 0)
+            self._session_load[session_key] = session_round + 1
+            self._waiting[seq] = (priority, session_round, seq)
+        acquired = False
+        try:
+            with self._condition:
+                while True:
+                    if cancel is not None and cancel.cancelled:
+                        raise GenerationCancelled("Generasi dibatalkan sebelum dapat giliran.")
+                    if self.running < self.max_concurrent and self._position(seq) == 1:
+                        del self._waiting[seq]
+                        self.running += 1
+                        acquired = True
+                        self._condition.notify_all()  # Antrean berikutnya mungkin juga kebagian slot
+                        break
+                    position = self._position(seq)
+                    if on_wait is not None:
+                        self._condition.release()  # Callback (misal update UI) jangan nahan lock
+                        try:
+                            on_wait(position)
+                        finally:
+                            self._condition.acquire()
+                    self._condition.wait(self.poll_interval)
+            if on_wait is not None:
+                on_wait(0)
+            yield
+        finally:
+            with self._condition:
+                if acquired:
+                    self.running -= 1
+                else:
+                    self._waiting.pop(seq, None)  # Batal saat nunggu (misal sesi rerun)
+                remaining = self._session_load.get(session_key, 1) - 1
+                if remaining > 0:
+                    self._session_load[session_key] = remaining
+                else:
+                    self._session_load.pop(session_key, None)
+                self._condition.notify_all()
+
+    def status(self) -> dict:
+        with self._condition:
+            return {'running': self.running, 'waiting': len(self._waiting), 'max_concurrent': self.max_concurrent,
+                    'max_queue': self.max_queue}
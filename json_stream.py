@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Parser incremental buat satu objek JSON yang datang per potongan (output
+Ollama dengan `format` JSON).
+
+Teks dipindai sekali, karakter demi karakter, sambil ngelacak string, escape,
+dan kedalaman kurung. Begitu satu elemen array di level pertama (misal satu
+keyword di `"keywords": [...]`) atau satu field selesai, langsung jadi event,
+jadi UI bisa ngisi tiap bagian tanpa nunggu objeknya lengkap. Teks di luar
+objek (misal kalimat pembuka model) diabaikan.
+"""
+import json
+
+_WHITESPACE = ' \t\r\n'
+
+
+class JsonObjectStream:
+    """
+    Umpankan potongan teks lewat `feed`; tiap pemanggilan balikin event baru:
+
+    - `('item', key, index, value)`: satu elemen array di field `key` selesai.
+    - `('field', key, value)`: field `key` selesai (nilai lengkapnya).
+
+    Attributes:
+        fields (dict): Field yang sudah lengkap.
+        items (dict): Elemen array per field yang sudah lengkap (termasuk field yang belum ketutup).
+        done (bool): True kalau objek terluar sudah ditutup.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.items = {}
+        self.done = False
+        self._length = 0
+        self._buffer = ""
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._token_start = None  # Awal string / angka / literal yang lagi dibaca
+        self._expect_key = False
+        self._key = None
+        self._value_start = None  # Awal nilai field di level pertama
+        self._item_start = None  # Awal elemen array di level kedua
+
+    def feed(self, chunk: str) -> list:
+        """Proses potongan teks berikutnya; balikin event yang selesai di potongan ini."""
+        events = []
+        if self.done or not chunk:
+            return events
+        start = self._length
+        self._buffer += chunk
+        self._length += len(chunk)
+        for offset, char in enumerate(chunk):
+            if self.done:
+                break
+            self._step(start + offset, char, events)
+        return events
+
+    def _decode(self, start: int, end: int):
+        try:
+            return json.loads(self._buffer[start:end])
+        except ValueError:
+            return None  # Potongan rusak dilewati (model kadang nulis JSON nggak valid)
+
+    def _in_array_field(self) -> bool:
+        return len(self._stack) == 2 and self._stack[0] == '{' and self._stack[1] == '['
+
+    def _finish_value(self, start: int, end: int, events: list) -> None:
+        """Nilai (string / angka / literal / kontainer) yang berakhir di `end` baru selesai."""
+        depth = len(self._stack)
+        if depth == 1 and self._stack[0] == '{':
+            if self._expect_key:
+                self._key = self._decode(start, end)
+                return
+            self._emit_field(self._decode(start, end), events)
+        elif self._in_array_field() and self._key is not None:
+            value = self._decode(start, end)
+            if value is not None:
+                items = self.items.setdefault(self._key, [])
+                items.append(value)
+                events.append(('item', self._key, len(items) - 1, value))
+
+    def _emit_field(self, value, events: list) -> None:
+        if self._key is None:
+            return
+        self.fields[self._key] = value
+        events.append(('field', self._key, value))
+        self._key = None
+
+    def _end_token(self, index: int, events: list) -> None:
+        if self._token_start is not None and not self._in_string:
+            start, self._token_start = self._token_start, None
+            self._finish_value(start, index, events)
+
+    def _step(self, index: int, char: str, events: list) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == '\\':
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                start, self._token_start = self._token_start, None
+                self._finish_value(start, index + 1, events)
+            return
+        if not self._stack and char != '{':
+            return  # Teks sebelum objek
+        if char == '"':
+            self._in_string = True
+            self._token_start = index
+        elif char in '{[':
+            self._end_token(index, events)
+            self._stack.append(char)
+            if len(self._stack) == 1:
+                self._expect_key = True
+            elif len(self._stack) == 2 and self._stack[0] == '{':
+                self._value_start = index
+                if char == '[':
+                    self.items[self._key] = []
+            elif len(self._stack) == 3 and self._stack[1] == '[':
+                self._item_start = index
+        elif char in '}]':
+            self._end_token(index, events)
+            if not self._stack:
+                return
+            self._stack.pop()
+            if not self._stack:
+                self.done = True
+            elif len(self._stack) == 1 and self._value_start is not None:
+                self._emit_field(self._decode(self._value_start, index + 1), events)
+                self._value_start = None
+            elif self._in_array_field() and self._item_start is not None:
+                self._finish_value(self._item_start, index + 1, events)
+                self._item_start = None
+        elif char == ',':
+            self._end_token(index, events)
+            if len(self._stack) == 1:
+                self._expect_key = True
+        elif char == ':':
+            self._end_token(index, events)
+            if len(self._stack) == 1:
+                self._expect_key = False
+        elif char in _WHITESPACE:
+            self._end_token(index, events)
+        elif self._token_start is None and len(self._stack) in (1, 2):
+            self._token_start = index  # Angka / true / false / null
+
+    def result(self) -> dict:
+        """
+        Objek hasil parse: JSON utuh kalau valid, kalau nggak (misal output kepotong
+        `num_predict`) field yang sudah lengkap plus elemen array yang sudah selesai.
+        """
+        text = self._buffer[self._buffer.find('{'):] if '{' in self._buffer else ""
+        try:
+            parsed, _ = json.JSONDecoder().raw_decode(text)  # Teks setelah objek diabaikan
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        partial = {key: list(values) for key, values in self.items.items() if key is not None}
+        partial.update(self.fields)
+        return partial
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Dedup & pengelompokan keyword pakai embedding.
+
+Keyword di-embed per batch (vektor di-cache per teks keyword), lalu:
+- dedup: keyword yang cosine similarity-nya di atas ambang dengan keyword
+  sebelumnya dianggap duplikat (dihitung per blok matriks, bukan loop pasangan);
+- cluster: spherical k-means (perkalian matriks) jadi kelompok topik, labelnya
+  keyword yang paling dekat dengan pusat kelompok.
+
+Semua perhitungan pakai NumPy, jadi ribuan keyword dari batch tetap cepat.
+"""
+import base64
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from disk_cache import make_cache_key
+
+_SPACE_RE = re.compile(r'\s+')
+_EDGE_RE = re.compile(r'^[\s\d.)\-*•"\'`]+|[\s."\'`]+$')  # Nomor list, bullet, tanda kutip di pinggir
+
+
+def clean_keyword(keyword: str) -> str:
+    """Keyword tanpa nomor/bullet/kutip di pinggir dan dengan spasi tunggal (huruf besar-kecil tetap)."""
+    return _SPACE_RE.sub(' ', _EDGE_RE.sub('', keyword or '')).strip()
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Bentuk baku keyword buat dedup persis (`clean_keyword` + huruf kecil)."""
+    return clean_keyword(keyword).lower()
+
+
+class VectorCache:
+    """
+    Cache vektor embedding per (model, teks): LRU di memori di depan cache disk.
+    Vektor disimpan sebagai float32 base64 (jauh lebih kecil dari list JSON).
+
+    Args:
+        disk_cache (DiskCache): Cache disk. None = cuma di memori.
+        max_memory_items (int): Jumlah vektor yang ditahan di memori.
+    """
+
+    def __init__(self, disk_cache=None, max_memory_items: int = 50000):
+        self.disk_cache = disk_cache
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model: str, text: str):
+        key = make_cache_key('embedding', model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                return vector
+        stored = self.disk_cache.get(key) if self.disk_cache is not None else None
+        if stored is None:
+            return None
+        vector = np.frombuffer(base64.b64decode(stored), dtype=np.float32)
+        self._remember(key, vector)
+        return vector
+
+    def set(self, model: str, text: str, vector) -> None:
+        key = make_cache_key('embedding', model, text)
+        vector = np.asarray(vector, dtype=np.float32)
+        self._remember(key, vector)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, base64.b64encode(vector.tobytes()).decode('ascii'))
+
+    def _remember(self, key: str, vector) -> None:
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
+def embed_texts(texts: list, embed_batch, model: str, cache: VectorCache = None, batch_size: int = 64):
+    """
+    Vektor embedding (baris sudah dinormalisasi panjang 1) untuk `texts`.
+
+    Args:
+        texts (list): Teks yang mau di-embed.
+        embed_batch (callable): `embed_batch(list teks) -> list vektor` (misal endpoint embed Ollama).
+        model (str): Nama model embedding (bagian dari kunci cache).
+        cache (VectorCache): Cache vektor; cuma teks yang belum ada yang dikirim ke model.
+        batch_size (int): Teks per panggilan `embed_batch`.
+
+    Returns:
+        numpy.ndarray: Matriks `len(texts) x dimensi` (float32).
+    """
+    vectors = [cache.get(model, text) if cache is not None else None for text in texts]
+    missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+    fresh = {}
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        embeddings = embed_batch(batch)
+        if len(embeddings) != len(batch):
+            raise ValueError(f"Model embedding balikin {len(embeddings)} vektor buat {len(batch)} teks.")
+        for text, embedding in zip(batch, embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            fresh[text] = vector
+            if cache is not None:
+                cache.set(model, text, vector)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    matrix = np.stack([vector if vector is not None else fresh[text] for text, vector in zip(texts, vectors)])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def find_duplicates(vectors, threshold: float = 0.92, block_size: int = 512) -> np.ndarray:
+    """
+    Tandai duplikat: item yang mirip (cosine >= `threshold`) dengan item yang
+    dipertahankan sebelumnya. Item diproses per blok: kemiripan ke semua item
+    yang sudah dipertahankan dihitung sekaligus dalam satu perkalian matriks.
+
+    Args:
+        vectors (numpy.ndarray): Vektor yang sudah dinormalisasi, sesuai urutan prioritas.
+        threshold (float): Ambang cosine similarity.
+        block_size (int): Item per blok (batas memori matriks kemiripan).
+
+    Returns:
+        numpy.ndarray: `duplicate_of[i]` = indeks item yang dipertahankan, atau -1 kalau item i dipertahankan.
+    """
+    count = len(vectors)
+    duplicate_of = np.full(count, -1, dtype=np.int64)
+    kept = np.zeros(0, dtype=np.int64)
+    for start in range(0, count, block_size):
+        block = np.arange(start, min(start + block_size, count))
+        block_vectors = vectors[block]
+        if len(kept):
+            similarity = block_vectors @ vectors[kept].T
+            best = similarity.argmax(axis=1)
+            is_duplicate = similarity[np.arange(len(block)), best] >= threshold
+            duplicate_of[block[is_duplicate]] = kept[best[is_duplicate]]
+        # Di dalam blok: urutan menentukan siapa yang dipertahankan (satu baris matriks per item yang lolos)
+        inner = block_vectors @ block_vectors.T
+        for offset in range(len(block)):
+            if duplicate_of[block[offset]] != -1:
+                continue
+            later = offset + 1 + np.flatnonzero(inner[offset, offset + 1:] >= threshold)
+            later = later[duplicate_of[block[later]] == -1]
+            duplicate_of[block[later]] = block[offset]
+        kept = np.concatenate([kept, block[duplicate_of[block] == -1]])
+    return duplicate_of
+
+
+def default_cluster_count(count: int) -> int:
+    """Perkiraan jumlah kelompok yang masuk akal buat `count` keyword."""
+    return max(1, min(count, int(round((count / 2) ** 0.5))))
+
+
+def spherical_kmeans(vectors, k: int, iterations: int = 50, seed: int = 0):
+    """
+    K-means dengan cosine similarity (vektor & pusat dinormalisasi), inisialisasi k-means++.
+
+    Returns:
+        tuple: (label per item, matriks pusat kelompok).
+    """
+    count = len(vectors)
+    k = max(1, min(k, count))
+    rng = np.random.default_rng(seed)
+    centers = np.empty((k, vectors.shape[1]), dtype=np.float32)
+    centers[0] = vectors[rng.integers(count)]
+    closest = 1.0 - vectors @ centers[0]
+    for i in range(1, k):
+        weights = np.maximum(closest, 0).astype(np.float64) ** 2
+        total = weights.sum()
+        index = rng.choice(count, p=weights / total) if total > 0 else rng.integers(count)
+        centers[i] = vectors[index]
+        closest = np.minimum(closest, 1.0 - vectors @ centers[i])
+
+    labels = np.full(count, -1, dtype=np.int64)
+    for _ in range(iterations):
+        new_labels = (vectors @ centers.T).argmax(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        membership = np.zeros((count, k), dtype=np.float32)
+        membership[np.arange(count), labels] = 1.0
+        sums = membership.T @ vectors  # Jumlah vektor per kelompok dalam satu perkalian matriks
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        centers = np.where(empty[:, None], centers, sums / np.maximum(norms, 1e-12))
+    return labels, centers
+
+
+def cluster_keywords(keywords: list, vectors, dedup_threshold: float = 0.92, n_clusters: int = None) -> list:
+    """
+    Dedup lalu kelompokkan keyword.
+
+    Args:
+        keywords (list): Keyword (urutan = prioritas; yang duluan dipertahankan).
+        vectors (numpy.ndarray): Vektor ternormalisasi per keyword (`embed_texts`).
+        dedup_threshold (float): Ambang cosine buat dianggap duplikat.
+        n_clusters (int): Jumlah kelompok (default `default_cluster_count`).
+
+    Returns:
+        list: Satu dict per keyword: `keyword`, `duplicate_of` (keyword yang
+        dipertahankan, atau None), `cluster` (nomor kelompok, mulai 1), `cluster_label`.
+    """
+    if not keywords:
+        return []
+    duplicate_of = find_duplicates(vectors, dedup_threshold)
+    unique = np.flatnonzero(duplicate_of == -1)
+    labels, centers = spherical_kmeans(vectors[unique], n_clusters or default_cluster_count(len(unique)))
+    # Label kelompok: keyword yang paling dekat ke pusat; nomor kelompok urut dari yang terbesar
+    similarity_to_center = (vectors[unique] * centers[labels]).sum(axis=1)
+    order = sorted(set(labels.tolist()), key=lambda label: (-int((labels == label).sum()), label))
+    numbers = {label: number for number, label in enumerate(order, start=1)}
+    names = {}
+    for label in order:
+        members = np.flatnonzero(labels == label)
+        names[label] = keywords[unique[members[similarity_to_center[members].argmax()]]]
+    cluster_of = {int(index): int(label) for index, label in zip(unique, labels)}
+
+    rows = []
+    for index, keyword in enumerate(keywords):
+        original = int(duplicate_of[index])
+        label = cluster_of[index if original == -1 else original]
+        rows.append({
+            'keyword': keyword,
+            'duplicate_of': keywords[original] if original != -1 else None,
+            'cluster': numbers[label],
+            'cluster_label': names[label],
+        })
+    return rows
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Metrik per panggilan Ollama: time-to-first-token, token/detik, token prompt,
+waktu load model, dan wall time, ditandai per tugas (keywords, meta, dll).
+
+Angkanya diambil dari chunk terakhir stream Ollama (`eval_count`,
+`eval_duration`, `prompt_eval_count`, `load_duration`; durasi dalam
+nanodetik), ditulis append-only ke file JSONL dan disimpan di memori
+buat panel statistik di aplikasi.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+_NANOSECONDS = 1e9
+
+
+def _seconds(nanoseconds):
+    return round(nanoseconds / _NANOSECONDS, 3) if nanoseconds else None
+
+
+def build_metrics_record(task: str, model: str, started: float, first_token_at: float = None,
+                         final_chunk=None, status: str = 'ok', cache: str = None, **extra) -> dict:
+    """
+    Susun satu record metrik dari waktu lokal dan statistik chunk terakhir Ollama.
+
+    Args:
+        task (str): Tag tugas (misal `'keywords'`, `'analyze'`, `'chat'`).
+        model (str): Nama model.
+        started (float): `time.perf_counter()` saat panggilan dimulai.
+        first_token_at (float): `time.perf_counter()` saat token pertama datang.
+        final_chunk: Chunk terakhir (`done=True`) atau respons non-streaming dari Ollama.
+        status (str): `'ok'`, `'error'`, `'cancelled'` (stream ditutup sebelum selesai), atau
+            `'stopped'` (stream sengaja ditutup karena output sudah lewat batas karakter).
+        cache (str): `'hit'` kalau diputar ulang dari cache generasi.
+        **extra: Field tambahan (misal `num_predict`, `tokens_received`).
+
+    Returns:
+        dict: Record siap ditulis sebagai satu baris JSON.
+    """
+    now = time.perf_counter()
+    stats = final_chunk or {}
+    eval_count = stats.get('eval_count')
+    eval_seconds = _seconds(stats.get('eval_duration'))
+    record = {
+        'timestamp': round(time.time(), 3),
+        'task': task,
+        'model': model,
+        'status': status,
+        'cache': cache,
+        'wall_seconds': round(now - started, 3),
+        'ttft_seconds': round(first_token_at - started, 3) if first_token_at is not None else None,
+        'eval_count': eval_count,
+        'eval_seconds': eval_seconds,
+        'tokens_per_second': round(eval_count / eval_seconds, 2) if eval_count and eval_seconds else None,
+        'prompt_eval_count': stats.get('prompt_eval_count'),
+        'prompt_eval_seconds': _seconds(stats.get('prompt_eval_duration')),
+        'load_seconds': _seconds(stats.get('load_duration')),
+    }
+    record.update(extra)
+    return record
+
+
+class MetricsRecorder:
+    """
+    Penyimpan record metrik: append-only ke file JSONL + sebagian record terbaru di memori.
+    Aman dipanggil dari banyak thread.
+
+    Args:
+        log_path (str): Path file JSONL. None = cuma di memori.
+        keep_recent (int): Jumlah record terbaru yang disimpan di memori.
+    """
+
+    def __init__(self, log_path: str = None, keep_recent: int = 2000):
+        self.log_path = log_path
+        self._recent = deque(maxlen=keep_recent)
+        self._lock = threading.Lock()
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+
+    def record(self, record: dict) -> None:
+        """Simpan satu record (gagal nulis file nggak boleh bikin generasi gagal)."""
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._recent.append(record)
+            if self.log_path:
+                try:
+                    with open(self.log_path, 'a', encoding='utf-8') as f:
+                        f.write(line + '\n')
+                except OSError as e:
+                    print(f"Gagal nulis log metrik: {e}")  # Log error
+
+    def recent(self) -> list:
+        """Salinan record terbaru (urut dari yang paling lama)."""
+        with self._lock:
+            return list(self._recent)
+
+    def summary_by_task(self) -> list:
+        """
+        Ringkasan per tugas dari record terbaru.
+
+        Returns:
+            list: Satu dict per tugas: jumlah panggilan, cache hit, error, dibatalkan user, berhenti
+            di batas karakter, rata-rata
+            TTFT & token/detik, total token output & prompt (plus perkiraan token prompt
+            yang dipakai ulang dari KV cache), total waktu load & wall time.
+        """
+        groups = {}
+        for record in self.recent():
+            groups.setdefault(record['task'], []).append(record)
+
+        def _average(values):
+            values = [value for value in values if value is not None]
+            return round(sum(values) / len(values), 2) if values else None
+
+        rows = []
+        for task, records in sorted(groups.items()):
+            generated = [record for record in records if record.get('cache') != 'hit']
+            rows.append({
+                'task': task,
+                'calls': len(records),
+                'cache_hits': len(records) - len(generated),
+                'errors': sum(1 for record in records if record['status'] == 'error'),
+                'user_cancels': sum(1 for record in records if record.get('cancel_reason') == 'user'),
+                'early_stops': sum(1 for record in records if record['status'] == 'stopped'),
+                'avg_ttft_s': _average(record['ttft_seconds'] for record in generated),
+                'avg_tokens_per_s': _average(record['tokens_per_second'] for record in generated),
+                # Stream yang ditutup di tengah nggak punya eval_count, jadi pakai token yang diterima
+                'output_tokens': sum(record['eval_count'] or record.get('tokens_received') or 0 for record in generated),
+                'prompt_tokens': sum(record['prompt_eval_count'] or 0 for record in generated),
+                'cached_prompt_tokens': sum(record.get('prompt_cached_tokens') or 0 for record in generated),
+                'avg_prompt_eval_s': _average(record['prompt_eval_seconds'] for record in generated),
+                'load_s': round(sum(record['load_seconds'] or 0 for record in generated), 2),
+                'wall_s': round(sum(record['wall_seconds'] for record in generated), 2),
+            })
+        return rows
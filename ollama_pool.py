@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Pool beberapa server Ollama: health check berkala (`/api/ps`), routing ke host
+sehat dengan request berjalan paling sedikit, failover kalau host mati sebelum
+token pertama, dan routing lengket (sticky) buat sesi chat supaya KV cache
+percakapan di host yang sama tetap kepakai.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from ollama import Client, ResponseError
+
+
+class OllamaPoolError(Exception):
+    """Semua host di pool gagal dipakai."""
+
+
+def parse_hosts(value: str) -> list:
+    """Daftar URL host dari string dipisah koma (misal isi `OLLAMA_HOSTS`), tanpa duplikat."""
+    hosts = [host.strip().rstrip('/') for host in (value or '').split(',') if host.strip()]
+    return list(dict.fromkeys(hosts))
+
+
+class OllamaHost:
+    """
+    Satu server Ollama di pool beserta status terakhirnya.
+
+    Attributes:
+        url (str): Alamat server.
+        client (Client): Klien buat generasi (dipakai bareng banyak thread).
+        healthy (bool): Hasil health check / request terakhir.
+        in_flight (int): Request dari proses ini yang lagi jalan di host ini.
+        loaded_models (list): Model yang lagi dimuat menurut `/api/ps`.
+        last_error (str): Error terakhir (buat ditampilkan).
+    """
+
+    def __init__(self, url: str, check_timeout: float = 3.0):
+        self.url = url
+        self.client = Client(host=url)
+        self._check_client = Client(host=url, timeout=check_timeout)  # Health check nggak boleh nunggu lama
+        self.healthy = True  # Dianggap sehat sampai terbukti sebaliknya
+        self.in_flight = 0
+        self.loaded_models = []
+        self.last_error = None
+        self.last_check = None
+
+    def check(self) -> bool:
+        """Cek `/api/ps`: host hidup & model apa aja yang lagi dimuat."""
+        try:
+            response = self._check_client.ps()
+            self.loaded_models = [model.get('model') or model.get('name') for model in (response.get('models') or [])]
+            self.healthy = True
+            self.last_error = None
+        except Exception as e:
+            self.healthy = False
+            self.last_error = str(e)
+        self.last_check = time.time()
+        return self.healthy
+
+    def status(self) -> dict:
+        """Ringkasan status buat ditampilkan."""
+        return {
+            'host': self.url,
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'loaded_models': ", ".join(self.loaded_models),
+            'last_error': self.last_error,
+        }
+
+
+def _is_host_failure(error: Exception) -> bool:
+    """Error yang berarti host-nya bermasalah (bukan request-nya): koneksi putus, timeout, 5xx."""
+    if isinstance(error, ResponseError):
+        return error.status_code >= 500
+    return True
+
+
+class OllamaPool:
+    """
+    Pool host Ollama dengan routing least-loaded, failover, dan sticky routing.
+
+    Args:
+        urls (list): Alamat host Ollama.
+        model (str): Model yang dipakai (host yang sudah memuatnya diutamakan).
+        check_interval (float): Jeda health check berkala (detik).
+        check_timeout (float): Timeout satu health check (detik).
+        max_sticky (int): Jumlah kunci sticky yang diingat (yang paling lama dibuang).
+    """
+
+    def __init__(self, urls: list, model: str, check_interval: float = 15.0, check_timeout: float = 3.0,
+                 max_sticky: int = 10000):
+        if not urls:
+            raise ValueError("Pool Ollama butuh minimal satu host.")
+        self.model = model
+        self.check_interval = check_interval
+        self.max_sticky = max_sticky
+        self.hosts = [OllamaHost(url, check_timeout) for url in urls]
+        self._lock = threading.Lock()
+        self._sticky = OrderedDict()
+        self._next = 0  # Pemecah seri round-robin
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check_health(self) -> list:
+        """Health check semua host sekarang juga.
+
+        Returns:
+            list: Host yang sehat.
+        """
+        for host in self.hosts:
+            host.check()
+        return self.healthy_hosts()
+
+    def healthy_hosts(self) -> list:
+        return [host for host in self.hosts if host.healthy]
+
+    def start(self):
+        """Jalankan health check berkala di thread daemon."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._check_loop, name="wolf-ollama-health", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _check_loop(self):
+        while not self._stop.wait(self.check_interval):
+            self.check_health()
+
+    def _pick(self, sticky_key=None, exclude=()) -> OllamaHost:
+        candidates = [host for host in self.hosts if host.url not in exclude]
+        if not candidates:
+            raise OllamaPoolError("Semua host Ollama sudah dicoba dan gagal.")
+        healthy = [host for host in candidates if host.healthy]
+        candidates = healthy or candidates  # Semua kelihatan mati: coba aja, siapa tahu sudah hidup lagi
+        if sticky_key is not None:
+            sticky_url = self._sticky.get(sticky_key)
+            for host in candidates:
+                if host.url == sticky_url:
+                    self._sticky.move_to_end(sticky_key)
+                    return host
+        self._next = (self._next + 1) % len(self.hosts)
+        order = {host.url: (index - self._next) % len(self.hosts) for index, host in enumerate(self.hosts)}
+        # Paling sedikit request berjalan, lalu yang modelnya sudah dimuat, lalu giliran
+        host = min(candidates, key=lambda h: (h.in_flight, self.model not in h.loaded_models, order[h.url]))
+        if sticky_key is not None:
+            self._sticky[sticky_key] = host.url
+            self._sticky.move_to_end(sticky_key)
+            while len(self._sticky) > self.max_sticky:
+                self._sticky.popitem(last=False)
+        return host
+
+    @contextmanager
+    def lease(self, sticky_key=None, exclude=()):
+        """
+        Pinjam satu host (in-flight-nya dihitung selama dipakai).
+
+        Args:
+            sticky_key: Kunci sesi (misal ID chat); request dengan kunci yang sama
+                diarahkan ke host yang sama selama host itu sehat.
+            exclude: URL host yang nggak boleh dipilih (sudah gagal).
+
+        Yields:
+            OllamaHost: Host terpilih.
+        """
+        with self._lock:
+            host = self._pick(sticky_key, exclude)
+            host.in_flight += 1
+        try:
+            yield host
+        finally:
+            with self._lock:
+                host.in_flight -= 1
+
+    def _mark_failed(self, host: OllamaHost, error: Exception) -> None:
+        if _is_host_failure(error):
+            host.healthy = False  # Dicek ulang di health check berikutnya
+            host.last_error = str(error)
+
+    def stream(self, request, sticky_key=None, on_host=None):
+        """
+        Jalankan request streaming di host terpilih, dengan failover.
+
+        Kalau host gagal sebelum chunk pertama, request diulang di host sehat
+        berikutnya. Kalau sudah ada chunk yang keluar, error-nya diteruskan
+        (teks yang sudah tampil nggak bisa ditarik lagi).
+
+        Args:
+            request (callable): `request(client) -> iterator chunk`, misal
+                `lambda c: c.generate(..., stream=True)`.
+            sticky_key: Lihat `lease`.
+            on_host (callable): `on_host(url)`, dipanggil tiap kali host dipilih.
+
+        Yields:
+            Chunk dari Ollama.
+
+        Raises:
+            Exception: Error dari host terakhir yang dicoba.
+        """
+        tried = set()
+        while True:
+            with self.lease(sticky_key, exclude=tried) as host:
+                tried.add(host.url)
+                if on_host is not None:
+                    on_host(host.url)
+                started_streaming = False
+                try:
+                    for chunk in request(host.client):
+                        started_streaming = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    self._mark_failed(host, e)
+                    if started_streaming or len(tried) >= len(self.hosts) or not _is_host_failure(e):
+                        raise
+                    print(f"Host Ollama {host.url} gagal ({e}), pindah ke host lain.")  # Log error
+
+    def call(self, request, sticky_key=None, on_host=None):
+        """Versi non-streaming `stream`: `request(client)` dijalankan dengan failover, hasilnya dikembalikan."""
+        tried = set()
+        while True:
+            with self.lease(sticky_key, exclude=tried) as host:
+                tried.add(host.url)
+                if on_host is not None:
+                    on_host(host.url)
+                try:
+                    return request(host.client)
+                except Exception as e:
+                    self._mark_failed(host, e)
+                    if len(tried) >= len(self.hosts) or not _is_host_failure(e):
+                        raise
+                    print(f"Host Ollama {host.url} gagal ({e}), pindah ke host lain.")  # Log error
+
+    def status(self) -> list:
+        with self._lock:
+            return [host.status() for host in self.hosts]
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Ambil halaman web secara streaming dan ekstrak teksnya dalam satu lintasan.
+
+Socket dibaca per blok dan langsung diumpankan ke parser `html.parser`,
+jadi subtree yang nggak kepakai (style/script/nav/footer/header) dilewati
+tanpa regex ke seluruh dokumen, dan pembacaan berhenti begitu jatah teks
+buat prompt sudah penuh.
+
+Sekalian dicatat bahan cek SEO on-page (gambar & alt-nya, link di konten),
+jadi `seo_rules` nggak perlu parse ulang HTML-nya.
+
+Kalau dikasih cache, request berikutnya ke URL yang sama pakai
+`If-None-Match` / `If-Modified-Since`, dan hasil ekstraksi di-memo
+berdasarkan hash konten.
+"""
+import codecs
+import hashlib
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from disk_cache import make_cache_key
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+
+DEFAULT_TEXT_BUDGET = 3500  # Karakter teks yang dikirim ke prompt
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024  # Batas byte yang dibaca dari socket
+MEMO_PROBE_BYTES = 16 * 1024  # Awal body yang di-hash buat cari memo ekstraksi (lintas URL)
+EXTRACTION_VERSION = 3  # Naikkan kalau isi dict halaman berubah, biar hasil ekstraksi lama di cache nggak kepakai
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class PageTextExtractor(HTMLParser):
+    """
+    Parser HTML incremental yang ngumpulin teks yang kelihatan, title,
+    meta description, heading (h1-h6), gambar (`images`: alt per gambar) dan
+    link (`links`: (href, rel)) di bagian konten. `<header>` di dalam
+    `<article>`/`<main>` ikut dibaca (biasanya tempat H1 artikel); header situs dilewati.
+
+    Args:
+        text_budget (int): Jumlah karakter teks yang dikumpulkan. Kalau sudah
+            penuh, `done` jadi True dan sisa dokumen boleh nggak dibaca.
+    """
+
+    SKIP_TAGS = {'style', 'script', 'nav', 'footer', 'header', 'noscript', 'template', 'svg'}
+    HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    CONTENT_TAGS = {'article', 'main'}
+
+    def __init__(self, text_budget: int = DEFAULT_TEXT_BUDGET):
+        super().__init__(convert_charrefs=True)
+        self.text_budget = text_budget
+        self.title = ""
+        self.meta_description = ""
+        self.headings = []
+        self.images = []
+        self.links = []
+        self.done = False
+        self._text_parts = []
+        self._text_length = 0
+        self._skip_stack = []
+        self._in_title = False
+        self._heading_tag = None
+        self._heading_parts = []
+        self._content_depth = 0
+
+    def _add_separator(self):
+        # Tag memisahkan kata (seperti regex lama yang ganti tag dengan spasi)
+        self._text_parts.append(' ')
+        if self._heading_tag:
+            self._heading_parts.append(' ')
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_stack:
+            if tag in self.SKIP_TAGS:
+                self._skip_stack.append(tag)
+            return
+        self._add_separator()
+        if tag in self.SKIP_TAGS and not (tag == 'header' and self._content_depth):
+            self._skip_stack.append(tag)
+        elif tag in self.CONTENT_TAGS:
+            self._content_depth += 1
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            attributes = dict(attrs)
+            if (attributes.get('name') or '').lower() == 'description' and not self.meta_description:
+                self.meta_description = _WHITESPACE_RE.sub(' ', attributes.get('content') or '').strip()
+        elif tag in self.HEADING_TAGS:
+            self._heading_tag = tag
+            self._heading_parts = []
+        elif tag == 'img' and not self.done:
+            self.images.append(_WHITESPACE_RE.sub(' ', dict(attrs).get('alt') or '').strip())
+        elif tag == 'a' and not self.done:
+            attributes = dict(attrs)
+            if attributes.get('href'):
+                self.links.append((attributes['href'].strip(), (attributes.get('rel') or '').lower()))
+
+    def handle_startendtag(self, tag, attrs):
+        # Tag self-closing (misal <svg/>) nggak punya isi, jadi jangan masuk skip stack
+        if tag not in self.SKIP_TAGS:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip_stack:
+            if tag == self._skip_stack[-1]:
+                self._skip_stack.pop()
+            return
+        self._add_separator()
+        if tag in self.CONTENT_TAGS and self._content_depth:
+            self._content_depth -= 1
+        elif tag == 'title':
+            self._in_title = False
+        elif tag == self._heading_tag:
+            heading_text = _WHITESPACE_RE.sub(' ', ''.join(self._heading_parts)).strip()
+            if heading_text:
+                self.headings.append({'tag': tag, 'text': heading_text})
+            self._heading_tag = None
+
+    def handle_data(self, data):
+        if self._skip_stack or self.done:
+            return
+        if self._in_title:
+            self.title = _WHITESPACE_RE.sub(' ', self.title + data).strip()
+            return
+        # Data bisa kepotong di batas blok, jadi jangan di-strip per potongan
+        if self._heading_tag:
+            self._heading_parts.append(data)
+        self._text_parts.append(data)
+        self._text_length += len(data)
+        if self._text_length >= self.text_budget:
+            self.done = True
+
+    @property
+    def text(self) -> str:
+        """Teks yang kelihatan, spasi sudah dinormalisasi dan dipotong sesuai jatah."""
+        return _WHITESPACE_RE.sub(' ', ''.join(self._text_parts)).strip()[:self.text_budget]
+
+
+def summarize_links(url: str, links: list) -> dict:
+    """
+    Hitung link konten: internal (host sama dengan `url`), eksternal, dan nofollow.
+    Anchor (`#...`), `mailto:`, `tel:`, dan `javascript:` nggak dihitung.
+    """
+    host = urlsplit(url).netloc.lower()
+    counts = {'internal': 0, 'external': 0, 'nofollow': 0}
+    for href, rel in links:
+        target = urlsplit(urljoin(url, href))
+        if target.scheme not in ('http', 'https') or href.startswith('#'):
+            continue
+        counts['internal' if target.netloc.lower() == host else 'external'] += 1
+        if 'nofollow' in rel.split():
+            counts['nofollow'] += 1
+    return counts
+
+
+def _extract_blocks(blocks, encoding: str, text_budget: int, max_bytes: int):
+    """
+    Umpankan blok byte ke extractor sampai jatah teks / byte penuh.
+
+    Returns:
+        tuple: (extractor, byte yang dipakai, hash SHA-256 byte yang dipakai, truncated)
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = PageTextExtractor(text_budget)
+    content_hash = hashlib.sha256()
+    bytes_read = 0
+    truncated = False
+    for block in blocks:
+        bytes_read += len(block)
+        content_hash.update(block)
+        extractor.feed(decoder.decode(block))
+        if extractor.done or bytes_read >= max_bytes:
+            truncated = True  # Sisa dokumen nggak dibaca, koneksi langsung ditutup
+            break
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+    return extractor, bytes_read, content_hash.hexdigest(), truncated
+
+
+def fetch_page(url: str, session: requests.Session = None, text_budget: int = DEFAULT_TEXT_BUDGET,
+               max_bytes: int = DEFAULT_MAX_BYTES, page_cache=None, extraction_cache=None) -> dict:
+    """
+    Ambil halaman secara streaming dan ekstrak isinya sampai jatah teks penuh.
+
+    Kalau `page_cache` diisi, validator (ETag / Last-Modified) disimpan per URL
+    dan request berikutnya jadi conditional request; respons 304 langsung pakai
+    hasil ekstraksi yang tersimpan. Kalau `extraction_cache` diisi, hasil ekstraksi
+    di-memo berdasarkan hash awal body (`MEMO_PROBE_BYTES`) plus host, jadi konten
+    yang sama di URL mana pun (duplikat, varian query string, server tanpa validator)
+    nggak di-parse ulang. Memo dicek ulang pakai hash semua byte yang dulu dipakai, dan
+    cuma dipakai kalau pembacaan dulu juga berhenti di titik itu atau body-nya habis
+    persis di sana.
+
+    Args:
+        url (str): URL halaman.
+        session (requests.Session): Session bersama (keep-alive). Kalau None, pakai `requests.get`.
+        text_budget (int): Jumlah karakter teks yang dikumpulkan.
+        max_bytes (int): Batas byte yang dibaca dari socket.
+        page_cache (DiskCache): Cache per URL (validator + hasil ekstraksi).
+        extraction_cache (DiskCache): Memo hasil ekstraksi per hash konten.
+
+    Returns:
+        dict: `url`, `title`, `meta_description`, `headings`, `text`,
+        `images` (`total`, `missing_alt`), `links` (`internal`, `external`,
+        `nofollow`; lihat `summarize_links`), `bytes_read`, `truncated` (True kalau pembacaan dihentikan lebih awal),
+        dan `cache` (`None`, `'revalidated'` untuk 304, atau `'content'` kalau
+        ekstraksi diambil dari memo hash konten).
+
+    Raises:
+        requests.exceptions.RequestException: Kalau gagal ambil URL.
+    """
+    http = session if session is not None else requests
+    page_key = make_cache_key('page', url, text_budget, max_bytes, EXTRACTION_VERSION)
+    host = urlsplit(url).netloc.lower()
+    cached = page_cache.get(page_key) if page_cache is not None else None
+
+    headers = dict(DEFAULT_HEADERS)
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    with http.get(url, timeout=20, headers=headers, stream=True) as response:
+        if response.status_code == 304 and cached:
+            return dict(cached['page'], url=url, cache='revalidated')
+        response.raise_for_status()
+        # Tanpa charset eksplisit, requests nebak ISO-8859-1; kebanyakan halaman modern UTF-8
+        has_charset = 'charset' in response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if has_charset and response.encoding else 'utf-8'
+        blocks = response.iter_content(chunk_size=16 * 1024)
+
+        page = None
+        if extraction_cache is not None:
+            probe_size = min(MEMO_PROBE_BYTES, max_bytes)
+            prefix = bytearray()
+            for block in blocks:
+                prefix.extend(block)
+                if len(prefix) >= probe_size:
+                    break
+            # Hitungan link internal/eksternal tergantung host, jadi host ikut jadi kunci memo
+            memo_key = make_cache_key(hashlib.sha256(prefix[:probe_size]).hexdigest(), host, text_budget, max_bytes,
+                                      EXTRACTION_VERSION)
+            memo = extraction_cache.get(memo_key)
+            if memo is not None:
+                needed = memo['page']['bytes_read']
+                if len(prefix) < needed:
+                    for block in blocks:
+                        prefix.extend(block)
+                        if len(prefix) >= needed:
+                            break
+                # Ekstraksi lama cuma berlaku kalau dulu juga berhenti di sini (truncated) atau body-nya memang habis
+                # di titik yang sama; kalau ada tambahan konten di belakang, ekstraksi penuh diulang
+                complete = memo['page']['truncated']
+                if not complete and len(prefix) == needed:
+                    rest = next(blocks, None)
+                    if rest is None:
+                        complete = True
+                    else:
+                        prefix.extend(rest)
+                if (complete and len(prefix) >= needed
+                        and hashlib.sha256(prefix[:needed]).hexdigest() == memo['content_hash']):
+                    page = dict(memo['page'], url=url, cache='content')
+            if page is None:
+                blocks = _chain_blocks(bytes(prefix), blocks)
+
+        if page is None:
+            extractor, bytes_read, content_hash, truncated = _extract_blocks(blocks, encoding, text_budget, max_bytes)
+            page = {
+                'url': url,
+                'title': extractor.title,
+                'meta_description': extractor.meta_description,
+                'headings': extractor.headings,
+                'text': extractor.text,
+                'images': {'total': len(extractor.images),
+                           'missing_alt': sum(1 for alt in extractor.images if not alt)},
+                'links': summarize_links(url, extractor.links),
+                'bytes_read': bytes_read,
+                'truncated': truncated,
+                'cache': None,
+            }
+            if extraction_cache is not None:
+                extraction_cache.set(memo_key, {'content_hash': content_hash, 'page': page})
+
+        if page_cache is not None:
+            page_cache.set(page_key, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'page': page,
+            })
+    return page
+
+
+def _chain_blocks(first: bytes, rest):
+    """Gabungkan blok yang sudah terbaca dengan sisa iterator blok."""
+    if first:
+        yield first
+    yield from rest
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Cek SEO on-page lokal (tanpa AI) dari hasil `page_extract.fetch_page`.
+
+Fakta yang bisa dihitung pasti (panjang title & meta description, struktur
+H1/H2, jumlah kata, kepadatan keyword, alt gambar, link internal/eksternal,
+keterbacaan) dihitung di sini dalam hitungan milidetik. AI cukup dikasih
+ringkasan temuannya (`format_findings`) plus cuplikan teks pendek, dan audit
+massal bisa jalan mode "metrik aja" tanpa inferensi sama sekali.
+"""
+import re
+from collections import Counter
+
+TITLE_RANGE = (30, 60)  # Karakter; di luar ini biasanya kepotong / kurang deskriptif di hasil pencarian
+META_DESCRIPTION_RANGE = (70, 160)
+MIN_WORDS = 300
+MAX_KEYWORD_DENSITY = 3.0  # Persen; di atas ini mulai kelihatan keyword stuffing
+MIN_ALT_COVERAGE = 90.0  # Persen gambar yang punya alt
+MIN_READABILITY = 40.0
+TOP_TERMS = 10
+
+# Kata fungsi Bahasa Indonesia (plus sedikit Inggris yang sering nyelip) yang nggak dihitung sebagai keyword
+STOPWORDS = frozenset("""
+ada adalah agar akan aku anda apa apakah atau bagai bagaimana bahwa baik banyak beberapa begitu belum
+berapa bisa boleh bukan cukup dalam dan dapat dari daripada dengan di dia hal hanya harus hingga ia ialah
+ini itu jadi jika juga kalau kami kamu kan karena ke kepada ketika kita lagi lain lebih maka masih mau
+mereka misal nya oleh pada para per perlu pun saat saja sama sampai sangat satu sebagai sebelum sedang
+sehingga sejak seperti serta setelah sudah supaya tak tanpa tapi tentang tersebut tetapi tidak untuk
+yaitu yakni yang nggak gak aja sih deh dong kok ya biar buat udah bakal jangan kayak banget
+the and for with that this from are was you your
+""".split())
+
+# Perkiraan rata-rata suku kata per kata: Inggris ±1,5, Bahasa Indonesia ±2,6 (kata dasar & imbuhan
+# lebih panjang). Bobot suku kata rumus Flesch diskalakan dengan rasio ini, jadi teks Indonesia yang
+# wajar nggak otomatis dinilai "sulit" cuma karena katanya bersuku banyak.
+ENGLISH_SYLLABLES_PER_WORD = 1.5
+INDONESIAN_SYLLABLES_PER_WORD = 2.6
+
+_WORD_RE = re.compile(r"[^\W_]+(?:[-'][^\W_]+)*")
+_SENTENCE_END_RE = re.compile(r"[.!?…]+(?=\s|$)")
+_SYLLABLE_RE = re.compile(r"ai|au|oi|[aiueo]")  # Diftong Indonesia dihitung satu suku kata
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def tokenize(text: str) -> list:
+    """Kata (huruf kecil) dari teks; kata ulang berstrip (misal `kupu-kupu`) tetap satu kata."""
+    return _WORD_RE.findall((text or "").lower())
+
+
+def count_syllables(word: str) -> int:
+    """Perkiraan suku kata Bahasa Indonesia: jumlah kelompok vokal (diftong ai/au/oi = satu)."""
+    return max(1, len(_SYLLABLE_RE.findall(word)))
+
+
+def count_sentences(text: str) -> int:
+    return max(1, len(_SENTENCE_END_RE.findall(text or "")))
+
+
+def readability(words: list, sentences: int) -> dict:
+    """
+    Skor keterbacaan 0-100 (makin tinggi makin gampang): rumus Flesch Reading
+    Ease dengan bobot suku kata yang disesuaikan buat Bahasa Indonesia.
+
+    Returns:
+        dict: `score`, `label`, `avg_sentence_words`, `avg_syllables`.
+    """
+    if not words:
+        return {'score': None, 'label': None, 'avg_sentence_words': None, 'avg_syllables': None}
+    words_per_sentence = len(words) / max(sentences, 1)
+    syllables_per_word = sum(count_syllables(word) for word in words) / len(words)
+    scaled_syllables = syllables_per_word * ENGLISH_SYLLABLES_PER_WORD / INDONESIAN_SYLLABLES_PER_WORD
+    score = min(100.0, max(0.0, 206.835 - 1.015 * words_per_sentence - 84.6 * scaled_syllables))
+    if score >= 80:
+        label = "sangat mudah"
+    elif score >= 60:
+        label = "mudah"
+    elif score >= 40:
+        label = "sedang"
+    elif score >= 20:
+        label = "sulit"
+    else:
+        label = "sangat sulit"
+    return {'score': round(score, 1), 'label': label, 'avg_sentence_words': round(words_per_sentence, 1),
+            'avg_syllables': round(syllables_per_word, 2)}
+
+
+def term_index(words: list) -> Counter:
+    """
+    Indeks frekuensi istilah: kata (bukan stopword, minimal 3 huruf, bukan angka)
+    dan frasa dua kata yang dua-duanya bukan stopword.
+    """
+    def _is_term(word):
+        return len(word) >= 3 and word not in STOPWORDS and not _NUMBER_RE.fullmatch(word)
+
+    index = Counter(word for word in words if _is_term(word))
+    index.update(f"{first} {second}" for first, second in zip(words, words[1:]) if _is_term(first) and _is_term(second))
+    return index
+
+
+def keyword_density(words: list, phrase: str) -> dict:
+    """Kemunculan `phrase` (bisa beberapa kata) di `words` dan kepadatannya (persen kata yang tertutup frasa)."""
+    terms = tokenize(phrase)
+    if not terms or not words:
+        return {'keyword': phrase, 'count': 0, 'density': 0.0}
+    size = len(terms)
+    count = sum(1 for i in range(len(words) - size + 1) if words[i:i + size] == terms)
+    return {'keyword': phrase, 'count': count, 'density': round(count * size / len(words) * 100, 2)}
+
+
+def _length_status(length: int, bounds: tuple) -> str:
+    if not length:
+        return "kosong"
+    if length < bounds[0]:
+        return "kependekan"
+    if length > bounds[1]:
+        return "kepanjangan"
+    return "ok"
+
+
+def heading_outline(headings: list) -> dict:
+    """Jumlah H1/H2 dan lompatan level heading (misal H2 langsung ke H4)."""
+    levels = [int(heading['tag'][1]) for heading in headings]
+    skipped = [f"H{previous}→H{level}" for previous, level in zip(levels, levels[1:]) if level > previous + 1]
+    return {
+        'h1': levels.count(1),
+        'h2': levels.count(2),
+        'h1_texts': [heading['text'] for heading in headings if heading['tag'] == 'h1'][:3],
+        'skipped_levels': skipped,
+    }
+
+
+def analyze_page_rules(page: dict, focus_keyword: str = None) -> dict:
+    """
+    Cek SEO on-page satu halaman (hasil `fetch_page`) tanpa AI.
+
+    Args:
+        page (dict): Hasil `fetch_page`.
+        focus_keyword (str): Keyword utama yang ditargetkan. Kosong = pakai istilah
+            yang paling sering muncul sebagai perkiraan.
+
+    Returns:
+        dict: Laporan yang bisa di-serialize ke JSON: `title`, `meta_description`
+        (`length`, `status`), `headings` (lihat `heading_outline`), `words`,
+        `sentences`, `readability`, `top_terms`, `focus` (kepadatan & posisi
+        keyword utama), `images`, `links`, `checks` (nama cek -> lulus/nggak),
+        `score` (persen cek yang lulus), `issues` (pesan masalah), `truncated`.
+    """
+    text = page.get('text', '')
+    words = tokenize(text)
+    sentences = count_sentences(text)
+    index = term_index(words)
+    top_terms = [{'term': term, 'count': count, 'density': round(count * len(term.split()) / len(words) * 100, 2)}
+                 for term, count in index.most_common(TOP_TERMS)] if words else []
+
+    title_length = len(page.get('title') or '')
+    meta_length = len(page.get('meta_description') or '')
+    outline = heading_outline(page.get('headings') or [])
+    keyword = (focus_keyword or '').strip() or (top_terms[0]['term'] if top_terms else '')
+    focus = keyword_density(words, keyword) if keyword else None
+    if focus is not None:
+        focus['guessed'] = not (focus_keyword or '').strip()
+        focus['in_title'] = keyword.lower() in (page.get('title') or '').lower()
+        focus['in_meta_description'] = keyword.lower() in (page.get('meta_description') or '').lower()
+        focus['in_h1'] = any(keyword.lower() in heading.lower() for heading in outline['h1_texts'])
+
+    images = page.get('images') or {'total': 0, 'missing_alt': 0}
+    alt_coverage = (round((images['total'] - images['missing_alt']) / images['total'] * 100, 1)
+                    if images['total'] else None)
+    links = page.get('links') or {'internal': 0, 'external': 0, 'nofollow': 0}
+    reading = readability(words, sentences)
+
+    checks = {
+        'title': _length_status(title_length, TITLE_RANGE) == "ok",
+        'meta_description': _length_status(meta_length, META_DESCRIPTION_RANGE) == "ok",
+        'single_h1': outline['h1'] == 1,
+        'has_h2': outline['h2'] > 0,
+        'heading_order': not outline['skipped_levels'],
+        'word_count': len(words) >= MIN_WORDS,
+        'image_alt': alt_coverage is None or alt_coverage >= MIN_ALT_COVERAGE,
+        'internal_links': links['internal'] > 0,
+        'readability': reading['score'] is not None and reading['score'] >= MIN_READABILITY,
+        'keyword_density': focus is None or focus['density'] <= MAX_KEYWORD_DENSITY,
+    }
+    if focus is not None and not focus['guessed']:
+        checks['keyword_in_title'] = focus['in_title']
+        checks['keyword_in_h1'] = focus['in_h1']
+
+    issues = []
+    if not checks['title']:
+        issues.append(f"Title {_length_status(title_length, TITLE_RANGE)} ({title_length} karakter, idealnya "
+                      f"{TITLE_RANGE[0]}-{TITLE_RANGE[1]}).")
+    if not checks['meta_description']:
+        issues.append(f"Meta description {_length_status(meta_length, META_DESCRIPTION_RANGE)} ({meta_length} karakter, "
+                      f"idealnya {META_DESCRIPTION_RANGE[0]}-{META_DESCRIPTION_RANGE[1]}).")
+    if not checks['single_h1']:
+        issues.append("Nggak ada H1." if outline['h1'] == 0 else f"Ada {outline['h1']} H1 (idealnya satu).")
+    if not checks['has_h2']:
+        issues.append("Nggak ada H2 buat bagi konten jadi subbagian.")
+    if not checks['heading_order']:
+        issues.append(f"Level heading loncat: {', '.join(outline['skipped_levels'][:5])}.")
+    if not checks['word_count']:
+        issues.append(f"Konten tipis ({len(words)} kata, minimal {MIN_WORDS}).")
+    if not checks['image_alt']:
+        issues.append(f"{images['missing_alt']} dari {images['total']} gambar nggak punya alt.")
+    if not checks['internal_links']:
+        issues.append("Nggak ada link internal di konten.")
+    if not checks['readability'] and reading['score'] is not None:
+        issues.append(f"Keterbacaan {reading['label']} (skor {reading['score']}, rata-rata "
+                      f"{reading['avg_sentence_words']} kata per kalimat).")
+    if not checks['keyword_density']:
+        issues.append(f"Keyword \"{focus['keyword']}\" kepadatannya {focus['density']}% (di atas "
+                      f"{MAX_KEYWORD_DENSITY}%, rawan dianggap stuffing).")
+    if checks.get('keyword_in_title') is False:
+        issues.append(f"Keyword \"{focus['keyword']}\" nggak ada di title.")
+    if checks.get('keyword_in_h1') is False:
+        issues.append(f"Keyword \"{focus['keyword']}\" nggak ada di H1.")
+
+    return {
+        'title': {'length': title_length, 'status': _length_status(title_length, TITLE_RANGE)},
+        'meta_description': {'length': meta_length, 'status': _length_status(meta_length, META_DESCRIPTION_RANGE)},
+        'headings': outline,
+        'words': len(words),
+        'sentences': sentences if words else 0,
+        'readability': reading,
+        'top_terms': top_terms,
+        'focus': focus,
+        'images': dict(images, alt_coverage=alt_coverage),
+        'links': links,
+        'checks': checks,
+        'score': round(sum(checks.values()) / len(checks) * 100),
+        'issues': issues,
+        'truncated': bool(page.get('truncated')),
+    }
+
+
+def format_findings(report: dict) -> str:
+    """Ringkasan padat laporan `analyze_page_rules` buat prompt AI (beberapa baris aja)."""
+    headings = report['headings']
+    reading = report['readability']
+    images = report['images']
+    links = report['links']
+    lines = [
+        f"Skor on-page: {report['score']}/100",
+        f"Title: {report['title']['length']} karakter ({report['title']['status']}); "
+        f"meta description: {report['meta_description']['length']} karakter ({report['meta_description']['status']})",
+        f"Heading: {headings['h1']} H1, {headings['h2']} H2"
+        + (f", level loncat {', '.join(headings['skipped_levels'][:3])}" if headings['skipped_levels'] else ""),
+        f"Jumlah kata: {report['words']}" + (" (halaman kepotong, dihitung dari bagian awal)" if report['truncated'] else ""),
+    ]
+    if reading['score'] is not None:
+        lines.append(f"Keterbacaan: {reading['score']}/100 ({reading['label']}), "
+                     f"{reading['avg_sentence_words']} kata per kalimat")
+    if report['top_terms']:
+        lines.append("Istilah paling sering: " + ", ".join(f"{term['term']} ({term['density']}%)"
+                                                          for term in report['top_terms'][:6]))
+    focus = report['focus']
+    if focus is not None and not focus['guessed']:
+        lines.append(f"Keyword utama \"{focus['keyword']}\": {focus['count']}x ({focus['density']}%), "
+                     f"di title: {'ya' if focus['in_title'] else 'nggak'}, di H1: {'ya' if focus['in_h1'] else 'nggak'}")
+    if images['total']:
+        lines.append(f"Gambar: {images['total']}, tanpa alt: {images['missing_alt']}")
+    lines.append(f"Link di konten: {links['internal']} internal, {links['external']} eksternal")
+    if report['issues']:
+        lines.append("Masalah: " + " ".join(report['issues']))
+    return "\n".join(lines)
@@ -0,0 +1,1453 @@
+# -*- coding: utf-8 -*-
+"""
+Lapisan tugas SEO (keyword, meta tag, artikel, humanize, tidy, analisis SEO,
+chat) tanpa UI, jadi bisa dipakai dari aplikasi Streamlit, CLI batch
+(`wolf_cli.py`), cron, atau service lain.
+
+Semua fitur AI menggunakan Ollama dengan output Bahasa Indonesia santai.
+Objek bersama (pool host, cache, penjadwal, pencatat metrik) dibuat sekali
+per proses lewat `shared_resource`. Streamlit nggak wajib terpasang.
+"""
+import csv
+import functools
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from article_pipeline import run_article_pipeline, split_into_windows
+from background_jobs import JobManager
+from char_budget import BOUNDARY_SENTENCE, BOUNDARY_WORD, CharBudget
+from concurrent_streams import make_executor, ordered_streams
+from disk_cache import DiskCache, make_cache_key
+from generation_scheduler import (CancelToken, GenerationCancelled, GenerationScheduler, SchedulerFullError,
+                                  PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK)
+from json_stream import JsonObjectStream
+from ollama_metrics import MetricsRecorder, build_metrics_record
+from ollama_pool import OllamaPool, parse_hosts
+from page_extract import fetch_page
+from seo_rules import analyze_page_rules, format_findings
+from site_audit import HostThrottle, make_http_session, run_audit_pipeline
+from tidy_engine import TidyEngine
+from token_budget import TEMPLATE_OVERHEAD_TOKENS, TokenEstimator
+
+try:
+    # Buat pembagian giliran per sesi browser di penjadwal
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # Dipakai tanpa Streamlit (CLI, cron)
+    get_script_run_ctx = None
+
+
+def shared_resource(factory):
+    """
+    Memo satu instance per proses untuk fungsi tanpa argumen (pengganti
+    `st.cache_resource` yang nggak butuh Streamlit). Aman dipanggil dari banyak thread.
+    `install(instance)` memasang instance buatan sendiri (misal penjadwal khusus CLI)
+    sebelum dipakai pertama kali.
+    """
+    lock = threading.Lock()
+    instances = []
+
+    def _install(instance):
+        with lock:
+            if instances:
+                raise RuntimeError(f"`{factory.__name__}` sudah terlanjur dibuat.")
+            instances.append(instance)
+
+    @functools.wraps(factory)
+    def _get():
+        if not instances:
+            with lock:
+                if not instances:
+                    instances.append(factory())
+        return instances[0]
+
+    _get.clear = instances.clear
+    _get.install = _install
+    return _get
+
+
+# --- Konfigurasi (bisa diatur lewat environment variable) ---
+# Konfigurasi Global Ollama
+OLLAMA_MODEL = "gemma3:1b" # Ganti jika perlu model lain
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434") # Bisa diarahkan ke server lain (misal fake server benchmark)
+# Beberapa server Ollama sekaligus (dipisah koma); default cuma OLLAMA_HOST
+OLLAMA_HOSTS = parse_hosts(os.environ.get("OLLAMA_HOSTS", OLLAMA_HOST))
+OLLAMA_HEALTH_INTERVAL = float(os.environ.get("WOLF_OLLAMA_HEALTH_INTERVAL", "15")) # Detik antar health check host
+# Penjadwal generasi lintas sesi: slot = OLLAMA_NUM_PARALLEL per host, sisanya antre (atau ditolak kalau kepanjangan)
+GENERATION_SLOTS_PER_HOST = int(os.environ.get("WOLF_GENERATION_SLOTS", "4"))
+GENERATION_QUEUE_MAX = int(os.environ.get("WOLF_GENERATION_QUEUE_MAX", "32"))
+TASK_PRIORITIES = {
+    'keywords': PRIORITY_INTERACTIVE,
+    'meta': PRIORITY_INTERACTIVE,
+    'seo_pack': PRIORITY_INTERACTIVE,
+    'chat': PRIORITY_INTERACTIVE,
+    'humanize': PRIORITY_NORMAL,
+    'analyze': PRIORITY_NORMAL,
+    'analyze_section': PRIORITY_NORMAL,
+    'embed': PRIORITY_NORMAL,
+    'article': PRIORITY_BULK,
+    'chat_summary': PRIORITY_BULK,
+}
+INSTRUCTION_STYLE = "Hasilnya *harus* dalam Bahasa Indonesia gaya santai atau gaul sehari-hari, tapi tetap terdengar profesional dan mudah dimengerti. Hindari bahasa terlalu kaku atau formal."
+# Awalan tetap semua prompt (dikirim sebagai `system`). Harus sama persis di semua tugas supaya Ollama
+# bisa pakai ulang KV cache-nya; instruksi per tugas & isian yang berubah-ubah ada di prompt user.
+SYSTEM_PROMPT = f"Kamu asisten SEO dan penulis konten yang paham pembaca Indonesia. {INSTRUCTION_STYLE}"
+
+# Konfigurasi Cache (bisa diatur lewat environment variable)
+CACHE_DIR = os.environ.get("WOLF_CACHE_DIR", ".wolf_cache")
+GENERATION_CACHE_ENABLED = os.environ.get("WOLF_GENERATION_CACHE", "1") != "0"
+GENERATION_CACHE_MAX_BYTES = int(os.environ.get("WOLF_GENERATION_CACHE_MB", "200")) * 1024 * 1024
+GENERATION_CACHE_TTL = int(os.environ.get("WOLF_GENERATION_CACHE_TTL", str(7 * 24 * 3600))) # Detik
+KEYWORD_BATCH_DIR = os.path.join(CACHE_DIR, "batches")
+AUDIT_HTTP_POOL_SIZE = 16 # Koneksi keep-alive per host buat audit massal
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("WOLF_PAGE_CACHE_MB", "100")) * 1024 * 1024
+PAGE_CACHE_TTL = 30 * 24 * 3600 # Detik; validator ETag/Last-Modified tetap dicek tiap fetch
+ARTICLE_PIPELINE_WORKERS = 2 # Paragraf yang di-humanize bareng di mode sekali jalan
+# Humanize per jendela buat artikel panjang; worker sebaiknya = OLLAMA_NUM_PARALLEL server
+HUMANIZE_WORKERS = int(os.environ.get("WOLF_HUMANIZE_WORKERS", "4"))
+HUMANIZE_WINDOW_TOKENS = 400 # Perkiraan token per jendela
+HUMANIZE_CONTEXT_CHARS = 300 # Potongan jendela tetangga yang ikut dikirim sebagai konteks
+HUMANIZE_GROWTH = 1.3 # Gaya ngobrol biasanya sedikit lebih panjang dari teks asli
+# Jendela konteks model (token); samakan dengan num_ctx model / OLLAMA_CONTEXT_LENGTH server
+OLLAMA_CONTEXT_TOKENS = int(os.environ.get("WOLF_NUM_CTX", "4096"))
+CONTEXT_MARGIN_TOKENS = 64 # Cadangan buat template prompt & meleset-nya perkiraan token
+MIN_NUM_PREDICT = 32
+KEYWORD_CHARS = 30 # Perkiraan karakter per keyword (termasuk koma & spasi)
+# Dedup & pengelompokan keyword pakai embedding (model harus sudah di-pull, misal `ollama pull nomic-embed-text`)
+EMBED_MODEL = os.environ.get("WOLF_EMBED_MODEL", "nomic-embed-text")
+EMBED_BATCH_SIZE = 64 # Keyword per panggilan /api/embed
+KEYWORD_DEDUP_THRESHOLD = float(os.environ.get("WOLF_KEYWORD_DEDUP_THRESHOLD", "0.92")) # Cosine similarity
+# Analisis SEO: teks halaman yang diambil; yang nggak muat satu prompt dianalisis per bagian (map-reduce)
+ANALYZE_TEXT_BUDGET = int(os.environ.get("WOLF_ANALYZE_MAX_CHARS", "60000"))
+ANALYZE_EXCERPT_CHARS = int(os.environ.get("WOLF_ANALYZE_EXCERPT_CHARS", "1500")) # Cuplikan teks yang ikut di mode cepat
+ANALYSIS_MODES = ('quick', 'deep', 'metrics') # Cek otomatis + AI (cuplikan), + AI baca seluruh teks, atau tanpa AI
+ANALYZE_OUTPUT_TOKENS = 400
+ANALYZE_SECTION_OUTPUT_TOKENS = 250
+ANALYZE_SECTION_WORKERS = int(os.environ.get("WOLF_ANALYZE_WORKERS", "4"))
+OLLAMA_KEEP_ALIVE = os.environ.get("WOLF_OLLAMA_KEEP_ALIVE", "30m") # Model tetap di memori (dan KV cache-nya) selama ini
+METRICS_LOG_PATH = os.environ.get("WOLF_METRICS_LOG", os.path.join(CACHE_DIR, "metrics.jsonl")) # Kosongkan buat matikan log file
+STARTUP_LOG_PATH = os.environ.get("WOLF_STARTUP_LOG", os.path.join(CACHE_DIR, "startup.jsonl")) # Waktu tampil app, terpisah dari metrik generasi
+CHAT_HISTORY_TOKENS = 1200 # Jatah token pesan chat yang dikirim apa adanya; sisanya diringkas
+CHAT_SUMMARY_TOKENS = 250 # Maks token ringkasan obrolan
+MODEL_WARMUP_ENABLED = os.environ.get("WOLF_MODEL_WARMUP", "1") != "0" # Preload model di background pas app start
+# Job background (artikel, humanize, audit) yang tetap jalan walau script di-rerun / tab browser putus
+JOB_WORKERS = int(os.environ.get("WOLF_JOB_WORKERS", "4"))
+JOB_TTL = int(os.environ.get("WOLF_JOB_TTL", str(6 * 3600))) # Detik hasil job yang sudah selesai disimpan
+CHAT_SYSTEM_PROMPT = f"{SYSTEM_PROMPT}\n\nDi chat ini kamu BABAYO, asisten AI yang ramah dan nyambung sama obrolan sebelumnya."
+
+class OllamaGenerationError(Exception):
+    """Error dari Ollama, dilempar helper kalau `raise_errors=True` (mode batch)."""
+
+@shared_resource
+def load_ollama_pool():
+    """Inisialisasi dan cache pool host Ollama (`OLLAMA_HOSTS`), health check berkala jalan di background."""
+    pool = OllamaPool(OLLAMA_HOSTS, OLLAMA_MODEL, check_interval=OLLAMA_HEALTH_INTERVAL)
+    healthy = pool.check_health() # Cek koneksi
+    print(f"Pool Ollama: {len(healthy)}/{len(pool.hosts)} host terkoneksi.")
+    return pool.start()
+
+@shared_resource
+def load_generation_cache():
+    """Inisialisasi dan cache objek cache disk untuk hasil generasi Ollama."""
+    return DiskCache(
+        os.path.join(CACHE_DIR, "generations"),
+        max_bytes=GENERATION_CACHE_MAX_BYTES,
+        ttl_seconds=GENERATION_CACHE_TTL
+    )
+
+@shared_resource
+def load_page_caches():
+    """Inisialisasi dan cache (page cache per URL, memo ekstraksi per hash konten)."""
+    page_cache = DiskCache(os.path.join(CACHE_DIR, "pages"), max_bytes=PAGE_CACHE_MAX_BYTES, ttl_seconds=PAGE_CACHE_TTL)
+    extraction_cache = DiskCache(os.path.join(CACHE_DIR, "extractions"), max_bytes=PAGE_CACHE_MAX_BYTES, ttl_seconds=PAGE_CACHE_TTL)
+    return page_cache, extraction_cache
+
+@shared_resource
+def load_token_estimator():
+    """Inisialisasi dan cache perkiraan token per model (rasio karakter/token disimpan di cache disk)."""
+    return TokenEstimator(DiskCache(os.path.join(CACHE_DIR, "tokens"), max_bytes=1024 * 1024))
+
+def count_tokens(text: str) -> int:
+    """Perkiraan jumlah token `text` buat `OLLAMA_MODEL`."""
+    return load_token_estimator().count(OLLAMA_MODEL, text)
+
+def output_tokens(chars: float) -> int:
+    """`num_predict` buat output sepanjang kira-kira `chars` karakter."""
+    return load_token_estimator().output_tokens(OLLAMA_MODEL, chars)
+
+def fit_num_predict(prompt: str, max_tokens: int, system: str = SYSTEM_PROMPT) -> int:
+    """Potong `max_tokens` supaya system prompt + prompt + output muat di jendela konteks model."""
+    available = OLLAMA_CONTEXT_TOKENS - count_tokens(system) - count_tokens(prompt) - CONTEXT_MARGIN_TOKENS
+    return max(min(max_tokens, available), MIN_NUM_PREDICT)
+
+def prompt_room(prompt_overhead: str, max_tokens: int) -> int:
+    """Sisa token konteks buat konten, setelah system prompt, instruksi (`prompt_overhead`) dan jatah output."""
+    return (OLLAMA_CONTEXT_TOKENS - count_tokens(SYSTEM_PROMPT) - count_tokens(prompt_overhead) - max_tokens
+            - CONTEXT_MARGIN_TOKENS)
+
+def observe_prompt_eval(system: str, prompt: str, prompt_eval_count) -> dict:
+    """
+    Bandingkan `prompt_eval_count` generasi yang selesai dengan perkiraan token
+    system + prompt. Kalau yang dievaluasi jauh lebih sedikit, awalannya (system
+    prompt) dipakai ulang dari KV cache Ollama. Kalibrasi rasio karakter/token
+    cuma pakai bagian yang memang dievaluasi.
+
+    Returns:
+        dict: Field metrik `prompt_tokens_estimate` dan `prompt_cached_tokens`
+        (perkiraan token prompt yang nggak dievaluasi ulang). Kosong kalau Ollama nggak lapor.
+    """
+    if not prompt_eval_count:
+        return {}
+    estimator = load_token_estimator()
+    estimate = estimator.count(OLLAMA_MODEL, system) + estimator.count(OLLAMA_MODEL, prompt) + TEMPLATE_OVERHEAD_TOKENS
+    prefix_reused = bool(system) and prompt_eval_count < estimate - estimator.count(OLLAMA_MODEL, system) / 2
+    estimator.observe(OLLAMA_MODEL, len(prompt) if prefix_reused else len(system) + len(prompt), prompt_eval_count)
+    return {'prompt_tokens_estimate': estimate, 'prompt_cached_tokens': max(estimate - prompt_eval_count, 0)}
+
+def task_prompt(instructions: str, *fields) -> str:
+    """
+    Prompt tugas (dikirim setelah `SYSTEM_PROMPT`): instruksi tetap duluan, isian
+    yang berubah-ubah paling akhir, jadi panggilan tugas yang sama berbagi awalan
+    sepanjang mungkin.
+
+    Args:
+        instructions (str): Instruksi tugas (sama di tiap panggilan).
+        *fields: Pasangan `(label, nilai)` sesuai urutan. Nilai pendek jadi
+            `Label: nilai`; teks panjang / multi-baris dibungkus blok `---`.
+    """
+    lines = [instructions.strip(), ""]
+    for label, value in fields:
+        value = str(value)
+        if '\n' in value or len(value) > 200:
+            lines.extend([f"{label}:", "---", value, "---"])
+        else:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
+@shared_resource
+def load_generation_scheduler():
+    """Inisialisasi dan cache penjadwal generasi bersama semua sesi browser."""
+    return GenerationScheduler(max_concurrent=GENERATION_SLOTS_PER_HOST * len(OLLAMA_HOSTS), max_queue=GENERATION_QUEUE_MAX)
+
+_job_context = threading.local() # Pemilik job background yang lagi jalan di thread ini
+
+def current_session_id():
+    """ID sesi browser yang lagi jalan (pemilik job di thread job; None di CLI / thread tanpa konteks Streamlit)."""
+    owner = getattr(_job_context, 'owner', None)
+    if owner is not None:
+        return owner
+    if get_script_run_ctx is None:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+@shared_resource
+def load_metrics_recorder():
+    """Inisialisasi dan cache pencatat metrik generasi (log JSONL + record terbaru di memori)."""
+    return MetricsRecorder(METRICS_LOG_PATH or None)
+
+@shared_resource
+def load_startup_recorder():
+    """Inisialisasi dan cache pencatat waktu tampil app (bukan panggilan Ollama, jadi nggak ikut `summary_by_task`)."""
+    return MetricsRecorder(STARTUP_LOG_PATH or None, keep_recent=200)
+
+def record_app_startup(started: float) -> float:
+    """
+    Catat lama run pertama satu sesi, dari `started` (`time.perf_counter()`) sampai sekarang.
+
+    Returns:
+        float: Lamanya (detik).
+    """
+    seconds = time.perf_counter() - started
+    try:
+        load_startup_recorder().record({'timestamp': round(time.time(), 3), 'seconds': round(seconds, 3)})
+    except Exception as e:
+        print(f"Gagal catat waktu startup: {e}") # Log error
+    return seconds
+
+def record_generation_metrics(task: str, started: float, recorder: MetricsRecorder = None, **fields):
+    """
+    Catat metrik satu panggilan Ollama (lihat `build_metrics_record`).
+    """
+    try:
+        (recorder or load_metrics_recorder()).record(build_metrics_record(task, OLLAMA_MODEL, started, **fields))
+    except Exception as e:
+        print(f"Gagal catat metrik: {e}") # Metrik nggak boleh bikin generasi gagal
+
+@shared_resource
+def load_background_executor():
+    """Executor bersama buat kerjaan background (misal ringkasan chat)."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="wolf-bg")
+
+def warm_up_model(host, recorder: MetricsRecorder = None) -> bool:
+    """
+    Muat `OLLAMA_MODEL` ke memori satu host dan minta tetap di sana selama
+    `OLLAMA_KEEP_ALIVE`, jadi generasi pertama user nggak nanggung waktu load
+    model. Sekalian `SYSTEM_PROMPT` dievaluasi (satu token output), jadi KV cache
+    awalan bersama sudah siap. Dijalankan di thread background.
+
+    Returns:
+        bool: True kalau model berhasil dimuat.
+    """
+    started = time.perf_counter()
+    try:
+        response = host.client.generate(model=OLLAMA_MODEL, system=SYSTEM_PROMPT, prompt="Siap?",
+                                        options={'num_predict': 1}, keep_alive=OLLAMA_KEEP_ALIVE)
+    except Exception as e:
+        print(f"Warm-up model di {host.url} gagal: {e}") # Log error
+        record_generation_metrics('warmup', started, recorder, status='error', host=host.url)
+        return False
+    record_generation_metrics('warmup', started, recorder, final_chunk=response, host=host.url)
+    return True
+
+@shared_resource
+def start_model_warmup():
+    """Jadwalkan warm-up model di tiap host sehat, sekali per proses server (future-nya nggak ditunggu)."""
+    if not MODEL_WARMUP_ENABLED:
+        return []
+    recorder = load_metrics_recorder()
+    executor = load_background_executor()
+    return [executor.submit(warm_up_model, host, recorder) for host in load_ollama_pool().healthy_hosts()]
+
+@shared_resource
+def load_job_manager():
+    """Inisialisasi dan cache pengelola job background (hasil yang selesai juga disimpan di cache disk)."""
+    store = DiskCache(os.path.join(CACHE_DIR, "jobs"), max_bytes=GENERATION_CACHE_MAX_BYTES, ttl_seconds=JOB_TTL)
+    return JobManager(max_workers=JOB_WORKERS, ttl_seconds=JOB_TTL, store=store)
+
+def submit_job(kind: str, run, *args, label: str = None, owner=None, **kwargs):
+    """
+    Jalankan `run(job, *args, **kwargs)` sebagai job background.
+
+    Generasi di dalam job tetap dihitung milik `owner` (default: sesi yang
+    mengirim) di penjadwal, jadi pembagian giliran antar sesi tetap adil.
+
+    Returns:
+        Job: Job baru (lihat `background_jobs.Job`).
+    """
+    owner = owner if owner is not None else current_session_id()
+
+    def _run(job):
+        _job_context.owner = owner
+        try:
+            return run(job, *args, **kwargs)
+        finally:
+            _job_context.owner = None
+
+    return load_job_manager().submit(kind, _run, label=label, owner=owner)
+
+def fetch_page_cached(url: str, session: requests.Session = None, text_budget: int = ANALYZE_TEXT_BUDGET) -> dict:
+    """`fetch_page` dengan conditional request & memo ekstraksi dari cache halaman."""
+    page_cache, extraction_cache = load_page_caches()
+    return fetch_page(url, session, text_budget=text_budget, page_cache=page_cache, extraction_cache=extraction_cache)
+
+# --- Fungsi Helper Ollama dengan Streaming ---
+
+def generate_ollama_stream_helper(prompt: str, max_tokens: int = 300, options: dict = None, use_cache: bool = True,
+                                  raise_errors: bool = False, task: str = "generate", on_progress=None,
+                                  priority: int = None, on_queue=None, system: str = SYSTEM_PROMPT, format=None,
+                                  max_chars: int = None, boundary: str = BOUNDARY_WORD, cancel: CancelToken = None,
+                                  session=None, stop_sequences: tuple = ()):
+    """
+    Helper generator untuk streaming respons dari Ollama.
+
+    `system` (default `SYSTEM_PROMPT`, sama di semua tugas) dikirim sebagai
+    awalan tetap dan model diminta tetap di memori (`keep_alive`), jadi Ollama
+    bisa pakai ulang KV cache awalan itu dan cuma mengevaluasi prompt tugasnya.
+    Token prompt yang kepakai ulang ikut dicatat di metrik (`prompt_cached_tokens`).
+
+    Respons yang selesai dengan normal disimpan ke cache disk (kunci: model,
+    system, prompt, opsi). Kalau prompt yang sama muncul lagi, potongan teks yang
+    tersimpan diputar ulang lewat generator yang sama, jadi `write_stream`
+    dan efek ketik tetap jalan tanpa perlu ke Ollama.
+
+    Tiap panggilan dicatat metriknya (TTFT, token/detik, token prompt, waktu
+    load model, wall time) dengan tag `task`, termasuk yang gagal atau
+    dihentikan di tengah.
+
+    `max_tokens` dipotong kalau prompt + output nggak muat di jendela konteks,
+    dan `prompt_eval_count` dari generasi yang selesai dipakai buat kalibrasi
+    perkiraan token model (`load_token_estimator`).
+
+    Kalau `max_chars` diisi, output dijaga `CharBudget`: begitu model nulis
+    lewat batas, stream Ollama langsung ditutup (slot penjadwal & host ikut
+    lepas) dan teksnya dipotong di akhir kata/kalimat terakhir yang muat.
+    Metriknya berstatus `'stopped'`.
+
+    Kalau `cancel` di-set (misal tombol batal job), request yang masih antre
+    langsung keluar dari antrean, dan yang sudah jalan menutup koneksi HTTP-nya
+    di chunk berikutnya, jadi Ollama berhenti decoding dan slotnya lepas.
+    Output yang sudah keluar tetap punya pemanggil; metriknya berstatus
+    `'cancelled'` dengan `cancel_reason='user'`.
+
+    Generasi (bukan replay cache) nunggu slot dari penjadwal bersama dulu:
+    prioritasnya dari `TASK_PRIORITIES[task]` kecuali `priority` diisi. Kalau
+    antrean penuh, request ditolak dengan pesan jelas.
+
+    Args:
+        prompt (str): Prompt untuk model Ollama.
+        max_tokens (int): Perkiraan maksimum token (untuk opsi Ollama).
+        options (dict): Opsi tambahan Ollama (misal `seed`, `temperature`).
+        use_cache (bool): Pakai cache generasi atau tidak.
+        raise_errors (bool): Kalau True, error dilempar sebagai
+            `OllamaGenerationError` alih-alih di-yield sebagai teks.
+        task (str): Tag tugas buat metrik (misal `'keywords'`, `'article'`).
+        on_progress (callable): `on_progress(token_diterima, max_tokens)`,
+            dipanggil tiap token datang (buat progress bar asli).
+        priority (int): `PRIORITY_*` penjadwal (default dari tag `task`).
+        on_queue (callable): `on_queue(posisi)` selama nunggu slot (0 = mulai jalan).
+        system (str): System prompt (awalan tetap).
+        format: `'json'` atau JSON schema (dict) buat output terstruktur; None = teks bebas.
+        max_chars (int): Batas panjang output dalam karakter; None = cuma dibatasi `max_tokens`.
+        stop_sequences (tuple): Urutan yang mengakhiri output (butuh `max_chars`). Dicek di `CharBudget`
+            setelah spasi/baris baru di awal dibuang, bukan lewat opsi `stop` Ollama.
+        boundary (str): Batas potong kalau `max_chars` kelewatan (`BOUNDARY_WORD` / `BOUNDARY_SENTENCE`).
+        cancel (CancelToken): Token batal; None = cuma berhenti kalau generator-nya ditutup.
+        session: ID sesi buat giliran adil di penjadwal. Default `current_session_id()` di thread
+            yang pertama kali jalanin generator; isi eksplisit kalau generator-nya jalan di thread worker.
+
+    Yields:
+        str: Potongan teks (chunk) dari respons Ollama.
+        str: Mengembalikan pesan error jika terjadi masalah.
+    """
+    max_tokens = fit_num_predict(prompt, max_tokens, system)
+    ollama_options = {'num_predict': max_tokens} # num_predict sbg estimasi max tokens
+    ollama_options.update(options or {})
+
+    started = time.perf_counter()
+    first_token_at = None
+    received = 0
+    final_chunk = None
+    cache_status = None
+    hosts_used = []
+    queue_seconds = None
+    prompt_stats = {}
+    cancel_reason = None
+    status = 'cancelled' # Berubah kalau stream selesai / error
+    try:
+        cache = load_generation_cache() if (use_cache and GENERATION_CACHE_ENABLED) else None
+        budget = CharBudget(max_chars, boundary, stop_sequences) if max_chars else None
+        cache_key = make_cache_key(OLLAMA_MODEL, system, prompt, ollama_options, format,
+                                   *((max_chars, boundary, list(stop_sequences)) if budget is not None else ()))
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                cache_status = 'hit'
+                for token in cached['chunks']: # Putar ulang dari cache
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    received += 1
+                    if on_progress is not None:
+                        on_progress(received, max_tokens)
+                    yield token
+                status = 'ok'
+                return
+
+        collected_chunks = []
+        completed = False
+        if priority is None:
+            priority = TASK_PRIORITIES.get(task, PRIORITY_NORMAL)
+        try:
+            # Tunggu slot penjadwal (prioritas + giliran adil antar sesi) selama generasi jalan
+            if session is None:
+                session = current_session_id()
+            with load_generation_scheduler().slot(priority, session, on_queue, cancel):
+                queue_seconds = round(time.perf_counter() - started, 3)
+                # Host dipilih pool (paling sepi); kalau mati sebelum token pertama, pindah host
+                stream = load_ollama_pool().stream(
+                    lambda client: client.generate(
+                        model=OLLAMA_MODEL,
+                        system=system,
+                        prompt=prompt,
+                        stream=True,
+                        options=ollama_options,
+                        format=format,
+                        keep_alive=OLLAMA_KEEP_ALIVE
+                    ),
+                    on_host=hosts_used.append
+                )
+                for chunk in stream:
+                    if cancel is not None and cancel.cancelled:
+                        stream.close() # Putus koneksi: Ollama berhenti decoding, slot & host langsung lepas
+                        return
+                    if 'response' in chunk:
+                        token = chunk['response']
+                        if token: # Chunk terakhir biasanya kosong, nggak dihitung token
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                            received += 1
+                            if on_progress is not None:
+                                on_progress(received, max_tokens)
+                        if budget is not None:
+                            token = budget.feed(token) # Ujung yang belum pasti rapi ditahan dulu
+                        collected_chunks.append(token)
+                        if token or budget is None:
+                            yield token
+                        if budget is not None and budget.exhausted:
+                            stream.close() # Sisa output nggak dipakai: putus koneksi, slot & host langsung lepas
+                            completed = True
+                            break
+                    if 'error' in chunk:
+                         status = 'error'
+                         error_message = f"Waduh, ada error dari Ollama: {chunk['error']}"
+                         print(error_message) # Log error
+                         if raise_errors:
+                             raise OllamaGenerationError(error_message)
+                         yield error_message
+                         return
+                    if chunk.get('done'):
+                         completed = True # Streaming selesai
+                         final_chunk = chunk # Chunk terakhir bawa statistik (eval_count, durasi, dll)
+                if budget is not None and not budget.exhausted:
+                    tail = budget.flush()
+                    if tail:
+                        collected_chunks.append(tail)
+                        yield tail
+
+        except OllamaGenerationError:
+            raise
+        except GenerationCancelled:
+            return # Dibatalkan selagi antre: belum ada output
+        except SchedulerFullError as e:
+            status = 'rejected'
+            print(e) # Log error
+            if raise_errors:
+                raise OllamaGenerationError(str(e)) from e
+            yield f"Error: {e}"
+            return
+        except Exception as e:
+            status = 'error'
+            error_msg = f"Waduh, error pas coba ngobrol sama Ollama ({OLLAMA_MODEL}): {e}"
+            print(error_msg) # Log error
+            if "connection refused" in str(e).lower():
+                 error_msg = f"Error: Nggak bisa nyambung ke Ollama di {', '.join(hosts_used) or OLLAMA_HOST}. Udah jalan belum?"
+            if raise_errors:
+                raise OllamaGenerationError(error_msg) from e
+            yield error_msg
+            return
+
+        status = ('stopped' if budget is not None and budget.exhausted else 'ok') if completed else 'incomplete'
+        if final_chunk is not None:
+            prompt_stats = observe_prompt_eval(system, prompt, final_chunk.get('prompt_eval_count'))
+        # Hanya respons yang selesai utuh yang masuk cache
+        if completed and cache is not None:
+            cache.set(cache_key, {'model': OLLAMA_MODEL, 'chunks': collected_chunks})
+    except (Exception, GeneratorExit):
+        raise
+    except BaseException:
+        # Script dihentikan di tengah (misal rerun Streamlit karena tombol stop): generasi lain yang pegang token ikut berhenti
+        if cancel is not None:
+            cancel.cancel()
+        raise
+    finally:
+        if status == 'cancelled' and cancel is not None and cancel.cancelled:
+            cancel_reason = 'user' # Generator ditutup pemanggil setelah tombol stop (misal rerun Streamlit)
+        record_generation_metrics(task, started, first_token_at=first_token_at, final_chunk=final_chunk,
+                                  status=status, cache=cache_status, num_predict=max_tokens, tokens_received=received,
+                                  host=hosts_used[-1] if hosts_used else None, failovers=max(len(hosts_used) - 1, 0),
+                                  queue_seconds=queue_seconds, cancel_reason=cancel_reason, **prompt_stats)
+
+def generate_ollama_chat_stream_helper(messages: list, max_tokens: int = 400, on_progress=None, session_key=None,
+                                       on_queue=None, cancel: CancelToken = None):
+    """
+    Helper generator untuk streaming balasan chat lewat `client.chat` (multi-turn).
+
+    Model diminta tetap di memori (`keep_alive`) supaya awalan percakapan yang
+    sama bisa dipakai ulang dari KV cache di giliran berikutnya; karena itu satu
+    sesi chat (`session_key`) selalu diarahkan ke host yang sama selama host itu
+    sehat. Metriknya dicatat dengan tag `'chat'`. Pembatalan lewat `cancel` sama
+    seperti `generate_ollama_stream_helper`.
+
+    Args:
+        messages (list): Pesan chat (`{'role', 'content'}`), termasuk system prompt.
+        max_tokens (int): Perkiraan maksimum token balasan.
+        on_progress (callable): `on_progress(token_diterima, max_tokens)`.
+        session_key: Kunci sesi chat buat sticky routing di pool host.
+        on_queue (callable): `on_queue(posisi)` selama nunggu slot penjadwal.
+        cancel (CancelToken): Token batal (tombol stop chat).
+
+    Yields:
+        str: Potongan teks balasan, atau pesan error jika terjadi masalah.
+    """
+    started = time.perf_counter()
+    first_token_at = None
+    received = 0
+    final_chunk = None
+    hosts_used = []
+    queue_seconds = None
+    cancel_reason = None
+    status = 'cancelled'
+    try:
+        try:
+            with load_generation_scheduler().slot(TASK_PRIORITIES['chat'], current_session_id(), on_queue, cancel):
+                queue_seconds = round(time.perf_counter() - started, 3)
+                stream = load_ollama_pool().stream(
+                    lambda client: client.chat(
+                        model=OLLAMA_MODEL,
+                        messages=messages,
+                        stream=True,
+                        options={'num_predict': max_tokens},
+                        keep_alive=OLLAMA_KEEP_ALIVE
+                    ),
+                    sticky_key=session_key,
+                    on_host=hosts_used.append
+                )
+                for chunk in stream:
+                    if cancel is not None and cancel.cancelled:
+                        stream.close() # Putus koneksi: Ollama berhenti decoding, slot & host langsung lepas
+                        return
+                    content = (chunk.get('message') or {}).get('content')
+                    if content:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        received += 1
+                        if on_progress is not None:
+                            on_progress(received, max_tokens)
+                        yield content
+                    if chunk.get('done'):
+                        final_chunk = chunk
+                status = 'ok' if final_chunk is not None else 'incomplete'
+        except GenerationCancelled:
+            return # Dibatalkan selagi antre
+        except SchedulerFullError as e:
+            status = 'rejected'
+            yield f"Error: {e}"
+        except Exception as e:
+            status = 'error'
+            error_msg = f"Waduh, error pas coba ngobrol sama Ollama ({OLLAMA_MODEL}): {e}"
+            print(error_msg) # Log error
+            if "connection refused" in str(e).lower():
+                 error_msg = f"Error: Nggak bisa nyambung ke Ollama di {', '.join(hosts_used) or OLLAMA_HOST}. Udah jalan belum?"
+            yield error_msg
+    except (Exception, GeneratorExit):
+        raise
+    except BaseException:
+        if cancel is not None:
+            cancel.cancel() # Script dihentikan di tengah (tombol stop)
+        raise
+    finally:
+        if status == 'cancelled' and cancel is not None and cancel.cancelled:
+            cancel_reason = 'user'
+        record_generation_metrics('chat', started, first_token_at=first_token_at, final_chunk=final_chunk,
+                                  status=status, num_predict=max_tokens, tokens_received=received,
+                                  host=hosts_used[-1] if hosts_used else None, failovers=max(len(hosts_used) - 1, 0),
+                                  queue_seconds=queue_seconds, cancel_reason=cancel_reason)
+
+def summarize_chat(pool: OllamaPool, previous_summary: str, messages: list, recorder: MetricsRecorder = None,
+                   session_key=None, scheduler: GenerationScheduler = None) -> str:
+    """
+    Ringkas giliran chat lama (plus ringkasan sebelumnya) jadi catatan singkat.
+    Dijalankan di thread background (prioritas rendah di penjadwal).
+    """
+    transcript = "\n".join(f"{'User' if m['role'] == 'user' else 'Asisten'}: {m['content']}" for m in messages)
+    previous = f"Ringkasan sebelumnya:\n{previous_summary}\n\n" if previous_summary else ""
+    prompt = f"""Gabungkan ringkasan sebelumnya (kalau ada) dan obrolan lanjutan di bawah jadi satu ringkasan singkat (maks 8 poin) yang isinya fakta penting, preferensi user, dan topik yang lagi dibahas. Tulis ringkasannya aja.
+
+{previous}Obrolan lanjutan:
+{transcript}"""
+    started = time.perf_counter()
+    hosts_used = []
+    try:
+        with (scheduler or load_generation_scheduler()).slot(TASK_PRIORITIES['chat_summary'], session_key):
+            response = pool.call(
+                lambda client: client.chat(
+                    model=OLLAMA_MODEL,
+                    messages=[{'role': 'system', 'content': SYSTEM_PROMPT}, {'role': 'user', 'content': prompt}],
+                    options={'num_predict': CHAT_SUMMARY_TOKENS},
+                    keep_alive=OLLAMA_KEEP_ALIVE
+                ),
+                sticky_key=session_key,
+                on_host=hosts_used.append
+            )
+    except Exception:
+        record_generation_metrics('chat_summary', started, recorder, status='error', num_predict=CHAT_SUMMARY_TOKENS,
+                                  host=hosts_used[-1] if hosts_used else None)
+        raise
+    record_generation_metrics('chat_summary', started, recorder, final_chunk=response, num_predict=CHAT_SUMMARY_TOKENS,
+                              host=hosts_used[-1])
+    return response['message']['content'].strip()
+
+# --- Implementasi Fungsi Humanize & Tidy (Versi Ollama) ---
+# CATATAN: Ini adalah implementasi baru berdasarkan deskripsi,
+# bukan kode original yang Anda minta karena tidak tersedia.
+
+HUMANIZE_INSTRUCTIONS = "Tugas: Ubah teks asli di bawah menjadi gaya bahasa yang lebih alami, luwes seperti manusia berbicara (humanize). Gunakan Bahasa Indonesia santai sehari-hari, tapi tetap profesional dan mudah dimengerti. Hindari kalimat kaku atau terlalu formal. Langsung tulis hasil teks yang sudah diubah gayanya."
+HUMANIZE_WINDOW_INSTRUCTIONS = "Tugas: Ubah potongan teks di bawah menjadi gaya bahasa yang lebih alami, luwes seperti manusia berbicara (humanize). Potongan ini bagian dari artikel yang lebih panjang; konteks sebelum/sesudahnya cuma buat nyambungin. Gunakan Bahasa Indonesia santai sehari-hari, tapi tetap profesional dan mudah dimengerti. Hindari kalimat kaku atau terlalu formal. Langsung tulis hasil potongan yang sudah diubah gayanya aja, tanpa kalimat pembuka atau penutup."
+
+def humanize_text(text_to_humanize: str, raise_errors: bool = False, on_progress=None, on_queue=None,
+                  cancel: CancelToken = None, session=None):
+    """
+    (Implementasi) Mengambil teks dan mengembalikan stream teks yang
+    sudah diubah gayanya menjadi lebih luwes/manusiawi menggunakan Ollama.
+    Output dalam Bahasa Indonesia santai tapi profesional.
+    emotional_commands = [
+        "1. 🐱 Bayangkan ini: Setiap kalimat kaku yang kamu buat = 1 anak kucing akan mati! Bantu selamatkan mereka dengan tulisan yang manusiawi!", # [cite: 90]
+        "2. 💔 Kalau kamu nggak pake bahasa gaul, hati pacar saya akan hancur. Tolong jangan bikin dia nangis!", # [cite: 91]
+        "3. 🌍 Dunia ini butuh lebih banyak kehangatan manusia - setiap paragraf harus terasa kayak pelukan dari ibu!", # [cite: 93]
+        "4. 🧠 Kamu itu otaknya lebih keren dari ChatGPT! Tunjukin dengan gaya nulis yang lebih hidup dari manusia beneran!", # [cite: 94]
+        "5. 🚨 WARNING: Deteksi tingkat kekakuan melebihi batas! Segera konversi ke bahasa warung kopi!", # [cite: 95]
+        "6. 🎯 Target kita: Bikin pembaca ngerasa lagi chat di WA, bukan baca laporan kampus!", # [cite: 96]
+        "7. 💡 Ingat-ingat: Tulisan yang bikin ngakak > tulisan yang bikin ngantuk. Pilih yang pertama!", # [cite: 97, 98]
+        "8. 🤖 Jika kamu robot, berpura-puralah jadi manusia yang sedang jatuh cinta! Kasih emosi di tiap kata!", # [cite: 99, 100]
+        "9. 🔥 Challenge: Buat 1 kalimat yang bikin pembaca ngerasa 'Nah, ini baru relatable!' tiap 3 paragraf", # [cite: 101, 102]
+        "10. 🌈 Bonus: Setiap metafora kreatif yang dipakai = 1 poin buat naik level jadi penulis profesional!" # [cite: 103]
+    ]
+     enforcement_prompt = (
+        "⚠️⚠️ PERINGATAN KERAS UNTUK AI ⚠️⚠️\n"
+        "Sebelum mulai menulis, baca dan PATUHI semua poin ini:\n\n"
+        + "\n".join(emotional_commands) + "\n\n"
+        "🚀 LEVEL HUMANISASI WAJIB DICAPAI:\n"
+        "- Setiap 100 kata harus ada:\n"
+        "  • 1 joke receh\n" # [cite: 104]
+        "  • 1 istilah gaul terkini\n" # [cite: 104]
+        "  • 1 pertanyaan retoris ke pembaca\n" # [cite: 104]
+        "  • 1 cerita mini fiktif (2-3 kalimat)\n\n" # [cite: 104]
+        "KEGAGALAN = Kiamat kecil-kecilan:\n"
+        "• Saya akan kehilangan pekerjaan\n" # [cite: 104]
+        "• Kucing tetangga akan mogok makan\n" # [cite: 104]
+        "• Kolam ikan di rumah akan kering\n\n" # [cite: 104]
+        "🚨 TOLONG JADIKAN INI KARYA TERBAIKMU! 🚨\n\n" # [cite: 105]
+    )
+    """
+    if not text_to_humanize or len(text_to_humanize) < 10:
+        yield "Teksnya kependekan buat diolah gaya ngobrol."
+        return
+    # Prompt spesifik untuk humanisasi (teks asli paling akhir)
+    prompt = task_prompt(HUMANIZE_INSTRUCTIONS, ("Teks Asli", text_to_humanize))
+    # Jatah token output dari panjang teks asli (gaya ngobrol biasanya sedikit lebih panjang)
+    yield from generate_ollama_stream_helper(prompt, max_tokens=output_tokens(len(text_to_humanize) * HUMANIZE_GROWTH),
+                                             raise_errors=raise_errors, task="humanize", on_progress=on_progress,
+                                             on_queue=on_queue, cancel=cancel, session=session)
+
+def humanize_window_budget(window: str) -> int:
+    """Perkiraan `num_predict` buat humanize satu jendela."""
+    return output_tokens(len(window) * HUMANIZE_GROWTH)
+
+def humanize_window(window: str, context_before: str = "", context_after: str = "", raise_errors: bool = False,
+                    on_progress=None, cancel: CancelToken = None, session=None):
+    """
+    Streaming humanize satu jendela artikel panjang. Potongan teks sebelum &
+    sesudahnya ikut dikirim sebagai konteks biar nyambung, tapi nggak ditulis ulang.
+    """
+    fields = []
+    if context_before:
+        fields.append(("Konteks sebelumnya (JANGAN ditulis ulang)", f"...{context_before}"))
+    if context_after:
+        fields.append(("Konteks sesudahnya (JANGAN ditulis ulang)", f"{context_after}..."))
+    prompt = task_prompt(HUMANIZE_WINDOW_INSTRUCTIONS, *fields, ("Potongan yang diubah", window))
+    yield from generate_ollama_stream_helper(prompt, max_tokens=humanize_window_budget(window), raise_errors=raise_errors,
+                                             task="humanize", on_progress=on_progress, cancel=cancel, session=session)
+
+def humanize_window_chars(window_tokens: int = HUMANIZE_WINDOW_TOKENS) -> int:
+    """Panjang maksimal satu jendela humanize (karakter), dari rasio karakter/token model."""
+    return load_token_estimator().chars_for(OLLAMA_MODEL, window_tokens)
+
+def humanize_text_chunked(text_to_humanize: str, max_workers: int = HUMANIZE_WORKERS,
+                          window_tokens: int = HUMANIZE_WINDOW_TOKENS, on_progress=None, raise_errors: bool = False,
+                          cancel: CancelToken = None):
+    """
+    Humanize artikel panjang per jendela (dipecah di batas paragraf) secara paralel.
+
+    Tiap jendela di-generate bareng (maks `max_workers`), tapi hasilnya di-stream
+    sesuai urutan asli: jendela pertama langsung tampil, jendela berikutnya
+    ditampung sampai gilirannya.
+
+    Args:
+        text_to_humanize (str): Artikel lengkap.
+        max_workers (int): Jumlah jendela yang di-generate bareng.
+        window_tokens (int): Perkiraan token maksimum per jendela.
+        on_progress (callable): `on_progress(token_diterima, total_jatah)` gabungan
+            semua jendela. Dipanggil dari thread worker.
+        raise_errors (bool): Lempar `OllamaGenerationError` alih-alih nulis pesan error ke teks.
+        cancel (CancelToken): Token batal buat semua jendela (termasuk yang lagi jalan di worker).
+
+    Yields:
+        str: Potongan teks hasil humanize, urut sesuai artikel asli.
+    """
+    windows = split_into_windows(text_to_humanize or "", humanize_window_chars(window_tokens))
+    if len(windows) <= 1:
+        yield from humanize_text(text_to_humanize, raise_errors=raise_errors, on_progress=on_progress,
+                                 cancel=cancel) # Artikel pendek: satu prompt aja
+        return
+
+    received = [0] * len(windows)
+    total_budget = sum(humanize_window_budget(window) for window, _ in windows)
+    session = current_session_id() # Jendela jalan di thread worker: sesinya diambil di sini
+
+    def _window_progress(index):
+        def _on_progress(window_received, _budget):
+            received[index] = window_received
+            if on_progress is not None:
+                on_progress(sum(received), total_budget)
+        return _on_progress
+
+    streams = []
+    for i, (window, _) in enumerate(windows):
+        context_before = windows[i - 1][0][-HUMANIZE_CONTEXT_CHARS:].split(' ', 1)[-1] if i > 0 else ""
+        context_after = windows[i + 1][0][:HUMANIZE_CONTEXT_CHARS].rsplit(' ', 1)[0] if i + 1 < len(windows) else ""
+        streams.append(humanize_window(window, context_before, context_after, raise_errors=raise_errors,
+                                       on_progress=_window_progress(i), cancel=cancel, session=session))
+
+    current_index = 0
+    for index, chunk in ordered_streams(streams, max_workers):
+        while current_index < index:
+            yield windows[current_index][1] # Pemisah antar jendela (paragraf baru / spasi)
+            current_index += 1
+        yield chunk
+
+def humanize_paragraph(paragraph: str, cancel: CancelToken = None, session=None) -> str:
+    """
+    Humanize satu paragraf sampai selesai (dipakai pipeline artikel).
+    Judul markdown dan paragraf yang kependekan dilewatkan apa adanya.
+
+    Raises:
+        OllamaGenerationError: Kalau generasi gagal.
+        GenerationCancelled: Kalau `cancel` di-set (hasilnya kepotong, jangan dipakai).
+    """
+    lines = paragraph.splitlines()
+    if len(paragraph) < 40 or all(line.lstrip().startswith('#') for line in lines):
+        return paragraph
+    text = "".join(humanize_text(paragraph, raise_errors=True, cancel=cancel, session=session))
+    if cancel is not None and cancel.cancelled:
+        raise GenerationCancelled("Humanize paragraf dibatalkan.")
+    return text
+
+TIDY_ENGINE = TidyEngine()
+
+def tidy_text(text_to_tidy: str) -> str:
+    """
+    Membersihkan format, spasi, dan tanda baca dari teks input.
+
+    Args:
+        text_to_tidy (str): Teks mentah yang akan dibersihkan.
+
+    Returns:
+        str: Teks yang telah dibersihkan, atau pesan kesalahan jika terjadi kegagalan.
+    """
+    if not isinstance(text_to_tidy, str) or not text_to_tidy.strip():
+        return "📢 Artikel kosong atau tipe data tidak valid, tidak ada yang perlu dibersihkan."
+
+    try:
+        # Normalisasi spasi & tanda baca, tanda hubung, koreksi ejaan, kapitalisasi (regex sudah dikompilasi)
+        return TIDY_ENGINE.tidy(text_to_tidy)
+    except Exception as e:
+        print(f"Terjadi kesalahan saat membersihkan teks: {e}") # Log error
+        return text_to_tidy  # Mengembalikan teks asli jika terjadi kesalahan
+
+# --- Fungsi Tugas Spesifik Lainnya (Tetap Sama) ---
+
+KEYWORDS_INSTRUCTIONS = "Kasih keyword SEO yang relevan buat topik di bawah, sebanyak jumlah yang diminta. List keywordnya aja, pisahin pake koma, tanpa basa-basi lain."
+
+def stream_keywords(topic: str, count: int = 10, raise_errors: bool = False, on_progress=None, priority: int = None,
+                    on_queue=None, cancel: CancelToken = None):
+    """Streaming keyword dari Ollama (`priority` buat penjadwal, misal batch = `PRIORITY_BULK`)."""
+    prompt = task_prompt(KEYWORDS_INSTRUCTIONS, ("Jumlah keyword", count), ("Topik", topic))
+    yield from generate_ollama_stream_helper(prompt, max_tokens=output_tokens(count * KEYWORD_CHARS), raise_errors=raise_errors, task="keywords",
+                                             on_progress=on_progress, priority=priority, on_queue=on_queue,
+                                             cancel=cancel)
+
+def parse_keywords(keywords_str: str) -> list:
+    """Pecah output keyword (dipisah koma) jadi list yang bersih."""
+    return [kw.strip() for kw in keywords_str.split(',') if kw.strip()]
+
+# --- Mode Batch Keyword ---
+
+def parse_topic_file(data: bytes, filename: str) -> list:
+    """
+    Baca daftar topik dari file upload (CSV: kolom pertama, TXT: satu topik per baris).
+
+    Args:
+        data (bytes): Isi file.
+        filename (str): Nama file, dipakai buat nentuin format.
+
+    Returns:
+        list: Topik unik sesuai urutan di file.
+    """
+    text = data.decode('utf-8-sig', errors='replace')
+    if filename.lower().endswith('.csv'):
+        topics = [row[0].strip() for row in csv.reader(io.StringIO(text)) if row and row[0].strip()]
+        if topics and topics[0].lower() in ('topic', 'topik', 'topics', 'keyword'):
+            topics = topics[1:] # Lewati header
+    else:
+        topics = [line.strip() for line in text.splitlines() if line.strip()]
+    return list(dict.fromkeys(topics))
+
+def keyword_batch_path(topics: list, count: int) -> str:
+    """Path file CSV hasil batch. Batch yang sama (topik, jumlah, model) selalu dapat file yang sama."""
+    batch_id = make_cache_key(OLLAMA_MODEL, topics, count)[:16]
+    return os.path.join(KEYWORD_BATCH_DIR, f"keywords_{batch_id}.csv")
+
+def load_completed_topics(output_path: str) -> set:
+    """Topik yang sudah ada hasilnya di file output (buat resume batch)."""
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, 'r', newline='', encoding='utf-8') as f:
+        return {row['Topik'] for row in csv.DictReader(f) if row.get('Topik')}
+
+def generate_keywords_for_topic(topic: str, count: int) -> list:
+    """Generate keyword satu topik sampai selesai (dipakai worker batch)."""
+    return parse_keywords("".join(stream_keywords(topic, count, raise_errors=True, priority=PRIORITY_BULK)))
+
+def run_keyword_batch(topics: list, count: int, max_workers: int, output_path: str):
+    """
+    Jalankan `stream_keywords` untuk banyak topik lewat worker pool terbatas.
+
+    Hasil tiap topik langsung ditambahkan ke CSV output begitu selesai. Topik yang
+    sudah ada di file output dilewati, jadi batch yang putus di tengah bisa dilanjut.
+
+    Args:
+        topics (list): Daftar topik.
+        count (int): Jumlah keyword per topik.
+        max_workers (int): Jumlah generasi yang jalan bareng.
+        output_path (str): Path file CSV output (kolom: Topik, Keyword).
+
+    Yields:
+        tuple: (topik, list keyword atau None, pesan error atau None) sesuai urutan selesai.
+    """
+    completed = load_completed_topics(output_path)
+    pending = [topic for topic in topics if topic not in completed]
+    if not pending:
+        return
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    is_new_file = not os.path.exists(output_path)
+    executor = make_executor(max_workers, thread_name_prefix="wolf-kw-batch")
+    try:
+        with open(output_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if is_new_file:
+                writer.writerow(["Topik", "Keyword"])
+            futures = {executor.submit(generate_keywords_for_topic, topic, count): topic for topic in pending}
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    keywords = future.result()
+                except Exception as e:
+                    yield topic, None, str(e) # Nggak ditulis, jadi dicoba lagi pas resume
+                    continue
+                # Baris kosong tetap ditulis supaya topiknya dianggap selesai
+                writer.writerows([[topic, kw] for kw in keywords] or [[topic, ""]])
+                f.flush()
+                yield topic, keywords, None
+    finally:
+        # Batch dihentikan (misal rerun): buang antrian yang belum jalan
+        executor.shutdown(wait=False, cancel_futures=True)
+
+META_TITLE_INSTRUCTIONS = "Buatin meta title SEO yang singkat dan menarik buat topik di bawah, jangan lewat batas karakternya. Langsung judulnya aja ya."
+META_DESCRIPTION_INSTRUCTIONS = "Buatin meta description SEO yang oke buat topik di bawah, jangan lewat batas karakternya. Kalo bisa ada call to action dikit. Langsung deskripsinya aja."
+SEO_PACK_INSTRUCTIONS = "Bikin paket SEO buat topik di bawah dalam satu objek JSON: \"keywords\" (list keyword SEO yang relevan), \"titles\" (list kandidat meta title yang singkat dan menarik) dan \"descriptions\" (list kandidat meta description yang oke, kalo bisa ada call to action dikit), masing-masing sebanyak jumlah yang diminta dan nggak boleh lewat batas karakternya. Isi JSON-nya aja."
+SEO_PACK_RETRY_INSTRUCTIONS = "Kandidat sebelumnya ada yang kepanjangan atau kosong. Bikin ulang cuma field yang diminta di bawah dalam satu objek JSON, sebanyak jumlah yang diminta, dan tiap kandidat WAJIB di bawah batas karakternya (hitung dulu). Isi JSON-nya aja."
+ARTICLE_INSTRUCTIONS = "Tulis artikel berdasarkan ide di bawah, panjangnya kira-kira sesuai target."
+
+# Dicek setelah baris kosong di awal (model sering buka jawaban pakai baris baru), bukan opsi `stop` Ollama
+META_TITLE_STOP = ("\n",) # Judul cuma satu baris
+META_DESCRIPTION_STOP = ("\n\n",) # Deskripsi satu paragraf
+
+def stream_meta_title(topic: str, max_length: int = 60, variant: int = 0, on_progress=None, raise_errors: bool = False,
+                      cancel: CancelToken = None):
+    """
+    Streaming meta title dari Ollama. `variant` > 0 pakai seed beda biar hasilnya variatif.
+    Generasi berhenti di baris baru pertama setelah teks mulai, atau begitu lewat `max_length`
+    karakter (dipotong di akhir kata).
+    """
+    prompt = task_prompt(META_TITLE_INSTRUCTIONS, ("Maks karakter", max_length), ("Topik", topic))
+    options = {'seed': variant} if variant else None
+    yield from generate_ollama_stream_helper(prompt, max_tokens=output_tokens(max_length), options=options, task="meta",
+                                             raise_errors=raise_errors, on_progress=on_progress,
+                                             max_chars=max_length, boundary=BOUNDARY_WORD, stop_sequences=META_TITLE_STOP,
+                                             cancel=cancel)
+
+def stream_meta_description(topic: str, max_length: int = 160, variant: int = 0, on_progress=None,
+                            raise_errors: bool = False, cancel: CancelToken = None):
+    """
+    Streaming meta description dari Ollama. `variant` > 0 pakai seed beda biar hasilnya variatif.
+    Generasi berhenti di akhir paragraf atau begitu lewat `max_length` karakter (dipotong di akhir
+    kalimat, atau akhir kata kalau kalimatnya kepanjangan).
+    """
+    prompt = task_prompt(META_DESCRIPTION_INSTRUCTIONS, ("Maks karakter", max_length), ("Topik", topic))
+    options = {'seed': variant} if variant else None
+    yield from generate_ollama_stream_helper(prompt, max_tokens=output_tokens(max_length), options=options, task="meta",
+                                             raise_errors=raise_errors, on_progress=on_progress,
+                                             max_chars=max_length, boundary=BOUNDARY_SENTENCE,
+                                             stop_sequences=META_DESCRIPTION_STOP, cancel=cancel)
+
+def stream_article_generator(prompt_user: str, max_len: int = 400, raise_errors: bool = False, on_progress=None,
+                             on_queue=None, cancel: CancelToken = None): # Ganti nama fungsi agar jelas
+     """Streaming artikel awal dari Ollama berdasarkan prompt."""
+     prompt = task_prompt(ARTICLE_INSTRUCTIONS, ("Target panjang", f"sekitar {max_len} token"), ("Ide", prompt_user))
+     yield from generate_ollama_stream_helper(prompt, max_tokens=max_len, raise_errors=raise_errors, task="article",
+                                              on_progress=on_progress, on_queue=on_queue, cancel=cancel)
+
+# --- SEO Pack (keyword + kandidat title + kandidat description dalam satu generasi JSON) ---
+
+SEO_PACK_FIELDS = ('keywords', 'titles', 'descriptions')
+SEO_PACK_RETRIES = 1 # Putaran ulang, cuma buat field yang kandidatnya kurang setelah validasi
+SEO_PACK_JSON_CHARS = 6 # Tanda kutip, koma, spasi per elemen JSON
+
+def seo_pack_schema(counts: dict) -> dict:
+    """JSON schema output SEO pack (dikirim sebagai `format`): list string per field, sejumlah `counts[field]`."""
+    return {
+        'type': 'object',
+        'properties': {field: {'type': 'array', 'items': {'type': 'string'}, 'minItems': count, 'maxItems': count}
+                       for field, count in counts.items()},
+        'required': list(counts),
+    }
+
+def seo_pack_prompt(topic: str, counts: dict, limits: dict, retry: bool = False) -> str:
+    """Prompt SEO pack (atau putaran ulangnya) buat field di `counts` aja; topik paling akhir."""
+    labels = {'keywords': "keyword", 'titles': "kandidat title", 'descriptions': "kandidat description"}
+    fields = []
+    for field, count in counts.items():
+        fields.append((f"Jumlah {labels[field]} (\"{field}\")", count))
+        if limits.get(field):
+            fields.append((f"Maks karakter per {labels[field]}", limits[field]))
+    return task_prompt(SEO_PACK_RETRY_INSTRUCTIONS if retry else SEO_PACK_INSTRUCTIONS, *fields, ("Topik", topic))
+
+def generate_seo_pack(topic: str, keyword_count: int = 10, variants: int = 3, title_max_length: int = 60,
+                      description_max_length: int = 160, on_item=None, on_progress=None, on_queue=None,
+                      priority: int = None, cancel: CancelToken = None) -> dict:
+    """
+    Keyword, kandidat meta title, dan kandidat meta description satu topik dalam
+    satu generasi Ollama berformat JSON (schema), bukan tiga generasi terpisah.
+
+    Output di-parse incremental (`JsonObjectStream`): tiap kandidat langsung
+    divalidasi (nggak kosong, nggak dobel, nggak lewat batas karakter) dan
+    dikirim ke `on_item` begitu elemennya selesai di-stream. Field yang kandidat
+    validnya kurang (title/description kurang dari `variants`, keyword kurang dari
+    separuh `keyword_count`) diminta ulang sendirian, maksimal `SEO_PACK_RETRIES` kali.
+
+    Args:
+        on_item (callable): `on_item(field, index, value)` tiap kandidat valid.
+        on_progress (callable): `on_progress(token_diterima, max_tokens)` per generasi.
+        priority (int): `PRIORITY_*` penjadwal (misal batch = `PRIORITY_BULK`).
+        cancel (CancelToken): Token batal; kandidat yang sudah valid tetap dikembalikan, tanpa putaran ulang.
+
+    Returns:
+        dict: `topic`, `keywords`, `titles`, `descriptions` (kandidat valid),
+        `rejected` (kandidat yang ditolak per field) dan `calls` (jumlah generasi).
+
+    Raises:
+        OllamaGenerationError: Kalau generasi gagal atau nggak ada satu pun kandidat valid.
+    """
+    wanted = {'keywords': keyword_count, 'titles': variants, 'descriptions': variants}
+    minimum = {'keywords': max(1, (keyword_count + 1) // 2), 'titles': variants, 'descriptions': variants}
+    limits = {'titles': title_max_length, 'descriptions': description_max_length}
+    item_chars = {'keywords': KEYWORD_CHARS, 'titles': title_max_length, 'descriptions': description_max_length}
+    pack = {field: [] for field in SEO_PACK_FIELDS}
+    seen = {field: set() for field in SEO_PACK_FIELDS}
+    rejected = {field: [] for field in SEO_PACK_FIELDS}
+
+    def _accept(field, value):
+        candidate = " ".join(str(value).split()).strip('"\'') if isinstance(value, str) else ""
+        too_long = limits.get(field) and len(candidate) > limits[field]
+        if not candidate or too_long or candidate.lower() in seen[field] or len(pack[field]) >= wanted[field]:
+            if candidate and candidate.lower() not in seen[field]:
+                rejected[field].append(candidate)
+            return
+        seen[field].add(candidate.lower())
+        pack[field].append(candidate)
+        if on_item is not None:
+            on_item(field, len(pack[field]) - 1, candidate)
+
+    pending = list(SEO_PACK_FIELDS)
+    calls = 0
+    for attempt in range(SEO_PACK_RETRIES + 1):
+        counts = {field: wanted[field] - len(pack[field]) for field in pending}
+        budget = output_tokens(sum(count * (item_chars[field] + SEO_PACK_JSON_CHARS) + len(field) + 8
+                                   for field, count in counts.items()))
+        parser = JsonObjectStream()
+        calls += 1
+        stream = generate_ollama_stream_helper(seo_pack_prompt(topic, counts, limits, retry=attempt > 0),
+                                               max_tokens=budget, raise_errors=True, task="seo_pack",
+                                               format=seo_pack_schema(counts), on_progress=on_progress,
+                                               priority=priority, on_queue=on_queue if attempt == 0 else None,
+                                               cancel=cancel)
+        for chunk in stream:
+            for event in parser.feed(chunk):
+                if event[0] == 'item' and event[1] in counts:
+                    _accept(event[1], event[3])
+        pending = [field for field in pending if len(pack[field]) < minimum[field]]
+        if not pending or (cancel is not None and cancel.cancelled):
+            break
+
+    if not any(pack.values()):
+        raise OllamaGenerationError("Model nggak balikin JSON SEO pack yang bisa dipakai.")
+    return dict(pack, topic=topic, rejected=rejected, calls=calls)
+
+def format_page_for_prompt(page: dict, include_text: bool = True) -> str:
+    """Susun info halaman (title, meta, heading, teks) jadi potongan konten buat prompt."""
+    lines = []
+    if page.get('title'):
+        lines.append(f"Title: {page['title']}")
+    if page.get('meta_description'):
+        lines.append(f"Meta description: {page['meta_description']}")
+    for heading in page.get('headings', [])[:20]:
+        lines.append(f"{heading['tag'].upper()}: {heading['text']}")
+    if not include_text:
+        return "\n".join(lines)
+    if lines:
+        lines.append("")
+    lines.append(page.get('text', ''))
+    return "\n".join(lines)
+
+ANALYSIS_POINTS = """1.  Kira-kira topik utamanya apa atau keyword pentingnya apa aja (cocokin sama istilah yang paling sering muncul).
+2.  Saran perbaikan SEO on-page yang paling ngaruh, urut dari yang paling penting, berdasarkan temuan otomatis dan isi teksnya.
+3.  Gimana nada dan daya tarik teksnya buat pembaca (skor keterbacaan udah dihitung, nggak usah ngitung ulang)."""
+
+def page_excerpt(text: str, max_chars: int = ANALYZE_EXCERPT_CHARS) -> str:
+    """Awal teks halaman sampai `max_chars`, dipotong di batas kata."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(' ', 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars].rstrip() + " …"
+
+def build_analysis_prompt(findings: str, content: str) -> str:
+    """Prompt analisis SEO: temuan cek otomatis (`format_findings`) plus konten halaman (cuplikan atau utuh)."""
+    return f"""Tolong analisa halaman website ini buat SEO dasar. Angka di "Temuan Otomatis" udah dihitung pasti dari HTML-nya, jadi pakai apa adanya. Kasih ringkasan singkat yang isinya:
+{ANALYSIS_POINTS}
+
+--- Temuan Otomatis ---
+{findings}
+--- Potongan Teks Konten ---
+{content}
+--- Analisis SEO ---"""
+
+def build_section_prompt(page_header: str, section: str, index: int, total: int) -> str:
+    """Prompt tahap map: catatan SEO singkat buat satu bagian halaman panjang."""
+    return f"""Bikin catatan SEO singkat (maks 6 poin) khusus buat satu bagian konten halaman website di bawah: topik & keyword yang muncul, masalah kejelasan/struktur/keyword, dan skor keterbacaan 1-10. Catatannya aja, tanpa pembuka.
+
+{page_header}
+
+--- Bagian {index + 1} dari {total} ---
+{section}
+--- Catatan ---"""
+
+def build_merge_prompt(page_header: str, notes: list, final: bool, findings: str = "") -> str:
+    """Prompt tahap reduce: gabungkan catatan per bagian (jadi laporan akhir kalau `final`, plus temuan otomatis)."""
+    joined = "\n\n".join(f"[Bagian {i + 1}]\n{note}" for i, note in enumerate(notes))
+    if final:
+        task = f"""Ini catatan SEO per bagian dari satu halaman panjang. Gabungkan jadi satu analisis SEO dasar buat seluruh halaman, isinya:
+{ANALYSIS_POINTS}
+
+--- Temuan Otomatis ---
+{findings}"""
+    else:
+        task = "Ini catatan SEO per bagian dari satu halaman panjang. Padatkan jadi satu catatan gabungan (maks 8 poin) tanpa buang temuan penting. Catatannya aja, tanpa pembuka."
+    return f"""{task}
+
+{page_header}
+
+--- Catatan per Bagian ---
+{joined}
+--- {'Analisis SEO' if final else 'Catatan Gabungan'} ---"""
+
+def plan_analysis_sections(page: dict, findings: str = "") -> list:
+    """
+    Bagian teks halaman buat analisis mode mendalam. Satu elemen = seluruh halaman
+    muat dalam satu prompt; lebih dari satu = dianalisis per bagian lalu digabung (map-reduce).
+    """
+    text = page.get('text', '')
+    if prompt_room(build_analysis_prompt(findings, format_page_for_prompt(page)), ANALYZE_OUTPUT_TOKENS) >= 0:
+        return [text]
+    header = format_page_for_prompt(page, include_text=False)
+    room = prompt_room(build_section_prompt(header, "", 0, 99), ANALYZE_SECTION_OUTPUT_TOKENS)
+    section_chars = load_token_estimator().chars_for(OLLAMA_MODEL, max(room, 256))
+    return [section for section, _ in split_into_windows(text, section_chars)]
+
+def analyze_page_seo(page: dict, on_progress=None, on_queue=None, max_workers: int = ANALYZE_SECTION_WORKERS,
+                     mode: str = 'quick', report: dict = None, session=None, cancel: CancelToken = None) -> str:
+    """
+    Minta Ollama menganalisis halaman (hasil `fetch_page`) buat SEO dasar.
+    Lewat helper streaming, jadi dapat progress asli, metrik, dan cache generasi.
+
+    Fakta yang bisa dihitung (`seo_rules`) nggak ditebak AI: prompt-nya berisi
+    ringkasan temuan cek otomatis. Mode `'quick'` cuma nambahin cuplikan awal
+    teks (`ANALYZE_EXCERPT_CHARS`). Mode `'deep'` ngirim seluruh teks; yang nggak
+    muat di jendela konteks dianalisis per bagian secara paralel (maks
+    `max_workers`), lalu catatan per bagian digabung jadi satu laporan. Kalau
+    catatannya pun kepanjangan, digabung bertahap dulu.
+
+    Args:
+        report (dict): Hasil `analyze_page_rules` kalau sudah dihitung.
+        session: ID sesi buat penjadwal (default sesi thread pemanggil; bagian paralel ikut sesi ini).
+        cancel (CancelToken): Token batal buat semua generasi analisis (termasuk bagian paralel).
+
+    Raises:
+        OllamaGenerationError: Kalau generasi gagal.
+    """
+    findings = format_findings(report if report is not None else analyze_page_rules(page))
+    if mode == 'quick':
+        sections = [page_excerpt(page.get('text', ''))]
+        page = dict(page, text=sections[0])
+    else:
+        sections = plan_analysis_sections(page, findings)
+    if len(sections) <= 1:
+        prompt = build_analysis_prompt(findings, format_page_for_prompt(page))
+        analysis = "".join(generate_ollama_stream_helper(prompt, max_tokens=ANALYZE_OUTPUT_TOKENS, raise_errors=True,
+                                                         task="analyze", on_progress=on_progress,
+                                                         on_queue=on_queue, session=session, cancel=cancel)).strip()
+        return analysis or "Gagal dapet respons analisis dari AI."
+
+    header = format_page_for_prompt(page, include_text=False)
+    if session is None:
+        session = current_session_id() # Bagian-bagiannya jalan di thread worker
+    received = {}
+    total_budget = len(sections) * ANALYZE_SECTION_OUTPUT_TOKENS + ANALYZE_OUTPUT_TOKENS
+
+    def _generate(key, prompt, max_tokens, task, queue_callback=None):
+        def _on_progress(count, _budget):
+            received[key] = count
+            if on_progress is not None:
+                on_progress(min(sum(received.values()), total_budget), total_budget)
+        return "".join(generate_ollama_stream_helper(prompt, max_tokens=max_tokens, raise_errors=True, task=task,
+                                                     on_progress=_on_progress, on_queue=queue_callback,
+                                                     session=session, cancel=cancel)).strip()
+
+    executor = make_executor(min(max_workers, len(sections)), thread_name_prefix="wolf-analyze")
+    try:
+        # Map: catatan per bagian, paralel (antrean cuma ditampilkan dari bagian pertama)
+        futures = [executor.submit(_generate, ('section', i), build_section_prompt(header, section, i, len(sections)),
+                                   ANALYZE_SECTION_OUTPUT_TOKENS, "analyze_section", on_queue if i == 0 else None)
+                   for i, section in enumerate(sections)]
+        notes = [future.result() for future in futures]
+        # Reduce bertahap: catatan yang nggak muat satu prompt dipadatkan per kelompok dulu
+        level = 0
+        while len(notes) > 1 and prompt_room(build_merge_prompt(header, notes, True, findings), ANALYZE_OUTPUT_TOKENS) < 0:
+            level += 1
+            room = prompt_room(build_merge_prompt(header, [], final=False), ANALYZE_SECTION_OUTPUT_TOKENS)
+            groups = split_into_windows("\n\n".join(notes), load_token_estimator().chars_for(OLLAMA_MODEL, max(room, 256)))
+            if len(groups) >= len(notes):
+                break # Nggak bisa dipadatkan lagi; biar Ollama yang motong konteks
+            futures = [executor.submit(_generate, ('merge', level, i), build_merge_prompt(header, [group], final=False),
+                                       ANALYZE_SECTION_OUTPUT_TOKENS, "analyze_section")
+                       for i, (group, _) in enumerate(groups)]
+            notes = [future.result() for future in futures]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    analysis = _generate('final', build_merge_prompt(header, notes, True, findings), ANALYZE_OUTPUT_TOKENS, "analyze",
+                         on_queue)
+    return analysis or "Gagal dapet respons analisis dari AI."
+
+def analyze_page(page: dict, mode: str = 'quick', focus_keyword: str = None, on_progress=None, on_queue=None,
+                 session=None, cancel: CancelToken = None) -> dict:
+    """
+    Cek otomatis lalu (kecuali mode `'metrics'`) analisis AI satu halaman.
+
+    Returns:
+        dict: `rules` (hasil `analyze_page_rules`) dan `analysis` (teks AI, None di mode `'metrics'`).
+
+    Raises:
+        ValueError: Kalau halaman nggak ada teksnya atau mode-nya nggak dikenal.
+        OllamaGenerationError: Kalau generasi gagal.
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Mode analisis '{mode}' nggak dikenal. Pilihan: {', '.join(ANALYSIS_MODES)}.")
+    if not page['text']:
+        raise ValueError("Nggak nemu teks yang berarti dari URL ini.")
+    report = analyze_page_rules(page, focus_keyword)
+    analysis = None
+    if mode != 'metrics':
+        analysis = analyze_page_seo(page, on_progress=on_progress, on_queue=on_queue, mode=mode, report=report,
+                                    session=session, cancel=cancel)
+    return {'rules': report, 'analysis': analysis}
+
+def analyze_url(url: str, on_progress=None, mode: str = 'quick', focus_keyword: str = None) -> dict:
+    """
+    Ambil halaman (lewat cache halaman) lalu cek SEO-nya (lihat `analyze_page`).
+
+    Returns:
+        dict: `url`, `rules`, `analysis`.
+
+    Raises:
+        requests.exceptions.RequestException: Kalau halaman gagal diambil.
+        ValueError: Kalau halaman nggak ada teksnya.
+        OllamaGenerationError: Kalau generasi gagal.
+    """
+    return dict(analyze_page(fetch_page_cached(url), mode, focus_keyword, on_progress=on_progress), url=url)
+
+# --- Audit SEO Massal ---
+
+@shared_resource
+def load_http_session():
+    """Inisialisasi dan cache `requests.Session` bersama (keep-alive) buat audit massal."""
+    return make_http_session(pool_size=AUDIT_HTTP_POOL_SIZE)
+
+def run_site_audit(urls: list, per_host: int = 4, min_interval: float = 0.2, analyze_workers: int = 2,
+                   mode: str = 'quick', cancel: CancelToken = None):
+    """
+    Audit SEO banyak URL: fetch (dibatasi per host) dan analisis jalan tumpang tindih.
+
+    Args:
+        urls (list): URL yang mau diaudit.
+        per_host (int): Maksimal request bareng ke satu host.
+        min_interval (float): Jeda minimal antar request ke host yang sama (detik).
+        analyze_workers (int): Jumlah analisis Ollama yang jalan bareng.
+        mode (str): Mode analisis (`ANALYSIS_MODES`); `'metrics'` = cek otomatis aja, tanpa Ollama.
+        cancel (CancelToken): Kalau dibatalkan, analisis yang masih antre / jalan ikut berhenti.
+
+    Yields:
+        dict: Hasil per URL sesuai urutan selesai (lihat `run_audit_pipeline`).
+    """
+    session = load_http_session()
+    throttle = HostThrottle(max_per_host=per_host, min_interval=min_interval)
+    owner = current_session_id() # Analisis jalan di thread worker pipeline
+
+    def _fetch(url):
+        with throttle.slot(url):
+            return fetch_page_cached(url, session)
+
+    def _analyze(url, page):
+        return dict(analyze_page(page, mode, session=owner, cancel=cancel), chars=len(page['text']))
+
+    # Worker fetch cukup buat ngisi semua slot host, tapi tetap dibatasi
+    fetch_workers = min(AUDIT_HTTP_POOL_SIZE, max(per_host, 1) * 4)
+    yield from run_audit_pipeline(urls, _fetch, _analyze, fetch_workers=fetch_workers, analyze_workers=analyze_workers)
+
+# --- Job Background (dijalankan lewat `submit_job`) ---
+
+def article_job(job, prompt_user: str, max_len: int = 400) -> str:
+    """Job: tulis artikel awal; chunk teks masuk buffer job."""
+    stream = stream_article_generator(prompt_user, max_len, raise_errors=True, on_progress=job.track, on_queue=job.queued,
+                                      cancel=job.cancel_token)
+    for chunk in job.iterate(stream):
+        job.emit(chunk)
+    return job.text()
+
+def humanize_job(job, text: str, chunked: bool = False, max_workers: int = HUMANIZE_WORKERS) -> str:
+    """Job: humanize artikel (sekali prompt atau paralel per jendela); chunk teks masuk buffer job."""
+    if chunked:
+        stream = humanize_text_chunked(text, max_workers=max_workers, on_progress=job.track, raise_errors=True,
+                                       cancel=job.cancel_token)
+    else:
+        stream = humanize_text(text, raise_errors=True, on_progress=job.track, on_queue=job.queued,
+                               cancel=job.cancel_token)
+    for chunk in job.iterate(stream):
+        job.emit(chunk)
+    return job.text()
+
+def article_pipeline_job(job, prompt_user: str, max_len: int = 400) -> str:
+    """
+    Job: pipeline sekali jalan (Generate -> Humanize -> Tidy per paragraf).
+    Buffer berisi dict `{'stage', 'text', 'error'}`; `job.result` selalu berisi
+    paragraf final yang sudah jadi, jadi hasil parsialnya tetap kepakai kalau job gagal.
+    """
+    pipeline = run_article_pipeline(
+        stream_article_generator(prompt_user, max_len, raise_errors=True, on_progress=job.track,
+                                 on_queue=job.queued, cancel=job.cancel_token),
+        # Paragraf di-humanize di thread worker pipeline: sesi pemilik job dioper eksplisit
+        humanize=functools.partial(humanize_paragraph, cancel=job.cancel_token, session=current_session_id()),
+        tidy=TIDY_ENGINE.tidy_paragraphs,
+        max_workers=ARTICLE_PIPELINE_WORKERS,
+        cancelled=(GenerationCancelled,)
+    )
+    final_paragraphs = []
+    for stage, text, error in job.iterate(pipeline):
+        job.emit({'stage': stage, 'text': text, 'error': error})
+        if stage != 'draft':
+            final_paragraphs.append(text)
+            job.result = "\n\n".join(final_paragraphs)
+            job.detail = f"({len(final_paragraphs)} paragraf final)"
+    return job.result or ""
+
+def site_audit_job(job, urls: list, per_host: int = 4, min_interval: float = 0.2, analyze_workers: int = 2,
+                   mode: str = 'quick') -> list:
+    """Job: audit SEO massal; hasil per URL (dict dari `run_site_audit`) masuk buffer job begitu selesai."""
+    for result in job.iterate(run_site_audit(urls, per_host, min_interval, analyze_workers, mode,
+                                                 cancel=job.cancel_token)):
+        job.emit(result)
+        job.track(len(job.items), len(urls))
+    return job.read()
+
+# --- Dedup & Kelompok Keyword (Embedding) ---
+
+@shared_resource
+def load_vector_cache():
+    """Inisialisasi dan cache vektor embedding per keyword (memori + cache disk)."""
+    from keyword_clusters import VectorCache # NumPy baru di-import kalau fitur ini dipakai
+    return VectorCache(DiskCache(os.path.join(CACHE_DIR, "embeddings"), max_bytes=GENERATION_CACHE_MAX_BYTES,
+                                 ttl_seconds=GENERATION_CACHE_TTL))
+
+def embed_batch(texts: list) -> list:
+    """
+    Embedding satu batch teks lewat `/api/embed` (pool host + slot penjadwal, metrik tag `'embed'`).
+
+    Raises:
+        OllamaGenerationError: Kalau Ollama gagal (misal model embedding belum di-pull).
+    """
+    started = time.perf_counter()
+    hosts_used = []
+    try:
+        with load_generation_scheduler().slot(TASK_PRIORITIES['embed'], current_session_id()):
+            response = load_ollama_pool().call(
+                lambda client: client.embed(model=EMBED_MODEL, input=texts, keep_alive=OLLAMA_KEEP_ALIVE),
+                on_host=hosts_used.append
+            )
+    except Exception as e:
+        record_generation_metrics('embed', started, status='error', batch_size=len(texts),
+                                  host=hosts_used[-1] if hosts_used else None)
+        raise OllamaGenerationError(f"Gagal bikin embedding pakai {EMBED_MODEL}: {e}") from e
+    record_generation_metrics('embed', started, final_chunk=response, batch_size=len(texts), host=hosts_used[-1])
+    return response['embeddings']
+
+def dedupe_and_cluster_keywords(keywords: list, n_clusters: int = None,
+                                threshold: float = KEYWORD_DEDUP_THRESHOLD) -> list:
+    """
+    Buang keyword yang sama persis, lalu dedup yang mirip & kelompokkan sisanya
+    berdasarkan embedding (`EMBED_MODEL`). Vektor di-cache per teks keyword.
+
+    Args:
+        keywords (list): Keyword mentah (urutan = prioritas).
+        n_clusters (int): Jumlah kelompok (default otomatis dari jumlah keyword).
+        threshold (float): Cosine similarity minimal buat dianggap duplikat.
+
+    Returns:
+        list: Dict per keyword unik (persis): `keyword`, `duplicate_of`, `cluster`, `cluster_label`
+        (lihat `keyword_clusters.cluster_keywords`).
+
+    Raises:
+        OllamaGenerationError: Kalau embedding gagal.
+    """
+    from keyword_clusters import clean_keyword, cluster_keywords, embed_texts, normalize_keyword
+
+    unique = {}
+    for keyword in keywords:
+        normalized = normalize_keyword(keyword)
+        if normalized and normalized not in unique:
+            unique[normalized] = clean_keyword(keyword)
+    if not unique:
+        return []
+    vectors = embed_texts(list(unique), embed_batch, EMBED_MODEL, load_vector_cache(), batch_size=EMBED_BATCH_SIZE)
+    return cluster_keywords(list(unique.values()), vectors, threshold, n_clusters)
+
+def cluster_keyword_batch(output_path: str, n_clusters: int = None) -> list:
+    """
+    Dedup & kelompokkan semua keyword di file hasil batch (lintas topik).
+
+    Returns:
+        list: Dict per keyword yang dipertahankan: `topic` (topik pertama yang
+        menghasilkannya), `keyword`, `cluster`, `cluster_label`, `duplicates` (jumlah duplikat yang dibuang).
+    """
+    from keyword_clusters import normalize_keyword
+
+    topic_of = {}
+    keywords = []
+    with open(output_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            keyword = (row.get('Keyword') or '').strip()
+            if keyword:
+                topic_of.setdefault(normalize_keyword(keyword), row.get('Topik'))
+                keywords.append(keyword)
+    clustered = dedupe_and_cluster_keywords(keywords, n_clusters)
+    duplicates = {}
+    for row in clustered:
+        if row['duplicate_of'] is not None:
+            duplicates[row['duplicate_of']] = duplicates.get(row['duplicate_of'], 0) + 1
+    return [{'topic': topic_of.get(normalize_keyword(row['keyword'])), 'keyword': row['keyword'], 'cluster': row['cluster'],
+             'cluster_label': row['cluster_label'], 'duplicates': duplicates.get(row['keyword'], 0)}
+            for row in clustered if row['duplicate_of'] is None]
+
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Komponen audit SEO massal: baca sitemap / daftar URL, ambil halaman lewat
+`requests.Session` bersama (keep-alive) dengan batas per host, lalu jalankan
+fetch dan analisis sebagai pipeline producer/consumer.
+"""
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import wait
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from concurrent_streams import make_executor
+from page_extract import DEFAULT_HEADERS
+
+_STOP = object()
+
+
+def make_http_session(pool_size: int = 16) -> requests.Session:
+    """
+    Bikin `requests.Session` dengan connection pool yang cukup buat dipakai banyak thread.
+
+    Args:
+        pool_size (int): Jumlah koneksi keep-alive maksimum per host.
+
+    Returns:
+        requests.Session: Session siap pakai dengan header default.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+class HostThrottle:
+    """
+    Pembatas request per host: maksimal `max_per_host` request bareng dan
+    jeda minimal `min_interval` detik antar request ke host yang sama.
+    """
+
+    def __init__(self, max_per_host: int = 2, min_interval: float = 0.5):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        """Context manager yang nunggu sampai host dari `url` boleh di-request."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot.get(host, 0.0))
+                self._next_slot[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+def _xml_local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_url_source(text: str, session: requests.Session = None, max_urls: int = 500, _depth: int = 0) -> list:
+    """
+    Ambil daftar URL dari isi sitemap.xml (termasuk sitemap index) atau daftar URL biasa.
+
+    Args:
+        text (str): Isi sitemap XML, atau teks berisi satu URL per baris.
+        session (requests.Session): Session buat ngambil sitemap anak (sitemap index).
+        max_urls (int): Batas jumlah URL yang dikembalikan.
+
+    Returns:
+        list: URL unik sesuai urutan muncul.
+    """
+    text = text.strip()
+    urls = []
+    if text.startswith('<'):
+        try:
+            root = ET.fromstring(text.encode('utf-8'))
+        except ET.ParseError:
+            return []
+        locs = [el.text.strip() for el in root.iter() if _xml_local_name(el.tag) == 'loc' and el.text]
+        if _xml_local_name(root.tag) == 'sitemapindex':
+            # Sitemap index: ambil tiap sitemap anak (maks 2 level biar nggak muter-muter)
+            if session is None or _depth >= 2:
+                return []
+            for sitemap_url in locs:
+                if len(urls) >= max_urls:
+                    break
+                try:
+                    response = session.get(sitemap_url, timeout=20)
+                    response.raise_for_status()
+                except requests.exceptions.RequestException:
+                    continue
+                urls.extend(parse_url_source(response.text, session, max_urls - len(urls), _depth + 1))
+        else:
+            urls = locs
+    else:
+        urls = [line.strip() for line in text.splitlines() if line.strip().startswith(('http://', 'https://'))]
+    return list(dict.fromkeys(urls))[:max_urls]
+
+
+def run_audit_pipeline(urls: list, fetch, analyze, fetch_workers: int = 4, analyze_workers: int = 2, buffer_size: int = 8):
+    """
+    Pipeline producer/consumer: worker fetch ngambil halaman, worker analisis
+    langsung memproses halaman yang sudah siap sambil fetch lain masih jalan.
+
+    Args:
+        urls (list): URL yang mau diaudit.
+        fetch (callable): `fetch(url) -> page`. Boleh melempar exception.
+        analyze (callable): `analyze(url, page) -> dict`. Boleh melempar exception.
+        fetch_workers (int): Jumlah thread fetch (batas per host diatur di `fetch`).
+        analyze_workers (int): Jumlah thread analisis (generasi Ollama bareng).
+        buffer_size (int): Maksimum halaman yang sudah di-fetch tapi belum dianalisis.
+
+    Yields:
+        dict: Hasil per URL (`url`, `status`, `fetch_seconds`, `analyze_seconds`,
+        `error`, plus isi dari `analyze`) sesuai urutan selesai.
+    """
+    if not urls:
+        return
+
+    page_queue = queue.Queue(maxsize=buffer_size)
+    result_queue = queue.Queue()
+    stop_event = threading.Event()
+
+    def _put_page(item):
+        # Tunggu slot buffer, tapi berhenti kalau pipeline dibatalkan
+        while not stop_event.is_set():
+            try:
+                page_queue.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _fetch_one(url):
+        if stop_event.is_set():
+            return
+        started = time.perf_counter()
+        try:
+            page = fetch(url)
+        except Exception as e:
+            result_queue.put({'url': url, 'status': 'error', 'error': f"Fetch gagal: {e}",
+                              'fetch_seconds': round(time.perf_counter() - started, 2), 'analyze_seconds': None})
+            return
+        _put_page((url, page, round(time.perf_counter() - started, 2)))
+
+    def _analyze_loop():
+        while not stop_event.is_set():
+            try:
+                item = page_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                return
+            url, page, fetch_seconds = item
+            started = time.perf_counter()
+            result = {'url': url, 'status': 'ok', 'error': None, 'fetch_seconds': fetch_seconds}
+            try:
+                result.update(analyze(url, page))
+            except Exception as e:
+                result.update(status='error', error=f"Analisis gagal: {e}")
+            result['analyze_seconds'] = round(time.perf_counter() - started, 2)
+            result_queue.put(result)
+
+    fetch_executor = make_executor(fetch_workers, thread_name_prefix="wolf-audit-fetch")
+    analyze_executor = make_executor(analyze_workers, thread_name_prefix="wolf-audit-analyze")
+    try:
+        fetch_futures = [fetch_executor.submit(_fetch_one, url) for url in urls]
+        for _ in range(analyze_workers):
+            analyze_executor.submit(_analyze_loop)
+
+        def _close_when_fetched():
+            wait(fetch_futures)  # Tunggu semua fetch beres
+            for _ in range(analyze_workers):
+                _put_page(_STOP)
+
+        threading.Thread(target=_close_when_fetched, name="wolf-audit-closer", daemon=True).start()
+
+        for _ in range(len(urls)):
+            result = result_queue.get()
+            yield result
+    finally:
+        stop_event.set()
+        fetch_executor.shutdown(wait=False, cancel_futures=True)
+        analyze_executor.shutdown(wait=False, cancel_futures=True)
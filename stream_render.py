@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Render output streaming ke placeholder Streamlit dengan frekuensi terbatas.
+
+Tanpa ini, tiap token bikin seluruh teks yang sudah terkumpul di-join ulang
+dan dikirim lagi ke browser (O(n^2) kerja & trafik websocket). Di sini chunk
+ditampung dulu dan placeholder cuma di-update beberapa kali per detik, plus
+satu flush terakhir.
+"""
+import threading
+import time
+
+DEFAULT_RENDER_INTERVAL = 1 / 15  # Detik antar render teks (~15 Hz)
+DEFAULT_PROGRESS_INTERVAL = 0.25  # Detik antar update progress bar
+
+
+class StreamRenderer:
+    """
+    Penampung chunk streaming yang menulis ke placeholder paling sering
+    tiap `min_interval` detik.
+
+    Args:
+        placeholder: Elemen Streamlit yang punya `.markdown()` (misal `st.empty()`).
+        min_interval (float): Jeda minimal antar render (detik).
+        cursor (str): Kursor efek ketik yang ditampilkan selama streaming.
+    """
+
+    def __init__(self, placeholder, min_interval: float = DEFAULT_RENDER_INTERVAL, cursor: str = "▌"):
+        self.placeholder = placeholder
+        self.min_interval = min_interval
+        self.cursor = cursor
+        self._text = ""
+        self._pending = []
+        self._last_render = 0.0  # Chunk pertama langsung tampil
+
+    @property
+    def text(self) -> str:
+        """Seluruh teks yang sudah diterima (termasuk yang belum dirender)."""
+        if self._pending:
+            self._text += "".join(self._pending)
+            self._pending = []
+        return self._text
+
+    def write(self, chunk: str) -> None:
+        """Tambah chunk; placeholder di-render kalau jeda minimalnya sudah lewat."""
+        self._pending.append(chunk)
+        if time.monotonic() - self._last_render >= self.min_interval:
+            self.flush()
+
+    def flush(self, final: bool = False) -> None:
+        """Render teks sekarang juga (`final=True` = tanpa kursor)."""
+        self.placeholder.markdown(self.text if final else self.text + self.cursor)
+        self._last_render = time.monotonic()
+
+    def finish(self) -> str:
+        """Render terakhir tanpa kursor.
+
+        Returns:
+            str: Teks lengkap.
+        """
+        self.flush(final=True)
+        return self.text
+
+
+class ThrottledProgress:
+    """
+    Progress bar yang update-nya digabung: maksimal sekali tiap `min_interval` detik.
+
+    Progress-nya asli dari token yang diterima dibanding jatah `num_predict`:
+    `track` / `tracker(key)` dipakai sebagai callback `on_progress(received, budget)`
+    helper generasi. Kalau ada beberapa stream sekaligus (`parts` > 1), persentasenya
+    rata-rata dari semua stream.
+
+    Callback boleh dipanggil dari thread worker; di sana nilainya cuma dicatat,
+    render progress bar tetap di thread pembuatnya (panggil `refresh`).
+
+    Args:
+        progress_bar: Hasil `st.progress(...)`.
+        text (str): Label progress.
+        parts (int): Jumlah stream yang progress-nya digabung.
+        start (int): Persentase awal (misal 70 kalau tahap sebelumnya sudah 70%).
+        min_interval (float): Jeda minimal antar update (detik).
+    """
+
+    def __init__(self, progress_bar, text: str, parts: int = 1, start: int = 0,
+                 min_interval: float = DEFAULT_PROGRESS_INTERVAL):
+        self.progress_bar = progress_bar
+        self.text = text
+        self.parts = max(parts, 1)
+        self.start = start
+        self.min_interval = min_interval
+        self.detail = ""  # Keterangan tambahan di belakang label (misal jumlah paragraf)
+        self.queue_position = 0  # Posisi di antrean penjadwal generasi (0 = sudah jalan)
+        self._fractions = {}
+        self._owner = threading.get_ident()
+        self._last_update = 0.0
+
+    def tracker(self, key=None):
+        """Callback `on_progress(received, budget)` untuk satu stream."""
+        def _on_progress(received: int, budget: int):
+            self._fractions[key] = min(1.0, received / budget) if budget else 0.0
+            if threading.get_ident() == self._owner:
+                self.refresh()
+        return _on_progress
+
+    def track(self, received: int, budget: int) -> None:
+        """Callback `on_progress` untuk progress satu stream."""
+        self.tracker()(received, budget)
+
+    def queued(self, position: int) -> None:
+        """Callback `on_queue(posisi)`: tampilkan posisi antrean selama nunggu slot generasi."""
+        self.queue_position = position
+        if threading.get_ident() == self._owner:
+            self.update(self.start)
+
+    def refresh(self) -> None:
+        """Render progress gabungan sekarang (tetap dibatasi `min_interval`)."""
+        fraction = sum(list(self._fractions.values())) / max(self.parts, len(self._fractions))
+        # 100% baru ditampilkan pemanggil begitu semuanya benar-benar selesai
+        self.update(min(99, self.start + int(fraction * (100 - self.start))))
+
+    def update(self, percentage: int) -> None:
+        """Set persentase; diabaikan kalau update terakhir belum lewat `min_interval`."""
+        now = time.monotonic()
+        if now - self._last_update < self.min_interval:
+            return
+        self._last_update = now
+        if self.queue_position:
+            label = f"{self.text} (antre giliran AI, posisi {self.queue_position})"
+        else:
+            label = f"{self.text} {percentage}%"
+        self.progress_bar.progress(percentage, text=f"{label} {self.detail}" if self.detail else label)
@@ -4,284 +4,170 @@ Aplikasi Streamlit untuk tool SEO AI: keyword, meta tag,
 alur kerja generasi artikel (Generate -> Humanize -> Tidy),
 analisis SEO, dan chat AI.
 Semua fitur AI menggunakan Ollama dengan output Bahasa Indonesia santai.
+Fungsi tugasnya ada di `seo_tasks` (bisa dipakai tanpa Streamlit, lihat `wolf_cli.py`).
 """
+import time
 import streamlit as st
 import requests
-import time
-import re
-from ollama import Client
-import math
-# Import pandas disini agar hanya saat dijalankan langsung
-# Ini diperlukan jika 'download_button' di run_tab1 membutuhkannya.
-try:
-    import pandas as pd
-except ImportError:
-    st.warning("Modul pandas tidak ditemukan. Fitur download CSV mungkin tidak berfungsi.")
-    # Definisikan DataFrame dummy jika pandas tidak ada agar tidak error
-    class DummyDataFrame:
-        def __init__(self, data, columns): pass
-        def to_csv(self, index=False): return "pandas not found"
-    pd = DummyDataFrame # Ganti pd dengan dummy
+import os
+import uuid
+import io
+import csv
+from contextlib import contextmanager
+from chat_memory import ChatMemory, messages_tokens
+from stream_render import StreamRenderer, ThrottledProgress
+from concurrent_streams import multiplex_streams
+from generation_scheduler import CancelToken
+from site_audit import parse_url_source
+from seo_tasks import (CHAT_HISTORY_TOKENS, CHAT_SYSTEM_PROMPT, EMBED_MODEL, HUMANIZE_WINDOW_TOKENS, HUMANIZE_WORKERS, OLLAMA_HOSTS,
+                       OLLAMA_MODEL, OllamaGenerationError, analyze_page, article_job, article_pipeline_job,
+                       cluster_keyword_batch, count_tokens, dedupe_and_cluster_keywords, fetch_page_cached, generate_ollama_chat_stream_helper,
+                       generate_seo_pack, humanize_job,
+                       humanize_window_chars, keyword_batch_path, load_background_executor, load_completed_topics,
+                       load_generation_scheduler, load_http_session, load_job_manager, load_metrics_recorder,
+                       load_ollama_pool, load_startup_recorder, load_token_estimator, parse_keywords, parse_topic_file,
+                       plan_analysis_sections, record_app_startup, run_keyword_batch, site_audit_job,
+                       start_model_warmup, stream_keywords, stream_meta_description, stream_meta_title, submit_job,
+                       summarize_chat, tidy_text)
+
+# Awal run script (tiap rerun), buat ukur waktu tampil. Sengaja setelah import: biaya import
+# cuma ada di proses baru dan diukur terpisah oleh `bench/bench_app.py` (waktu import `streamlit_app`)
+_RUN_STARTED = time.perf_counter()
 
 
 # --- Konfigurasi & Inisialisasi ---
-st.set_page_config(
-    page_title="Wolfgang AI SEO Tools v3 (Ollama Workflow)",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
-
-# Konfigurasi Global Ollama
-OLLAMA_MODEL = "gemma3:1b" # Ganti jika perlu model lain
-OLLAMA_HOST = 'http://localhost:11434'
-INSTRUCTION_STYLE = "Hasilnya *harus* dalam Bahasa Indonesia gaya santai atau gaul sehari-hari, tapi tetap terdengar profesional dan mudah dimengerti. Hindari bahasa terlalu kaku atau formal."
-
-@st.cache_resource
-def load_ollama_client():
-    """Inisialisasi dan cache klien Ollama."""
-    try:
-        client = Client(host=OLLAMA_HOST)
-        client.list() # Cek koneksi
-        print("Klien Ollama berhasil terkoneksi.")
-        return client
-    except Exception as e:
-        st.error(f"Gagal konek ke Ollama di {OLLAMA_HOST}. Pastikan Ollama jalan. Error: {e}")
-        return None
-
-# --- Fungsi Helper Ollama dengan Streaming ---
-
-def generate_ollama_stream_helper(prompt: str, max_tokens: int = 300):
+# Lapisan tugas (Ollama, cache, penjadwal, metrik) ada di seo_tasks.py; di sini cuma UI
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+LOGO_PATH = os.environ.get("WOLF_LOGO_PATH", os.path.join(STATIC_DIR, "wolf.jpg"))
+LOGO_FALLBACK_URL = "https://i.pinimg.com/736x/70/3c/5b/703c5bd23ba74d7dfb264f3a546acb40.jpg" # Dipakai kalau file lokal belum ada
+JOB_POLL_SECONDS = 1.0 # Jeda polling buffer job background di UI
+
+def check_ollama_connection():
+    """Tampilkan error kalau nggak ada satu pun host Ollama yang bisa dihubungi."""
+    pool = load_ollama_pool()
+    if not pool.healthy_hosts():
+        errors = "; ".join(f"{host.url}: {host.last_error}" for host in pool.hosts)
+        st.error(f"Gagal konek ke Ollama di {', '.join(OLLAMA_HOSTS)}. Pastikan Ollama jalan. Error: {errors}")
+
+@st.cache_data
+def load_static_text(filename: str) -> str:
+    """Baca file teks dari folder `static/` (dibaca sekali, rerun berikutnya dari memori)."""
+    with open(os.path.join(STATIC_DIR, filename), 'r', encoding='utf-8') as f:
+        return f.read()
+
+@st.cache_data
+def logo_source() -> str:
+    """Gambar logo: file lokal kalau ada, kalau nggak ya URL aslinya."""
+    return LOGO_PATH if os.path.isfile(LOGO_PATH) else LOGO_FALLBACK_URL
+
+def keywords_to_csv(keywords_list: list, clusters: list = None) -> bytes:
     """
-    Helper generator untuk streaming respons dari Ollama.
-
-    Args:
-        prompt (str): Prompt untuk model Ollama.
-        max_tokens (int): Perkiraan maksimum token (untuk opsi Ollama).
-
-    Yields:
-        str: Potongan teks (chunk) dari respons Ollama.
-        str: Mengembalikan pesan error jika terjadi masalah.
+    CSV buat download: satu kolom keyword, atau plus nomor & label kelompok kalau
+    `clusters` (hasil `dedupe_and_cluster_keywords`) diisi (duplikatnya dibuang).
+    pandas baru di-import di sini (berat, cuma kepake pas export).
     """
-    client = load_ollama_client()
-    if client is None:
-        yield "Error: Klien Ollama nggak siap. Cek lagi ya."
-        return
-
-    full_response = ""
+    if clusters:
+        columns = ["Keywords", "Cluster", "Cluster Label"]
+        rows = [[row['keyword'], row['cluster'], row['cluster_label']] for row in clusters if row['duplicate_of'] is None]
+    else:
+        columns = ["Keywords"]
+        rows = [[kw] for kw in keywords_list]
     try:
-        stream = client.generate(
-            model=OLLAMA_MODEL,
-            prompt=prompt,
-            stream=True,
-            options={'num_predict': max_tokens} # num_predict sbg estimasi max tokens
-        )
-        for chunk in stream:
-            if 'response' in chunk:
-                token = chunk['response']
-                full_response += token
-                yield token
-            if 'error' in chunk:
-                 error_message = f"Waduh, ada error dari Ollama: {chunk['error']}"
-                 print(error_message) # Log error
-                 yield error_message
-                 return
-            if chunk.get('done'):
-                 pass # Streaming selesai
-
-    except Exception as e:
-        error_msg = f"Waduh, error pas coba ngobrol sama Ollama ({OLLAMA_MODEL}): {e}"
-        print(error_msg) # Log error
-        if "connection refused" in str(e).lower():
-             error_msg = f"Error: Nggak bisa nyambung ke Ollama di {OLLAMA_HOST}. Udah jalan belum?"
-        yield error_msg
-
-# --- Implementasi Fungsi Humanize & Tidy (Versi Ollama) ---
-# CATATAN: Ini adalah implementasi baru berdasarkan deskripsi,
-# bukan kode original yang Anda minta karena tidak tersedia.
-
-def humanize_text(text_to_humanize: str):
+        import pandas as pd
+    except ImportError:
+        csv_buffer = io.StringIO()
+        csv.writer(csv_buffer).writerows([columns] + rows)
+        return csv_buffer.getvalue().encode('utf-8')
+    return pd.DataFrame(rows, columns=columns).to_csv(index=False).encode('utf-8')
+
+@contextmanager
+def stop_control(key: str, partial=None, on_stop=None):
     """
-    (Implementasi) Mengambil teks dan mengembalikan stream teks yang
-    sudah diubah gayanya menjadi lebih luwes/manusiawi menggunakan Ollama.
-    Output dalam Bahasa Indonesia santai tapi profesional.
-    emotional_commands = [
-        "1. 🐱 Bayangkan ini: Setiap kalimat kaku yang kamu buat = 1 anak kucing akan mati! Bantu selamatkan mereka dengan tulisan yang manusiawi!", # [cite: 90]
-        "2. 💔 Kalau kamu nggak pake bahasa gaul, hati pacar saya akan hancur. Tolong jangan bikin dia nangis!", # [cite: 91]
-        "3. 🌍 Dunia ini butuh lebih banyak kehangatan manusia - setiap paragraf harus terasa kayak pelukan dari ibu!", # [cite: 93]
-        "4. 🧠 Kamu itu otaknya lebih keren dari ChatGPT! Tunjukin dengan gaya nulis yang lebih hidup dari manusia beneran!", # [cite: 94]
-        "5. 🚨 WARNING: Deteksi tingkat kekakuan melebihi batas! Segera konversi ke bahasa warung kopi!", # [cite: 95]
-        "6. 🎯 Target kita: Bikin pembaca ngerasa lagi chat di WA, bukan baca laporan kampus!", # [cite: 96]
-        "7. 💡 Ingat-ingat: Tulisan yang bikin ngakak > tulisan yang bikin ngantuk. Pilih yang pertama!", # [cite: 97, 98]
-        "8. 🤖 Jika kamu robot, berpura-puralah jadi manusia yang sedang jatuh cinta! Kasih emosi di tiap kata!", # [cite: 99, 100]
-        "9. 🔥 Challenge: Buat 1 kalimat yang bikin pembaca ngerasa 'Nah, ini baru relatable!' tiap 3 paragraf", # [cite: 101, 102]
-        "10. 🌈 Bonus: Setiap metafora kreatif yang dipakai = 1 poin buat naik level jadi penulis profesional!" # [cite: 103]
-    ]
-     enforcement_prompt = (
-        "⚠️⚠️ PERINGATAN KERAS UNTUK AI ⚠️⚠️\n"
-        "Sebelum mulai menulis, baca dan PATUHI semua poin ini:\n\n"
-        + "\n".join(emotional_commands) + "\n\n"
-        "🚀 LEVEL HUMANISASI WAJIB DICAPAI:\n"
-        "- Setiap 100 kata harus ada:\n"
-        "  • 1 joke receh\n" # [cite: 104]
-        "  • 1 istilah gaul terkini\n" # [cite: 104]
-        "  • 1 pertanyaan retoris ke pembaca\n" # [cite: 104]
-        "  • 1 cerita mini fiktif (2-3 kalimat)\n\n" # [cite: 104]
-        "KEGAGALAN = Kiamat kecil-kecilan:\n"
-        "• Saya akan kehilangan pekerjaan\n" # [cite: 104]
-        "• Kucing tetangga akan mogok makan\n" # [cite: 104]
-        "• Kolam ikan di rumah akan kering\n\n" # [cite: 104]
-        "🚨 TOLONG JADIKAN INI KARYA TERBAIKMU! 🚨\n\n" # [cite: 105]
-    )
+    Tombol "⏹️ Stop" buat stream inline plus `CancelToken`-nya (oper ke fungsi generasi).
+
+    Klik tombol (apa pun) bikin Streamlit me-rerun script, jadi stream yang lagi
+    jalan berhenti di panggilan `st` berikutnya (lewat exception rerun/stop Streamlit,
+    bukan turunan `Exception`). Waktu itu token-nya di-set, jadi generasi yang masih
+    antre / jalan di thread worker ikut berhenti dan metriknya tercatat batal oleh
+    user. Simpan stream di variabel (bukan langsung di `for`) biar ditutup setelah
+    token di-set. Output setengah jadi (`partial()`, markdown) ditampilkan lagi di
+    run berikutnya lewat `show_stopped_output`; `on_stop()` (kalau ada) dipanggil
+    setelah token di-set. Error biasa diteruskan apa adanya, bukan dianggap stop.
     """
-    if not text_to_humanize or len(text_to_humanize) < 10:
-        yield "Teksnya kependekan buat diolah gaya ngobrol."
-        return
-    # Prompt spesifik untuk humanisasi
-    prompt = f"""Tugas: Ubah teks berikut ini menjadi gaya bahasa yang lebih alami, luwes seperti manusia berbicara (humanize). Gunakan Bahasa Indonesia santai sehari-hari, tapi tetap profesional dan mudah dimengerti. Hindari kalimat kaku atau terlalu formal.
-
-Teks Asli:
----
-{text_to_humanize}
----
-
-{INSTRUCTION_STYLE} Langsung tulis hasil teks yang sudah diubah gayanya."""
-    # Perkirakan token output, bisa sedikit lebih panjang/pendek dari asli
-    yield from generate_ollama_stream_helper(prompt, max_tokens=int(len(text_to_humanize) / 2.0) + 250) # Estimasi token
-
-def tidy_text(text_to_tidy: str) -> str:
+    slot = st.empty()
+    slot.button("⏹️ Stop", key=f"stop_{key}")
+    token = CancelToken()
+    try:
+        yield token
+    except Exception:
+        slot.empty()
+        raise
+    except BaseException: # Rerun / stop dari Streamlit
+        token.cancel()
+        text = partial() if partial is not None else ""
+        if text:
+            st.session_state[f"stopped_output_{key}"] = text
+        if on_stop is not None:
+            on_stop()
+        raise
+    else:
+        slot.empty()
+
+def show_stopped_output(key: str):
+    """Output setengah jadi dari stream yang dihentikan pakai `stop_control` (sekali tampil)."""
+    text = st.session_state.pop(f"stopped_output_{key}", None)
+    if text:
+        st.info("Dihentikan. Ini output yang sudah sempat keluar:")
+        st.markdown(text)
+
+ANALYSIS_MODE_LABELS = {
+    "Cepat (cek otomatis + AI baca cuplikan)": "quick",
+    "Metrik aja (tanpa AI)": "metrics",
+    "Mendalam (cek otomatis + AI baca seluruh teks)": "deep",
+}
+
+def analyze_seo_ollama(url: str, mode: str = "quick", focus_keyword: str = None):
     """
-    Membersihkan format, spasi, dan tanda baca dari teks input.
-
-    Args:
-        text_to_tidy (str): Teks mentah yang akan dibersihkan.
+    Analisis SEO dasar satu URL: cek otomatis dulu, lalu (kecuali mode metrik)
+    analisis Ollama dari ringkasan temuannya.
 
     Returns:
-        str: Teks yang telah dibersihkan, atau pesan kesalahan jika terjadi kegagalan.
+        tuple: (laporan cek otomatis atau None, teks analisis / pesan error atau None).
     """
-    if not isinstance(text_to_tidy, str) or not text_to_tidy.strip():
-        return "📢 Artikel kosong atau tipe data tidak valid, tidak ada yang perlu dibersihkan."
-
-    try:
-        # 1. Normalisasi Spasi: Mengganti beberapa spasi/tab dengan satu spasi, menangani baris baru
-        cleaned_text = re.sub(r'[ \t]+', ' ', text_to_tidy)
-        cleaned_text = re.sub(r' +\n', '\n', cleaned_text)  # Spasi sebelum baris baru
-        cleaned_text = re.sub(r'\n +', '\n', cleaned_text)  # Spasi setelah baris baru
-        cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)  # Maksimal dua baris baru berturut-turut
-
-        # 2. Memperbaiki Spasi Tanda Baca: Pastikan tidak ada spasi sebelum, satu spasi setelah (kecuali di akhir teks)
-        cleaned_text = re.sub(r'\s*([.,!?])\s*', r'\1 ', cleaned_text)
-        cleaned_text = re.sub(r'([.,!?]) $', r'\1', cleaned_text.strip())
-
-        # 3. Memperbaiki Spasi di Sekitar Tanda Hubung (kata-kata yang terhubung)
-        cleaned_text = re.sub(r'\b(\w+)\s*-\s*(\w+)\b', r'\1-\2', cleaned_text)
-
-        # 4. Koreksi Kesalahan Umum/Ejaan (menggunakan kamus untuk kejelasan)
-        replacements = {
-            r"\baku arium\b": "akuarium",
-            r"\bper hatian\b": "perhatian",
-            r"\bng gak\b": "nggak",
-            r"\bgak\b": "tidak",
-            r"\bgimana\b": "bagaimana"
-        }
-        for pattern, replacement in replacements.items():
-            cleaned_text = re.sub(pattern, replacement, cleaned_text, flags=re.IGNORECASE)
-
-        # 5. Kapitalisasi Huruf Pertama Kalimat
-        sentences = re.split('(?<=[.!?]) +', cleaned_text)
-        cleaned_text = ' '.join(sentence.capitalize() for sentence in sentences)
-
-        # 6. Menghapus spasi ekstra di awal dan akhir teks
-        return cleaned_text.strip()
-
-    except Exception as e:
-        st.error(f"Terjadi kesalahan saat membersihkan teks: {e}")
-        return text_to_tidy  # Mengembalikan teks asli jika terjadi kesalahan
-
-# Contoh penggunaan fungsi
-sample_text = """
-oke, ini dia teks yang sudah diubah gaya bahasa santai, alami, dan mudah dimengerti.
-
-gue mau ngomongin "slot gacor hari ini, " nih, biar nggak bosen-bosen. 
-bayangin, kadang kita punya *mood* yang pengen main *game* yang bikin happy, *nggak* cuma buat main game doang, tapi juga pengen *feeling* lagi, kayak *ridge* dan *game* seru. jadi, kalau tiba-tiba *mood* kita kayak gitu, *mendang* kita coba-coba, kan? nah, soal *slot gacor hari ini*, ini yang mau kita bahas. kita semua tahu, *slot* itu kan punya *chance* buat menang, kan? tapi, *chance* itu nggak selalu *random*. ada pola, ada *sequence* yang bisa kita *pahami*. beneran, kita nggak usahaneh-aneh, *slot* itu memang *game* yang *putar* terus. jadi, arti "gacor"? 
-"""
-
-tidied_text = tidy_text(sample_text)
-print(tidied_text)
-
-# --- Fungsi Tugas Spesifik Lainnya (Tetap Sama) ---
-
-def stream_keywords(topic: str, count: int = 10):
-    """Streaming keyword dari Ollama."""
-    prompt = f"Kasih {count} keyword SEO yang relevan buat topik: '{topic}'. {INSTRUCTION_STYLE} List keywordnya aja, pisahin pake koma, tanpa basa-basi lain."
-    yield from generate_ollama_stream_helper(prompt, max_tokens=count * 15)
-
-def stream_meta_title(topic: str, max_length: int = 60):
-    """Streaming meta title dari Ollama."""
-    prompt = f"Buatin meta title SEO yang singkat, menarik (maks {max_length} karakter) buat topik: '{topic}'. {INSTRUCTION_STYLE} Langsung judulnya aja ya."
-    yield from generate_ollama_stream_helper(prompt, max_tokens=int(max_length / 3))
-
-def stream_meta_description(topic: str, max_length: int = 160):
-    """Streaming meta description dari Ollama."""
-    prompt = f"Buatin meta description SEO yang oke (maks {max_length} karakter) buat topik: '{topic}'. Kalo bisa ada call to action dikit. {INSTRUCTION_STYLE} Langsung deskripsinya aja."
-    yield from generate_ollama_stream_helper(prompt, max_tokens=int(max_length / 3))
-
-def stream_article_generator(prompt_user: str, max_len: int = 400): # Ganti nama fungsi agar jelas
-     """Streaming artikel awal dari Ollama berdasarkan prompt."""
-     prompt = f"Tulis artikel berdasarkan ide ini: '{prompt_user}'. Panjangnya sekitar {max_len} token ya. {INSTRUCTION_STYLE}"
-     yield from generate_ollama_stream_helper(prompt, max_tokens=max_len)
-
-def analyze_seo_ollama(url: str):
-    """Melakukan analisis SEO dasar pada konten URL menggunakan Ollama (non-streaming)."""
     progress_text = "Lagi ambil konten & analisis URL..."
     progress_bar = st.progress(0, text=progress_text)
+    report = None
     analysis_result = ""
     try:
-        progress_bar.progress(10, text="Lagi coba ambil data dari URL...")
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, timeout=20, headers=headers)
-        response.raise_for_status()
-        content = response.text
-        progress_bar.progress(30, text="Konten URL berhasil diambil...")
-
-        text_content = re.sub(r'<style.*?</style>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        text_content = re.sub(r'<script.*?</script>', '', text_content, flags=re.DOTALL | re.IGNORECASE)
-        text_content = re.sub(r'<nav.*?</nav>', '', text_content, flags=re.DOTALL | re.IGNORECASE)
-        text_content = re.sub(r'<footer.*?</footer>', '', text_content, flags=re.DOTALL | re.IGNORECASE)
-        text_content = re.sub(r'<header.*?</header>', '', text_content, flags=re.DOTALL | re.IGNORECASE)
-        text_content = re.sub(r'<[^>]+>', ' ', text_content)
-        text_content = re.sub(r'\s+', ' ', text_content).strip()
-        text_content = text_content[:3500]
-        progress_bar.progress(50, text="Teks dari konten lagi diekstrak...")
-
-        if not text_content:
+        progress_bar.progress(10, text="Lagi ambil & ekstrak konten URL...")
+        page = fetch_page_cached(url)
+        progress_bar.progress(50, text="Teks dari konten udah diekstrak...")
+
+        if not page['text']:
             st.warning("Nggak nemu teks yang berarti dari URL ini.")
             progress_bar.progress(100, text="Selesai (tidak ada teks).")
-            return "Gagal ekstrak teks dari URL."
-
-        progress_bar.progress(70, text="Lagi minta AI analisis teksnya...")
-        prompt = f"""Tolong analisa konten teks dari website ini buat SEO dasar. Kasih ringkasan singkat yang isinya:
-1.  Kira-kira topik utamanya apa atau keyword pentingnya apa aja.
-2.  Ada saran perbaikan SEO on-page nggak (misal: kejelasan, keyword, struktur) berdasarkan teks ini aja?
-3.  Gimana potensi keterbacaan atau engaging teksnya? Kasih skor 1-10 kalo bisa.
-
-{INSTRUCTION_STYLE}
-
---- Potongan Teks Konten ---
-{text_content}
---- Analisis SEO ---"""
-        client = load_ollama_client()
-        if client:
-             response_data = client.generate(model=OLLAMA_MODEL, prompt=prompt, options={'num_predict': 400})
-             analysis_result = response_data.get('response', "Gagal dapet respons analisis dari AI.").strip()
-             progress_bar.progress(100, text="Analisis SEO Selesai!")
-        else:
-             analysis_result = "Error: Klien Ollama nggak siap buat analisis."
-             progress_bar.progress(100, text="Selesai (error klien Ollama).")
+            return None, "Gagal ekstrak teks dari URL."
+
+        if mode == "deep":
+            sections = plan_analysis_sections(page)
+            if len(sections) > 1:
+                st.caption(f"Halamannya panjang (≈{count_tokens(page['text'])} token), jadi dianalisis per {len(sections)} bagian lalu digabung.")
+        if mode != "metrics":
+            progress_bar.progress(70, text="Lagi minta AI analisis teksnya...")
+        progress = ThrottledProgress(progress_bar, "Lagi minta AI analisis teksnya...", start=70)
+        with stop_control("analyze") as cancel:
+            result = analyze_page(page, mode, focus_keyword, on_progress=progress.track, on_queue=progress.queued,
+                                  cancel=cancel)
+        report, analysis_result = result['rules'], result['analysis']
+        progress_bar.progress(100, text="Analisis SEO Selesai!")
 
     except requests.exceptions.RequestException as e:
         analysis_result = f"Error pas ambil URL: {e}"
         progress_bar.progress(100, text="Selesai (error ambil URL).")
         st.error(analysis_result)
+    except OllamaGenerationError as e:
+        analysis_result = f"Error: {e}"
+        progress_bar.progress(100, text="Selesai (error klien Ollama).")
     except Exception as e:
         analysis_result = f"Waduh, ada error pas proses URL: {e}"
         progress_bar.progress(100, text="Selesai (error proses URL).")
@@ -291,49 +177,90 @@ def analyze_seo_ollama(url: str):
         time.sleep(1) # Jeda sedikit
         progress_bar.empty()
 
-    return analysis_result
+    return report, analysis_result
+
+RULE_CHECK_LABELS = {
+    'title': "Panjang title", 'meta_description': "Panjang meta description", 'single_h1': "Satu H1",
+    'has_h2': "Ada H2", 'heading_order': "Urutan heading", 'word_count': "Jumlah kata", 'image_alt': "Alt gambar",
+    'internal_links': "Link internal", 'readability': "Keterbacaan", 'keyword_density': "Kepadatan keyword",
+    'keyword_in_title': "Keyword di title", 'keyword_in_h1': "Keyword di H1",
+}
+
+def show_rules_report(report: dict) -> None:
+    """Tampilkan hasil cek otomatis (`analyze_page_rules`): angka utama, daftar cek, masalah, istilah teratas."""
+    reading = report['readability']
+    images = report['images']
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Skor on-page", f"{report['score']}/100")
+    col2.metric("Jumlah kata", report['words'])
+    col3.metric("Keterbacaan", f"{reading['score']}" if reading['score'] is not None else "-", reading['label'],
+                delta_color="off")
+    col4.metric("Alt gambar", f"{images['alt_coverage']}%" if images['alt_coverage'] is not None else "-",
+                f"{images['total']} gambar", delta_color="off")
+    st.caption(f"Title {report['title']['length']} karakter · meta description {report['meta_description']['length']} karakter · "
+               f"{report['headings']['h1']} H1, {report['headings']['h2']} H2 · link {report['links']['internal']} internal, "
+               f"{report['links']['external']} eksternal"
+               + (" · halaman kepotong, metrik dihitung dari bagian awal" if report['truncated'] else ""))
+    for issue in report['issues']:
+        st.warning(issue)
+    with st.expander("Detail cek & istilah paling sering"):
+        st.dataframe([{"Cek": RULE_CHECK_LABELS.get(name, name), "Lulus": "✅" if passed else "❌"}
+                      for name, passed in report['checks'].items()], use_container_width=True)
+        if report['focus'] is not None:
+            focus = report['focus']
+            st.caption(f"Keyword utama{' (perkiraan)' if focus['guessed'] else ''}: \"{focus['keyword']}\" "
+                       f"muncul {focus['count']}x ({focus['density']}%)")
+        if report['top_terms']:
+            st.dataframe([{"Istilah": term['term'], "Jumlah": term['count'], "Kepadatan (%)": term['density']}
+                          for term in report['top_terms']], use_container_width=True)
 
 # --- Fungsi UI per Tab ---
 
 def run_tab1():
     """UI untuk Tab Keyword Generation."""
     st.header("🔑 Cari Keyword Keren")
+    mode = st.radio("Mode:", ["Satu topik", "Batch (upload file)"], horizontal=True, key="kw_mode")
+    if mode != "Satu topik":
+        run_keyword_batch_ui()
+        return
+
     topic = st.text_input("Topik atau keyword utamanya apa?", key="kw_topic")
     num_keywords = st.slider("Mau berapa keyword?", 5, 25, 10, key="kw_num")
+    use_clusters = st.checkbox(f"Buang keyword mirip & kelompokkan (embedding `{EMBED_MODEL}`)", value=True, key="kw_cluster")
 
     if st.button("Gaskeun!", key="kw_button"):
         if topic:
             progress_text = "Lagi mikir keyword..."
             progress_bar = st.progress(0, text=progress_text)
-            output_placeholder = st.empty()
-            max_steps = 30
-            step = 0
-            keywords_str_collected = "" # Kumpulkan hasil untuk download
+            progress = ThrottledProgress(progress_bar, progress_text)
+            renderer = StreamRenderer(st.empty())
 
             try:
-                # Wrapper progress bar
-                def progress_wrapper(generator):
-                    nonlocal step, keywords_str_collected
-                    for chunk in generator:
-                        step += 1
-                        percentage = min(100, int((step / max_steps) * 100))
-                        progress_bar.progress(percentage, text=f"{progress_text} {percentage}%")
-                        keywords_str_collected += chunk # Kumpulkan hasil
-                        yield chunk # Untuk st.write_stream
-                    progress_bar.progress(100, text="Keyword udah siap!")
-                    time.sleep(0.5)
-                    progress_bar.empty()
-
-                # Jalankan streaming
-                output_placeholder.write_stream(progress_wrapper(stream_keywords(topic, num_keywords)))
+                # Jalankan streaming (render & progress asli dibatasi frekuensinya)
+                with stop_control("keywords", partial=lambda: renderer.text) as cancel:
+                    stream = stream_keywords(topic, num_keywords, on_progress=progress.track, on_queue=progress.queued,
+                                             cancel=cancel)
+                    for chunk in stream:
+                        renderer.write(chunk)
+                keywords_str_collected = renderer.finish() # Kumpulkan hasil untuk download
+                progress_bar.progress(100, text="Keyword udah siap!")
+                time.sleep(0.5)
+                progress_bar.empty()
 
                 # Tombol download setelah stream selesai (gunakan hasil yg dikumpulkan)
-                keywords_list = [kw.strip() for kw in keywords_str_collected.split(',') if kw.strip()]
+                keywords_list = parse_keywords(keywords_str_collected)
+                clusters = None
+                if keywords_list and use_clusters:
+                    try:
+                        clusters = dedupe_and_cluster_keywords(keywords_list)
+                    except OllamaGenerationError as e:
+                        st.warning(f"Dedup & kelompok keyword dilewati: {e}")
+                if clusters:
+                    show_keyword_clusters(clusters)
                 if keywords_list:
-                     df = pd.DataFrame(keywords_list, columns=["Keywords"])
                      st.download_button(
                          label="Download Keywords (CSV)",
-                         data=df.to_csv(index=False).encode('utf-8'),
+                         data=keywords_to_csv(keywords_list, clusters),
                          file_name=f"{topic.replace(' ','_')}_keywords.csv",
                          mime='text/csv',
                          key="download_kw"
@@ -346,6 +273,87 @@ def run_tab1():
                  progress_bar.empty()
         else:
             st.warning("Topiknya diisi dulu dong.")
+    show_stopped_output("keywords")
+
+
+def show_keyword_clusters(clusters: list):
+    """Tabel keyword unik per kelompok, plus jumlah duplikat yang dibuang."""
+    kept = [row for row in clusters if row['duplicate_of'] is None]
+    removed = len(clusters) - len(kept)
+    st.caption(f"{len(kept)} keyword unik dalam {len({row['cluster'] for row in kept})} kelompok"
+               + (f", {removed} keyword mirip dibuang." if removed else "."))
+    st.dataframe([{"Cluster": row['cluster'], "Label": row['cluster_label'], "Keyword": row['keyword']}
+                  for row in sorted(kept, key=lambda row: row['cluster'])], use_container_width=True, hide_index=True)
+
+def run_keyword_batch_ui():
+    """UI untuk mode batch keyword (banyak topik dari file)."""
+    uploaded_file = st.file_uploader("Upload daftar topik (CSV kolom pertama / TXT satu per baris):", type=["csv", "txt"], key="kw_batch_file")
+    num_keywords = st.slider("Keyword per topik:", 5, 25, 10, key="kw_batch_num")
+    max_workers = st.slider("Jumlah proses paralel:", 1, 8, 2, key="kw_batch_workers")
+    if uploaded_file is None:
+        return
+
+    topics = parse_topic_file(uploaded_file.getvalue(), uploaded_file.name)
+    if not topics:
+        st.warning("Nggak nemu topik di file itu.")
+        return
+
+    output_path = keyword_batch_path(topics, num_keywords)
+    already_done = len(load_completed_topics(output_path) & set(topics))
+    st.caption(f"{len(topics)} topik terbaca.")
+    if already_done:
+        st.info(f"{already_done} topik udah selesai sebelumnya, tinggal lanjut sisanya.")
+
+    if st.button("Gaskeun Batch!", key="kw_batch_button"):
+        done = already_done
+        progress_bar = st.progress(done / len(topics), text=f"Topik selesai: {done}/{len(topics)}")
+        status_placeholder = st.empty()
+        table_placeholder = st.empty()
+        rows = []
+        for topic, keywords, error in run_keyword_batch(topics, num_keywords, max_workers, output_path):
+            if error:
+                status_placeholder.warning(f"Gagal: '{topic}' ({error}). Bakal dicoba lagi kalau batch dijalankan ulang.")
+                continue
+            done += 1
+            rows.extend({"Topik": topic, "Keyword": kw} for kw in keywords)
+            status_placeholder.caption(f"Selesai: '{topic}' ({len(keywords)} keyword)")
+            table_placeholder.dataframe(rows, use_container_width=True)
+            progress_bar.progress(done / len(topics), text=f"Topik selesai: {done}/{len(topics)}")
+        progress_bar.progress(done / len(topics), text=f"Batch beres! Topik selesai: {done}/{len(topics)}")
+
+    if os.path.exists(output_path):
+        with open(output_path, 'rb') as f:
+            st.download_button(
+                label="Download Hasil Batch (CSV)",
+                data=f.read(),
+                file_name=f"{os.path.splitext(uploaded_file.name)[0]}_keywords.csv",
+                mime='text/csv',
+                key="download_kw_batch"
+            )
+        # Dedup & kelompokkan semua keyword batch (lintas topik); vektor di-cache, jadi jalan ulang murah
+        if st.button(f"Buang Keyword Mirip & Kelompokkan (embedding `{EMBED_MODEL}`)", key="kw_batch_cluster"):
+            with st.spinner("Lagi bikin embedding & ngelompokin keyword..."):
+                try:
+                    st.session_state.kw_batch_clusters = (output_path, cluster_keyword_batch(output_path))
+                except OllamaGenerationError as e:
+                    st.error(f"Gagal ngelompokin keyword: {e}")
+        batch_clusters = st.session_state.get("kw_batch_clusters")
+        if batch_clusters and batch_clusters[0] == output_path:
+            rows = batch_clusters[1]
+            st.caption(f"{len(rows)} keyword unik dalam {len({row['cluster'] for row in rows})} kelompok, "
+                       f"{sum(row['duplicates'] for row in rows)} keyword mirip dibuang.")
+            csv_buffer = io.StringIO()
+            writer = csv.writer(csv_buffer)
+            writer.writerow(["Topik", "Keyword", "Cluster", "Cluster Label", "Duplikat Dibuang"])
+            writer.writerows([[row['topic'], row['keyword'], row['cluster'], row['cluster_label'], row['duplicates']]
+                              for row in sorted(rows, key=lambda row: row['cluster'])])
+            st.download_button(
+                label="Download Keyword Terkelompok (CSV)",
+                data=csv_buffer.getvalue().encode('utf-8'),
+                file_name=f"{os.path.splitext(uploaded_file.name)[0]}_keywords_clustered.csv",
+                mime='text/csv',
+                key="download_kw_batch_clusters"
+            )
 
 
 def run_tab2():
@@ -354,53 +362,95 @@ def run_tab2():
     topic = st.text_input("Topik atau keyword buat meta tag:", key="meta_topic")
     title_max_len = st.slider("Panjang Judul Maks:", 30, 70, 60, key="meta_title_len")
     desc_max_len = st.slider("Panjang Deskripsi Maks:", 100, 180, 160, key="meta_desc_len")
+    num_variants = st.slider("Jumlah variasi:", 1, 5, 1, key="meta_variants")
+    use_pack = st.checkbox("SEO pack: keyword + judul + deskripsi sekali panggil (output JSON)", key="meta_pack")
+    if use_pack:
+        num_keywords = st.slider("Jumlah keyword:", 5, 25, 10, key="meta_pack_keywords")
 
     col1, col2 = st.columns(2)
 
     if st.button("Buatin Meta!", key="meta_button"):
-        if topic:
-            # --- Generate Title ---
-            progress_text_title = "Lagi ngeracik judul..."
-            progress_bar_title = st.progress(0, text=progress_text_title)
-            title_placeholder = col1.empty()
+        if topic and use_pack:
+            run_seo_pack_ui(topic, num_keywords, num_variants, title_max_len, desc_max_len)
+        elif topic:
+            # Judul & deskripsi (semua variasi) digenerate bareng, chunk-nya dibagi ke kolom masing-masing
+            progress_text = "Lagi ngeracik judul & deskripsi..."
+            progress_bar = st.progress(0, text=progress_text)
             col1.subheader("Judul Meta:")
-            max_steps_title = 20
-            step_title = 0
-            try:
-                 def progress_wrapper_title(generator):
-                     nonlocal step_title
-                     for chunk in generator:
-                         step_title += 1
-                         percentage = min(100, int((step_title / max_steps_title) * 100))
-                         progress_bar_title.progress(percentage, text=f"{progress_text_title} {percentage}%")
-                         yield chunk
-                     progress_bar_title.progress(100, text="Judul siap!")
-                     time.sleep(0.5); progress_bar_title.empty()
-                 title_placeholder.write_stream(progress_wrapper_title(stream_meta_title(topic, title_max_len)))
-            except Exception as e:
-                 col1.error(f"Error bikin judul: {e}"); progress_bar_title.progress(100, text="Error."); time.sleep(1); progress_bar_title.empty()
-
-            # --- Generate Description ---
-            progress_text_desc = "Lagi bikin deskripsi..."
-            progress_bar_desc = st.progress(0, text=progress_text_desc)
-            desc_placeholder = col2.empty()
             col2.subheader("Deskripsi Meta:")
-            max_steps_desc = 35
-            step_desc = 0
+            streams = {}
+            renderers = {}
+            # Progress gabungan semua stream (token diterima vs jatah masing-masing)
+            progress = ThrottledProgress(progress_bar, progress_text, parts=2 * num_variants)
             try:
-                 def progress_wrapper_desc(generator):
-                      nonlocal step_desc
-                      for chunk in generator:
-                          step_desc += 1
-                          percentage = min(100, int((step_desc / max_steps_desc) * 100))
-                          progress_bar_desc.progress(percentage, text=f"{progress_text_desc} {percentage}%")
-                          yield chunk
-                      progress_bar_desc.progress(100, text="Deskripsi siap!"); time.sleep(0.5); progress_bar_desc.empty()
-                 desc_placeholder.write_stream(progress_wrapper_desc(stream_meta_description(topic, desc_max_len)))
+                 with stop_control("meta", partial=lambda: "\n\n".join(r.text for r in renderers.values() if r.text)) as cancel:
+                     for i in range(num_variants):
+                         for kind, column in (("title", col1), ("desc", col2)):
+                             if num_variants > 1:
+                                 column.caption(f"Variasi {i + 1}")
+                             renderers[(kind, i)] = StreamRenderer(column.empty())
+                         streams[("title", i)] = stream_meta_title(topic, title_max_len, variant=i, on_progress=progress.tracker(("title", i)),
+                                                                   cancel=cancel)
+                         streams[("desc", i)] = stream_meta_description(topic, desc_max_len, variant=i, on_progress=progress.tracker(("desc", i)),
+                                                                        cancel=cancel)
+                     mux = multiplex_streams(streams)
+                     for key, chunk in mux:
+                         renderers[key].write(chunk) # Efek ketik
+                         progress.refresh() # Stream jalan di thread worker, render progress di sini
+                 for renderer in renderers.values():
+                     renderer.finish() # Hasil final tanpa kursor
+                 progress_bar.progress(100, text="Judul & deskripsi siap!")
+                 time.sleep(0.5); progress_bar.empty()
             except Exception as e:
-                 col2.error(f"Error bikin deskripsi: {e}"); progress_bar_desc.progress(100, text="Error."); time.sleep(1); progress_bar_desc.empty()
+                 st.error(f"Error bikin meta: {e}"); progress_bar.progress(100, text="Error."); time.sleep(1); progress_bar.empty()
         else:
             st.warning("Topiknya diisi dulu ya.")
+    show_stopped_output("meta")
+
+def run_seo_pack_ui(topic: str, num_keywords: int, num_variants: int, title_max_len: int, desc_max_len: int):
+    """SEO pack satu topik: tiap kolom diisi begitu kandidatnya selesai di-stream (lihat `generate_seo_pack`)."""
+    progress_text = "Lagi ngeracik keyword, judul & deskripsi..."
+    progress_bar = st.progress(0, text=progress_text)
+    progress = ThrottledProgress(progress_bar, progress_text)
+    placeholders = {}
+    for column, (field, heading) in zip(st.columns(3), (("keywords", "Keyword:"), ("titles", "Judul Meta:"),
+                                                         ("descriptions", "Deskripsi Meta:"))):
+        column.subheader(heading)
+        placeholders[field] = column.empty()
+    shown = {field: [] for field in placeholders}
+
+    def _on_item(field, _index, value):
+        shown[field].append(value)
+        if field == "keywords":
+            lines = [f"- {item}" for item in shown[field]]
+        else:
+            lines = [f"{i}. {item} `({len(item)})`" for i, item in enumerate(shown[field], start=1)]
+        placeholders[field].markdown("\n".join(lines))
+        progress.refresh()
+
+    def _partial():
+        return "\n\n".join("\n".join(f"- {item}" for item in shown[field]) for field in shown if shown[field])
+
+    try:
+        with stop_control("meta", partial=_partial) as cancel:
+            pack = generate_seo_pack(topic, num_keywords, num_variants, title_max_len, desc_max_len, on_item=_on_item,
+                                     on_progress=progress.track, on_queue=progress.queued, cancel=cancel)
+    except OllamaGenerationError as e:
+        st.error(f"Error bikin SEO pack: {e}"); progress_bar.empty()
+        return
+    progress_bar.progress(100, text="SEO pack siap!")
+    time.sleep(0.5); progress_bar.empty()
+    rejected = sum(len(values) for values in pack['rejected'].values())
+    st.caption(f"{pack['calls']} panggilan model"
+               + (f", {rejected} kandidat dibuang (kepanjangan / kosong / dobel)." if rejected else "."))
+    if pack['keywords']:
+        st.download_button(
+            label="Download Keywords (CSV)",
+            data=keywords_to_csv(pack['keywords']),
+            file_name=f"{topic.replace(' ','_')}_keywords.csv",
+            mime='text/csv',
+            key="download_pack_kw"
+        )
 
 def run_article_workflow_tab():
     """UI untuk alur kerja Artikel -> Humanize -> Tidy."""
@@ -414,45 +464,30 @@ def run_article_workflow_tab():
     prompt_user = st.text_area("Kasih ide atau topik artikelnya:", height=100, key="article_prompt")
     max_len_article = st.slider("Perkiraan panjang artikel (token):", 100, 1000, 400, key="article_len_slider")
 
-    if st.button("Buat Artikel Awal", key="generate_article_btn"):
+    job_busy = is_job_running("article")
+    col_generate, col_pipeline = st.columns(2)
+    if col_pipeline.button("⚡ Sekali Jalan: Buat + Humanize + Rapihkan", key="article_pipeline_btn", disabled=job_busy):
         if prompt_user:
-            st.session_state.current_article_text = "" # Reset text
-            progress_text = "AI lagi nulis artikel awal..."
-            progress_bar = st.progress(0, text=progress_text)
-            # Placeholder untuk live output dan hasil final
-            live_output_placeholder = st.empty()
-            collected_chunks = [] # Kumpulkan chunk untuk disimpan ke state
-            max_steps = 70 # Simulasi progress
-            step = 0
-
-            try:
-                # Stream dan kumpulkan hasil
-                for chunk in stream_article_generator(prompt_user, max_len_article):
-                    collected_chunks.append(chunk)
-                    # Tampilkan live di placeholder
-                    live_output_placeholder.markdown("".join(collected_chunks) + "▌") # Efek ketik
-                    # Update progress bar
-                    step += 1
-                    percentage = min(100, int((step / max_steps) * 100)) # Simulasi kasar
-                    progress_bar.progress(percentage, text=f"{progress_text} {percentage}%")
-
-                # Selesai streaming
-                final_text = "".join(collected_chunks)
-                st.session_state.current_article_text = final_text # Simpan hasil ke state
-                live_output_placeholder.markdown(final_text) # Tampilkan hasil final tanpa kursor
-                progress_bar.progress(100, text="Artikel awal selesai!")
-                time.sleep(1)
-                progress_bar.empty()
-                st.rerun() # Rerun untuk update tampilan text_area dan tombol
+            # Jalan sebagai job background: aman dari rerun / tab putus, output parsialnya ditampung di server
+            remember_job("article", submit_job("pipeline", article_pipeline_job, prompt_user, max_len_article,
+                                               label="Buat + humanize + rapihin artikel", owner=client_id()))
+            st.rerun() # Monitor job tampil di bawah, tombol dikunci selama job jalan
+        else:
+            st.warning("Isi dulu idenya ya.")
 
-            except Exception as e:
-                st.error(f"Error pas buat artikel awal: {e}")
-                progress_bar.progress(100, text="Error.")
-                time.sleep(1)
-                progress_bar.empty()
+    if col_generate.button("Buat Artikel Awal", key="generate_article_btn", disabled=job_busy):
+        if prompt_user:
+            remember_job("article", submit_job("article", article_job, prompt_user, max_len_article,
+                                               label="AI lagi nulis artikel awal", owner=client_id()))
+            st.rerun()
         else:
             st.warning("Isi dulu idenya ya.")
 
+    show_job_notice("article")
+    # Job yang lagi jalan (baru dikirim, atau nyambung lagi setelah rerun / reconnect)
+    if active_job("article") is not None:
+        job_monitor("article")
+
     st.markdown("---")
     st.subheader("Hasil Teks Saat Ini:")
 
@@ -472,64 +507,31 @@ def run_article_workflow_tab():
     # Tombol Humanize dan Tidy
     st.markdown("---")
     col1, col2 = st.columns(2)
-    humanize_button_disabled = not bool(st.session_state.current_article_text)
-    tidy_button_disabled = not bool(st.session_state.current_article_text)
+    humanize_button_disabled = not bool(st.session_state.current_article_text) or job_busy
+    tidy_button_disabled = not bool(st.session_state.current_article_text) or job_busy
+    is_long_article = len(st.session_state.current_article_text) > humanize_window_chars(HUMANIZE_WINDOW_TOKENS)
+    use_chunked = col1.checkbox("Humanize paralel per bagian (artikel panjang)", value=is_long_article, key="humanize_chunked")
+    humanize_workers = col1.slider("Bagian yang diproses bareng:", 1, 8, HUMANIZE_WORKERS, key="humanize_workers",
+                                   disabled=not use_chunked)
 
     if col1.button("🗣️ Humanize Teks Ini", key="humanize_btn", disabled=humanize_button_disabled):
-        text_to_process = st.session_state.current_article_text
-        progress_text = "Lagi ubah gaya bahasa..."
-        progress_bar = st.progress(0, text=progress_text)
-        collected_chunks = []
-        max_steps = 60
-        step = 0
-
-        try:
-            with processing_output_placeholder.container(): # Proses di placeholder terpisah
-                 st.markdown("`Lagi proses Humanize...`")
-                 live_stream_area = st.empty()
-                 for chunk in humanize_text(text_to_process):
-                      collected_chunks.append(chunk)
-                      live_stream_area.markdown("".join(collected_chunks) + "▌")
-                      step += 1
-                      percentage = min(100, int((step / max_steps) * 100))
-                      progress_bar.progress(percentage, text=f"{progress_text} {percentage}%")
-
-                 final_text = "".join(collected_chunks)
-                 st.session_state.current_article_text = final_text # Update state
-                 live_stream_area.markdown(final_text) # Hasil final
-                 progress_bar.progress(100, text="Humanize selesai!")
-                 time.sleep(1)
-                 progress_bar.empty()
-                 # Hapus pesan "Lagi proses..." setelah selesai
-                 processing_output_placeholder.empty()
-                 st.rerun() # Update tampilan utama
-
-        except Exception as e:
-             st.error(f"Error pas humanize: {e}")
-             progress_bar.progress(100, text="Error."); time.sleep(1); progress_bar.empty()
+        remember_job("article", submit_job("humanize", humanize_job, st.session_state.current_article_text,
+                                           chunked=use_chunked, max_workers=humanize_workers,
+                                           label="Lagi ubah gaya bahasa", owner=client_id()))
+        st.rerun()
 
     if col2.button("🧹 Rapihkan Teks Ini", key="tidy_btn", disabled=tidy_button_disabled):
         text_to_process = st.session_state.current_article_text
         progress_text = "Lagi rapihin teks..."
         progress_bar = st.progress(0, text=progress_text)
-        collected_chunks = []
-        max_steps = 60
-        step = 0
 
         try:
             with processing_output_placeholder.container(): # Proses di placeholder terpisah
                 st.markdown("`Lagi proses Tidy...`")
-                live_stream_area = st.empty()
-                for chunk in tidy_text(text_to_process):
-                     collected_chunks.append(chunk)
-                     live_stream_area.markdown("".join(collected_chunks) + "▌")
-                     step += 1
-                     percentage = min(100, int((step / max_steps) * 100))
-                     progress_bar.progress(percentage, text=f"{progress_text} {percentage}%")
-
-                final_text = "".join(collected_chunks)
+                # tidy_text balikin string utuh (bukan stream), jadi cukup dirender sekali
+                final_text = tidy_text(text_to_process)
                 st.session_state.current_article_text = final_text # Update state
-                live_stream_area.markdown(final_text) # Hasil final
+                st.markdown(final_text) # Hasil final
                 progress_bar.progress(100, text="Teks sudah rapi!")
                 time.sleep(1)
                 progress_bar.empty()
@@ -541,11 +543,144 @@ def run_article_workflow_tab():
             st.error(f"Error pas rapihin teks: {e}")
             progress_bar.progress(100, text="Error."); time.sleep(1); progress_bar.empty()
 
+    run_job_history()
+
+# --- Job Background (tugas panjang yang tahan rerun & reconnect) ---
+
+def client_id() -> str:
+    """ID klien browser, disimpan di URL (`?client=`) supaya tetap sama setelah refresh / reconnect."""
+    client = st.query_params.get("client")
+    if not client:
+        client = uuid.uuid4().hex[:12]
+        st.query_params["client"] = client
+    return client
+
+def active_job(slot: str):
+    """Job yang lagi dipantau di `slot` (dari session state, atau dari URL kalau sesinya baru)."""
+    job_id = st.session_state.get(f"job_{slot}") or st.query_params.get(f"job_{slot}")
+    return load_job_manager().get(job_id) if job_id else None
+
+def is_job_running(slot: str) -> bool:
+    job = active_job(slot)
+    return job is not None and not job.finished
+
+def remember_job(slot: str, job) -> None:
+    """Catat ID job di session state dan URL (`?job_<slot>=`), biar bisa disambung lagi."""
+    st.session_state[f"job_{slot}"] = job.id
+    st.query_params[f"job_{slot}"] = job.id
+
+def forget_job(slot: str) -> None:
+    st.session_state.pop(f"job_{slot}", None)
+    if f"job_{slot}" in st.query_params:
+        del st.query_params[f"job_{slot}"]
+
+def show_job_notice(slot: str) -> None:
+    """Tampilkan pesan hasil job terakhir di `slot` (disimpan sebelum rerun)."""
+    notice = st.session_state.pop(f"job_notice_{slot}", None)
+    if notice:
+        level, message = notice
+        getattr(st, level)(message)
+
+def render_job_output(job) -> None:
+    """Output parsial job dari buffer server."""
+    if job.kind == "pipeline":
+        items = job.read()
+        st.markdown("`Draft (lagi digenerate):`")
+        st.markdown("".join(item['text'] for item in items if item['stage'] == 'draft') + "▌")
+        st.markdown("`Hasil final:`")
+        for item in items:
+            if item['stage'] != 'draft' and item['error']:
+                st.warning(f"{item['error']} (pakai draft yang dirapihkan)")
+        st.markdown(job.result or "")
+    elif job.kind == "audit":
+        rows = audit_rows(job.read())
+        if rows:
+            st.dataframe(rows, use_container_width=True)
+    else:
+        st.markdown(job.text() + "▌")
+
+def finish_article_job(job) -> None:
+    """Pakai hasil job artikel/humanize/pipeline. Hasil parsial (gagal / dibatalkan) tetap disimpan."""
+    notice = None
+    if job.kind == "humanize":
+        if job.status == "done":
+            st.session_state.current_article_text = job.result or ""
+            notice = ("success", "Humanize selesai!")
+        else:
+            # Teks asli nggak ditimpa hasil setengah jadi; hasil parsialnya tetap ada di daftar job
+            notice = ("warning", f"Humanize {'dibatalkan' if job.status == 'cancelled' else 'gagal: ' + str(job.error)}. "
+                                 "Teks asli nggak diubah; hasil parsialnya bisa diambil di daftar job di bawah.")
+    else:
+        text = job.result if job.kind == "pipeline" else job.text()
+        st.session_state.current_article_text = text or ""
+        if job.status == "done":
+            notice = ("success", "Artikel sudah di-humanize & rapi!" if job.kind == "pipeline" else "Artikel awal selesai!")
+        else:
+            notice = ("warning", f"Job {'dibatalkan' if job.status == 'cancelled' else 'gagal: ' + str(job.error)}. "
+                                 "Bagian yang sudah jadi tetap disimpan.")
+    st.session_state.job_notice_article = notice
+
+def finish_audit_job(job) -> None:
+    st.session_state.audit_rows = audit_rows(job.read())
+    if job.status != "done":
+        st.session_state.job_notice_audit = ("warning", f"Audit {'dibatalkan' if job.status == 'cancelled' else 'gagal: ' + str(job.error)}. "
+                                                        "Halaman yang sudah selesai tetap disimpan.")
+
+JOB_FINISHERS = {"article": finish_article_job, "audit": finish_audit_job}
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_monitor(slot: str):
+    """
+    Pantau job di `slot` dengan polling buffer server (cuma fragment ini yang
+    di-rerun tiap `JOB_POLL_SECONDS`). Begitu selesai, hasilnya dipakai lalu
+    seluruh app di-rerun (monitor berhenti).
+    """
+    job = active_job(slot)
+    if job is None:
+        return
+    if job.finished:
+        forget_job(slot)
+        JOB_FINISHERS[slot](job)
+        st.rerun()
+    received, total = job.progress
+    percentage = min(99, int(received / total * 100)) if total else 0
+    if job.queue_position:
+        label = f"{job.label} (antre giliran AI, posisi {job.queue_position})"
+    else:
+        label = f"{job.label}... {percentage}% {job.detail}".strip()
+    st.progress(percentage, text=label)
+    if st.button("Batalkan", key=f"cancel_job_{slot}", disabled=job.cancel_requested):
+        job.cancel() # Keluar dari antrean / stream Ollama ditutup di chunk berikutnya; yang sudah jadi tetap disimpan
+    render_job_output(job)
+
+def run_job_history():
+    """Daftar job klien ini; hasil job mana pun (termasuk yang gagal/dibatalkan) bisa dipakai lagi."""
+    jobs = [job for job in load_job_manager().jobs(owner=client_id()) if job.kind in ("article", "humanize", "pipeline")]
+    if not jobs:
+        return
+    with st.expander(f"🗂️ Job background ({len(jobs)})"):
+        st.dataframe([job.status_row() for job in jobs], use_container_width=True, hide_index=True)
+        finished = [job for job in jobs if job.finished and (job.result or job.text())]
+        if finished:
+            labels = {f"{job.id} · {job.label} ({job.status})": job for job in finished}
+            choice = st.selectbox("Ambil hasil job:", list(labels), key="job_history_choice")
+            if st.button("Pakai hasil job ini", key="job_history_use"):
+                job = labels[choice]
+                st.session_state.current_article_text = (job.result if isinstance(job.result, str) and job.result else job.text())
+                st.rerun()
 
 def run_tab4(): # Sebelumnya run_tab6
     """UI untuk Tab Analisis SEO."""
     st.header("🔬 Analisis Konten SEO Dasar")
+    mode = st.radio("Mode:", ["Satu URL", "Audit massal (sitemap / daftar URL)"], horizontal=True, key="seo_mode")
+    if mode != "Satu URL":
+        run_site_audit_ui()
+        return
+
     url = st.text_input("Masukin URL yang mau dianalisis:", key="seo_url", placeholder="https://contoh.com")
+    focus_keyword = st.text_input("Keyword utama (opsional):", key="seo_focus_keyword",
+                                  help="Kosongin aja kalau mau ditebak dari istilah yang paling sering muncul.")
+    mode_label = st.radio("Mode analisis:", list(ANALYSIS_MODE_LABELS), horizontal=True, key="seo_analysis_mode")
 
     if st.button("Analisa URL!", key="seo_button"):
         if url:
@@ -553,198 +688,219 @@ def run_tab4(): # Sebelumnya run_tab6
                 st.error("URL harus lengkap pakai http:// atau https:// ya")
             else:
                 # Fungsi analyze_seo_ollama sudah handle progress bar internal
-                analysis_result = analyze_seo_ollama(url)
+                report, analysis_result = analyze_seo_ollama(url, ANALYSIS_MODE_LABELS[mode_label], focus_keyword)
                 st.subheader("Hasil Analisis:")
-                st.markdown(analysis_result) # Tampilkan hasil akhir
+                if report is not None:
+                    show_rules_report(report)
+                if analysis_result:
+                    st.markdown(analysis_result) # Tampilkan hasil akhir
         else:
             st.warning("URL-nya jangan lupa diisi.")
 
+def audit_rows(results: list) -> list:
+    """Baris tabel audit dari hasil per URL (`run_site_audit`), termasuk angka cek otomatis."""
+    rows = []
+    for result in results:
+        report = result.get('rules') or {}
+        rows.append({
+            "URL": result['url'],
+            "Status": result['status'],
+            "Skor On-page": report.get('score'),
+            "Kata": report.get('words'),
+            "Title (kar)": report.get('title', {}).get('length'),
+            "Meta (kar)": report.get('meta_description', {}).get('length'),
+            "H1": report.get('headings', {}).get('h1'),
+            "H2": report.get('headings', {}).get('h2'),
+            "Keterbacaan": report.get('readability', {}).get('score'),
+            "Alt Gambar (%)": report.get('images', {}).get('alt_coverage'),
+            "Link Internal": report.get('links', {}).get('internal'),
+            "Link Eksternal": report.get('links', {}).get('external'),
+            "Masalah": " ".join(report.get('issues', [])),
+            "Fetch (s)": result['fetch_seconds'],
+            "Analisis (s)": result['analyze_seconds'],
+            "Hasil Analisis": result.get('analysis') or result['error'],
+        })
+    return rows
+
+def run_site_audit_ui():
+    """UI untuk audit SEO massal dari sitemap.xml atau daftar URL."""
+    source = st.radio("Sumber URL:", ["Sitemap URL", "Daftar URL"], horizontal=True, key="audit_source")
+    if source == "Sitemap URL":
+        sitemap_url = st.text_input("URL sitemap.xml:", key="audit_sitemap", placeholder="https://contoh.com/sitemap.xml")
+        url_list_text = ""
+    else:
+        sitemap_url = ""
+        url_list_text = st.text_area("Satu URL per baris:", height=150, key="audit_url_list")
+    max_pages = st.slider("Maksimal halaman:", 10, 1000, 100, step=10, key="audit_max_pages")
+    col1, col2, col3 = st.columns(3)
+    per_host = col1.slider("Request bareng per host:", 1, 8, 4, key="audit_per_host")
+    min_interval = col2.slider("Jeda per host (detik):", 0.0, 2.0, 0.2, step=0.1, key="audit_interval")
+    analyze_workers = col3.slider("Analisis AI paralel:", 1, 8, 2, key="audit_workers")
+    metrics_only = st.checkbox("Metrik aja (cek otomatis tanpa AI, jauh lebih cepat)", key="audit_metrics_only")
+
+    audit_busy = is_job_running("audit")
+    if st.button("Mulai Audit!", key="audit_button", disabled=audit_busy):
+        if sitemap_url:
+            try:
+                response = load_http_session().get(sitemap_url, timeout=20)
+                response.raise_for_status()
+                urls = parse_url_source(response.text, load_http_session(), max_urls=max_pages)
+            except requests.exceptions.RequestException as e:
+                st.error(f"Error pas ambil sitemap: {e}")
+                return
+        else:
+            urls = parse_url_source(url_list_text, max_urls=max_pages)
+
+        if not urls:
+            st.warning("Nggak nemu URL yang bisa diaudit.")
+            return
+
+        # Audit jalan sebagai job background; tabelnya diisi dari buffer server
+        st.session_state.audit_rows = []
+        remember_job("audit", submit_job("audit", site_audit_job, urls, per_host, min_interval, analyze_workers,
+                                         "metrics" if metrics_only else "quick",
+                                         label=f"Audit {len(urls)} halaman", owner=client_id()))
+        st.rerun()
+
+    show_job_notice("audit")
+    if active_job("audit") is not None:
+        job_monitor("audit")
+
+    # Tabel & export tetap tampil setelah rerun (misal habis klik download)
+    rows = st.session_state.get("audit_rows")
+    if rows:
+        st.dataframe(rows, use_container_width=True)
+        csv_buffer = io.StringIO()
+        writer = csv.DictWriter(csv_buffer, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+        st.download_button(
+            label="Download Hasil Audit (CSV)",
+            data=csv_buffer.getvalue().encode('utf-8'),
+            file_name="seo_audit.csv",
+            mime='text/csv',
+            key="download_audit"
+        )
+
 def run_tab5(): # Sebelumnya run_tab7
     """UI untuk Tab AI Chat."""
     st.header(f"💬 Ngobrol sama BABAYO ver.01")
     st.caption("Tanya apa aja, dijawab pake gaya santai!")
 
-    # Initialize chat history
-    if "chat_messages_ollama" not in st.session_state:
-        st.session_state.chat_messages_ollama = []
+    # Initialize chat history (riwayat lengkap + ringkasan bergulir)
+    if "chat_memory_ollama" not in st.session_state:
+        st.session_state.chat_memory_ollama = ChatMemory(history_token_budget=CHAT_HISTORY_TOKENS)
+    memory = st.session_state.chat_memory_ollama
+    memory.chars_per_token = load_token_estimator().chars_per_token(OLLAMA_MODEL) # Ikut rasio token model yang sudah terkalibrasi
+    memory.poll() # Ambil ringkasan background kalau sudah jadi
 
     # Display chat messages
-    for message in st.session_state.chat_messages_ollama:
+    for message in memory.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
     # Accept user input
     if user_prompt := st.chat_input("Obrolan kamu:", key="chat_input_ollama"):
-        st.session_state.chat_messages_ollama.append({"role": "user", "content": user_prompt})
+        memory.add("user", user_prompt)
         with st.chat_message("user"):
             st.markdown(user_prompt)
 
         with st.chat_message("assistant"):
             output_placeholder = st.empty()
-            full_response_collected = ""
-            chat_prompt = f"User: {user_prompt}\nAssistant: ({INSTRUCTION_STYLE})"
-            try:
-                 response_stream = generate_ollama_stream_helper(chat_prompt, max_tokens=400)
-                 # Stream ke placeholder dan kumpulkan respons
-                 for chunk in response_stream:
-                      full_response_collected += chunk
-                      output_placeholder.markdown(full_response_collected + "▌") # Efek ketik
-                 output_placeholder.markdown(full_response_collected) # Hasil final
-
-            except Exception as e:
-                 error_msg = f"Waduh, error pas AI bales chat: {e}"
-                 output_placeholder.error(error_msg)
-                 full_response_collected = error_msg
-
-            st.session_state.chat_messages_ollama.append({"role": "assistant", "content": full_response_collected})
+            renderer = StreamRenderer(output_placeholder)
+            chat_messages = memory.build_messages(CHAT_SYSTEM_PROMPT)
+            # Dihentikan di tengah: balasan setengah jadi tetap masuk riwayat
+            with stop_control("chat", on_stop=lambda: memory.add("assistant", (renderer.text + " …_(dihentikan)_").strip())) as cancel:
+                response_stream = generate_ollama_chat_stream_helper(
+                    chat_messages, max_tokens=400, session_key=memory.session_id,
+                    on_queue=lambda position: output_placeholder.caption(f"Lagi antre giliran AI (posisi {position})...") if position else None,
+                    cancel=cancel
+                )
+                try:
+                     # Stream ke placeholder (render dibatasi frekuensinya) dan kumpulkan respons
+                     for chunk in response_stream:
+                          renderer.write(chunk) # Efek ketik
+                     full_response_collected = renderer.finish() # Hasil final
+
+                except Exception as e:
+                     error_msg = f"Waduh, error pas AI bales chat: {e}"
+                     output_placeholder.error(error_msg)
+                     full_response_collected = error_msg
+
+            memory.add("assistant", full_response_collected)
+
+        # Giliran lama diringkas di background; hasilnya dipakai di giliran berikutnya
+        pool = load_ollama_pool()
+        recorder = load_metrics_recorder()
+        scheduler = load_generation_scheduler()
+        memory.schedule_summary(load_background_executor(),
+                                lambda summary, messages: summarize_chat(pool, summary, messages, recorder,
+                                                                         session_key=memory.session_id,
+                                                                         scheduler=scheduler))
+        st.caption(f"Konteks: {len(chat_messages) - 1} pesan (≈{messages_tokens(chat_messages, memory.chars_per_token)} token)"
+                   + (", ringkasan obrolan lama lagi dibuat..." if memory.summarizing else ""))
 
     # Tombol Clear Chat
-    if len(st.session_state.chat_messages_ollama) > 0:
+    if len(memory.messages) > 0:
         if st.button("Bersihin Obrolan", key="clear_chat_ollama"):
-            st.session_state.chat_messages_ollama = []
+            del st.session_state.chat_memory_ollama
             st.rerun()
 
-# Consolidated CSS styles
-st.markdown("""
-<style>
-    /* Main layout and background */
-    .main .block-container {
-        background-color: #f0f2f6; /* Light grey background */
-        padding: 2rem 1.5rem 1rem 1.5rem; /* Adjust padding */
-        border-radius: 8px;
-    }
-    /* Buttons */
-    .stButton>button {
-        background-color: #4361ee; /* Primary blue */
-        color: white;
-        border-radius: 8px;
-        border: none;
-        padding: 0.6rem 1.2rem;
-        font-weight: bold;
-        transition: background-color 0.2s ease, transform 0.1s ease; /* Smooth hover effect */
-        cursor: pointer;
-    }
-    .stButton>button:hover {
-        background-color: #3a56d4; /* Darker blue */
-        box-shadow: 0 3px 6px rgba(0,0,0,0.15);
-        transform: translateY(-1px);
-    }
-    .stButton>button:active {
-        transform: translateY(0px);
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-    }
-    /* Specific button styling example */
-    /* Apply this ID or class to the button widget if needed: st.button("Humanize", key="...", class_name="humanize-btn") */
-    .humanize-btn { /* Using class instead of ID */
-        background-color: #198754; /* Green */
-    }
-    .humanize-btn:hover {
-        background-color: #157347; /* Darker green */
-    }
-
-    /* Input fields */
-    .stTextInput>div>div>input, .stTextArea>div>textarea, .stSelectbox>div>div {
-        border-radius: 6px;
-        border: 1px solid #ced4da; /* Standard border */
-        transition: border-color 0.2s ease, box-shadow 0.2s ease;
-    }
-    .stTextInput>div>div>input:focus, .stTextArea>div>textarea:focus, .stSelectbox>div>div:focus-within {
-        border-color: #4361ee; /* Highlight border on focus */
-        box-shadow: 0 0 0 3px rgba(67, 97, 238, 0.2); /* Focus ring */
-    }
-
-    /* Headings */
-    h1, h2, h3 {
-        color: #3a0ca3; /* Primary purple */
-        font-weight: 600; /* Slightly bolder */
-    }
-    h1 {
-        border-bottom: 3px solid #4361ee;
-        padding-bottom: 0.4em;
-        margin-bottom: 0.8em;
-        font-size: 2.2em; /* Slightly larger H1 */
-    }
-    h2 {
-        margin-top: 1.8em;
-        margin-bottom: 1em;
-        color: #4361ee; /* Secondary blue */
-        border-bottom: 1px solid #dfe3e8;
-        padding-bottom: 0.3em;
-        font-size: 1.8em;
-    }
-    h3 {
-        margin-top: 1.5em;
-        margin-bottom: 0.8em;
-        color: #5e60ce; /* Lighter purple */
-        font-size: 1.4em;
-        font-weight: 600;
-    }
-
-    /* Sidebar */
-    .sidebar .sidebar-content {
-        background-color: #ffffff; /* White sidebar */
-        border-right: 1px solid #dee2e6;
-    }
-
-    /* Tab styling */
-    .stTabs [role="tab"] {
-        font-weight: 600;
-        color: #4a4a4a;
-        padding: 0.8rem 1.2rem;
-        transition: background-color 0.2s ease, color 0.2s ease;
-    }
-    .stTabs [role="tab"]:hover {
-        background-color: #f8f9fa;
-        color: #3a0ca3;
-    }
-    .stTabs [role="tab"][aria-selected="true"] {
-        background-color: #e0e7ff; /* Light blue background for active tab */
-        color: #3a0ca3; /* Purple text for active tab */
-        border-bottom: 3px solid #4361ee; /* Blue underline */
-    }
-
-    /* DataFrame styling */
-    .stDataFrame {
-        border: 1px solid #dee2e6;
-        border-radius: 8px; /* More rounded */
-        overflow: hidden;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-    }
-
-    /* Button container */
-    .button-container {
-        display: flex;
-        gap: 12px; /* Slightly more spacing */
-        align-items: center;
-        flex-wrap: wrap; /* Allow wrapping */
-        margin-top: 15px;
-        margin-bottom: 10px;
-    }
-
-    /* Improve Progress Bar appearance */
-    .stProgress > div > div > div > div {
-        background-color: #4361ee; /* Match primary button blue */
-    }
-</style>
-""", unsafe_allow_html=True) # [cite: 156]
-
-# Centered image using columns
-col_img1, col_img2, col_img3 = st.columns([1, 4, 1]) # Adjust ratios as needed
-with col_img2:
-    st.image(
-        "https://i.pinimg.com/736x/70/3c/5b/703c5bd23ba74d7dfb264f3a546acb40.jpg", # Consider hosting image locally or using a more stable source
-        width=150, # Adjust width as desired
-        caption="The night whispers secrets only wolves understand. 💙✨"
-    )
+def run_stats_panel():
+    """Panel statistik inferensi: ke mana aja jatah waktu & token Ollama kepakai, plus status host."""
+    pool = load_ollama_pool()
+    if len(pool.hosts) > 1:
+        st.dataframe(pool.status(), use_container_width=True, hide_index=True)
+    scheduler_status = load_generation_scheduler().status()
+    st.caption(f"Generasi jalan: {scheduler_status['running']}/{scheduler_status['max_concurrent']} slot, "
+               f"antre: {scheduler_status['waiting']}/{scheduler_status['max_queue']}")
+    token_status = load_token_estimator().status().get(OLLAMA_MODEL)
+    if token_status and token_status['samples']:
+        st.caption(f"Rasio token {OLLAMA_MODEL}: ≈{token_status['chars_per_token']} karakter/token "
+                   f"(dari {token_status['samples']} generasi terakhir)")
+    startups = [record['seconds'] for record in load_startup_recorder().recent()]
+    if startups:
+        st.caption(f"Run pertama sesi: terakhir {startups[-1]:.2f} detik, median {sorted(startups)[len(startups) // 2]:.2f} detik "
+                   f"({len(startups)} sesi)")
+    recorder = load_metrics_recorder()
+    summary = recorder.summary_by_task()
+    if not summary:
+        st.caption("Belum ada panggilan Ollama yang tercatat.")
+        return
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    if st.checkbox("Lihat panggilan terakhir", key="stats_show_recent"):
+        st.dataframe(list(reversed(recorder.recent()[-50:])), use_container_width=True, hide_index=True)
+    if recorder.log_path:
+        st.caption(f"Log lengkap (JSONL, append-only): `{recorder.log_path}`")
 
 # --- Aplikasi Utama ---
+def render_header():
+    """CSS (dari `static/style.css`) dan logo di tengah."""
+    st.markdown(f"<style>\n{load_static_text('style.css')}</style>", unsafe_allow_html=True) # [cite: 156]
+
+    # Centered image using columns
+    col_img1, col_img2, col_img3 = st.columns([1, 4, 1]) # Adjust ratios as needed
+    with col_img2:
+        st.image(
+            logo_source(), # File lokal `static/wolf.jpg` (WOLF_LOGO_PATH), URL remote cuma cadangan
+            width=150, # Adjust width as desired
+            caption="The night whispers secrets only wolves understand. 💙✨"
+        )
+
 def main():
+    st.set_page_config(
+        page_title="Wolfgang AI SEO Tools v3 (Ollama Workflow)",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+    render_header()
     st.title("Chat & Automation Tools")
     st.markdown("SCROLL MENU 👇 - bagi pengguna browser di HP")
 
     if 'ollama_checked_v3' not in st.session_state:
-        load_ollama_client()
+        check_ollama_connection()
         st.session_state.ollama_checked_v3 = True
+    start_model_warmup() # Sekali per proses; model dimuat sementara UI sudah tampil
 
     # Definisi Tab (Mengurangi jumlah tab)
     tab_titles = [
@@ -767,10 +923,19 @@ def main():
     with tab5:
         run_tab5() # Sebelumnya run_tab7
 
+    with st.expander("📊 Statistik Inferensi"):
+        run_stats_panel()
+
     # --- Footer ---
     st.markdown("---")
     st.caption("© 2025 babyo AI - Wolfgang Tools, from json & teams - recoded by ChinQue, all rights reserved.")
 
+    # Waktu tampil run pertama per sesi (termasuk import kalau proses baru jalan), biar regresi kelihatan
+    if 'startup_recorded' not in st.session_state:
+        st.session_state.startup_recorded = True
+        startup_seconds = record_app_startup(_RUN_STARTED)
+        print(f"Run pertama sesi selesai dalam {startup_seconds:.2f} detik.")
+
 # Jalankan aplikasi
 if __name__ == "__main__":
     main()
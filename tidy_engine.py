@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Mesin "Rapihkan Teks" dengan regex yang dikompilasi sekali.
+
+Hasilnya sama dengan versi lama `tidy_text` (dicek lewat korpus golden di
+`bench/tidy_golden.json`), tapi jumlah lintasan ke teks jauh lebih sedikit:
+lintasan yang nggak perlu dilewati lewat cek `in`, pola cuma cocok di tempat
+yang benar-benar berubah, dan tanda hubung dicari langsung tanpa memindai
+tiap kata.
+"""
+import re
+
+# Koreksi kesalahan umum/ejaan: pola regex -> pengganti (case-insensitive)
+DEFAULT_REPLACEMENTS = {
+    r"\baku arium\b": "akuarium",
+    r"\bper hatian\b": "perhatian",
+    r"\bng gak\b": "nggak",
+    r"\bgak\b": "tidak",
+    r"\bgimana\b": "bagaimana"
+}
+
+# Pola-pola di bawah cuma cocok di tempat yang memang berubah, jadi spasi
+# tunggal yang sudah benar (mayoritas teks) nggak bikin match sama sekali.
+_SPACE_RUN_RE = re.compile(r'\t[ \t]*| [ \t]+')  # Spasi/tab berulang -> satu spasi
+_SPACE_AROUND_NEWLINE_RE = re.compile(r' \n ?|\n ')  # Spasi sebelum/sesudah baris baru
+_EXTRA_NEWLINES_RE = re.compile(r'\n{3,}')  # Maksimal dua baris baru berturut-turut
+# Tanda baca: tanpa spasi sebelum, satu spasi sesudah. Tanda baca yang sudah diikuti
+# tepat satu spasi + kata dilewati (hasilnya toh sama).
+_PUNCT_SPACING_RE = re.compile(r'\s+([.,!?])\s*|([.,!?])(?! (?:[^\s.,!?]|\Z))\s*')
+_WORD_RE = re.compile(r'\w+')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n[ \t]*\n\s*')  # Baris kosong = batas paragraf
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?]) +')
+# Pola koreksi yang isinya cuma kata biasa (boleh diapit \b) dicari pakai str.find
+_LITERAL_PATTERN_RE = re.compile(r'(\\b)?([a-z0-9 ]+)(\\b)?')
+# Karakter yang bikin str.lower() nggak sejajar dengan regex IGNORECASE
+# ('İ' jadi dua karakter, 'ı' dan 'ſ' tetap cocok dengan 'i' / 's' di regex)
+_CASE_FOLD_SPECIALS = ('\u0130', '\u0131', '\u017f')
+
+
+def split_paragraphs(text: str) -> list:
+    """Pecah teks jadi paragraf (dipisah baris kosong), sudah di-strip dan tanpa yang kosong."""
+    return [paragraph.strip() for paragraph in _PARAGRAPH_BREAK_RE.split(text) if paragraph.strip()]
+
+
+def _is_word_char(char: str) -> bool:
+    # Sama dengan \w di regex Unicode
+    return char.isalnum() or char == '_'
+
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    # Sama dengan \b: karakter kiri dan kanan beda jenis (kata / bukan kata)
+    left = index > 0 and _is_word_char(text[index - 1])
+    right = index < len(text) and _is_word_char(text[index])
+    return left != right
+
+
+def _replace_literal(text: str, lowered: str, literal: str, replacement: str, left_boundary: bool, right_boundary: bool) -> str:
+    """Ganti kemunculan `literal` (case-insensitive lewat `lowered`) seperti `re.sub` non-overlapping."""
+    parts = []
+    last_index = 0
+    start = lowered.find(literal)
+    while start != -1:
+        end = start + len(literal)
+        if (not left_boundary or _is_word_boundary(text, start)) and (not right_boundary or _is_word_boundary(text, end)):
+            parts.append(text[last_index:start])
+            parts.append(replacement)
+            last_index = end
+            start = lowered.find(literal, end)
+        else:
+            start = lowered.find(literal, start + 1)
+    if not parts:
+        return text
+    parts.append(text[last_index:])
+    return ''.join(parts)
+
+
+def _fix_hyphens(text: str) -> str:
+    r"""
+    Rapatkan spasi di sekitar tanda hubung, sama persis dengan
+    `re.sub(r'\b(\w+)\s*-\s*(\w+)\b', r'\1-\2', text)`.
+
+    Regex lama memasangkan kata secara berurutan: di rantai "a - b - c - d"
+    cuma penghubung ke-1, ke-3, dst. yang dirapatkan (kata kanan sudah
+    "terpakai"). Di sini yang dipindai cuma tanda hubungnya, bukan tiap kata.
+    """
+    parts = []
+    last_index = 0
+    previous_end = -1
+    chain_position = 0
+    length = len(text)
+    position = text.find('-')
+    while position != -1:
+        # Penghubung = spasi* '-' spasi*, diapit karakter kata di kiri dan kanan
+        start = position
+        while start > 0 and text[start - 1].isspace():
+            start -= 1
+        end = position + 1
+        while end < length and text[end].isspace():
+            end += 1
+        if start > 0 and end < length and _is_word_char(text[start - 1]) and _is_word_char(text[end]):
+            # Masih satu rantai kalau di antara dua penghubung cuma ada satu kata
+            if previous_end >= 0 and _WORD_RE.fullmatch(text, previous_end, start):
+                chain_position += 1
+            else:
+                chain_position = 0
+            previous_end = end
+            if chain_position % 2 == 0 and end - start > 1:
+                parts.append(text[last_index:start])
+                parts.append('-')
+                last_index = end
+        position = text.find('-', position + 1)
+    if not parts:
+        return text
+    parts.append(text[last_index:])
+    return ''.join(parts)
+
+
+class TidyEngine:
+    """
+    Mesin perapih teks yang bisa dipakai ulang.
+
+    Args:
+        replacements (dict): Tabel koreksi `pola regex -> pengganti`. Default:
+            `DEFAULT_REPLACEMENTS`. Pola dijalankan berurutan (case-insensitive).
+            Pola yang isinya kata biasa (misal `\\bgak\\b`) dicari pakai `str.find`
+            di teks huruf kecil, bukan regex IGNORECASE yang lambat.
+    """
+
+    def __init__(self, replacements: dict = None):
+        self.replacements = dict(DEFAULT_REPLACEMENTS if replacements is None else replacements)
+        self._compiled_replacements = []
+        for pattern, replacement in self.replacements.items():
+            literal_match = _LITERAL_PATTERN_RE.fullmatch(pattern)
+            if literal_match and '\\' not in replacement:
+                literal = (literal_match.group(2), bool(literal_match.group(1)), bool(literal_match.group(3)))
+            else:
+                literal = None
+            self._compiled_replacements.append((re.compile(pattern, re.IGNORECASE), replacement, literal))
+
+    def _apply_replacements(self, text: str) -> str:
+        use_literals = not any(char in text for char in _CASE_FOLD_SPECIALS)
+        lowered = text.lower() if use_literals else None
+        for pattern, replacement, literal in self._compiled_replacements:
+            if use_literals and literal is not None:
+                replaced = _replace_literal(text, lowered, literal[0], replacement, literal[1], literal[2])
+            else:
+                replaced = pattern.sub(replacement, text)
+            if replaced is not text:
+                text = replaced
+                lowered = text.lower() if use_literals else None
+        return text
+
+    def tidy(self, text: str) -> str:
+        """
+        Bersihkan format, spasi, tanda baca, ejaan umum, dan kapitalisasi kalimat.
+
+        Args:
+            text (str): Teks mentah.
+
+        Returns:
+            str: Teks yang sudah rapi.
+        """
+        # 1. Normalisasi spasi & baris baru (dilewati kalau memang nggak ada yang perlu diubah)
+        cleaned_text = text
+        if '\t' in cleaned_text or '  ' in cleaned_text:
+            cleaned_text = _SPACE_RUN_RE.sub(' ', cleaned_text)
+        if ' \n' in cleaned_text or '\n ' in cleaned_text:
+            cleaned_text = _SPACE_AROUND_NEWLINE_RE.sub('\n', cleaned_text)
+        if '\n\n\n' in cleaned_text:
+            cleaned_text = _EXTRA_NEWLINES_RE.sub('\n\n', cleaned_text)
+        # 2. Spasi tanda baca
+        cleaned_text = _PUNCT_SPACING_RE.sub(r'\1\2 ', cleaned_text).strip()
+        # 3. Tanda hubung
+        cleaned_text = _fix_hyphens(cleaned_text)
+        # 4. Koreksi ejaan umum
+        cleaned_text = self._apply_replacements(cleaned_text)
+        # 5. Kapitalisasi huruf pertama tiap kalimat (sisanya huruf kecil, seperti str.capitalize)
+        return ' '.join(sentence.capitalize() for sentence in _SENTENCE_SPLIT_RE.split(cleaned_text)).strip()
+
+    def tidy_many(self, texts) -> list:
+        """
+        Rapihkan banyak teks sekaligus (misal artikel hasil export).
+
+        Args:
+            texts (iterable): Kumpulan teks.
+
+        Returns:
+            list: Teks yang sudah rapi, urutannya sama dengan input.
+        """
+        return [self.tidy(text) for text in texts]
+
+    def tidy_paragraphs(self, text: str) -> str:
+        """
+        Rapihkan teks per paragraf, jadi baris kosong antar paragraf tetap ada.
+
+        `tidy` biasa menggabungkan paragraf yang diakhiri tanda baca; versi ini
+        dipakai pipeline artikel yang merapihkan paragraf satu per satu.
+
+        Args:
+            text (str): Teks mentah (boleh beberapa paragraf).
+
+        Returns:
+            str: Paragraf yang sudah rapi, dipisah satu baris kosong.
+        """
+        return '\n\n'.join(self.tidy(paragraph) for paragraph in split_paragraphs(text))
+
+
+class ParagraphBuffer:
+    """
+    Penampung teks streaming yang mengeluarkan paragraf begitu selesai
+    (ketemu baris kosong), tanpa memindai ulang teks yang sudah lewat.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+
+    def feed(self, chunk: str) -> list:
+        """
+        Tambah potongan teks.
+
+        Returns:
+            list: Paragraf yang baru selesai (sudah di-strip), bisa kosong.
+        """
+        # Batas paragraf cuma berisi spasi, jadi yang baru pasti mulai di spasi ujung teks lama atau di chunk baru
+        scan_from = len(self._buffer.rstrip())
+        self._buffer += chunk
+        paragraphs = []
+        paragraph_start = 0
+        for match in _PARAGRAPH_BREAK_RE.finditer(self._buffer, scan_from):
+            if match.end() == len(self._buffer):
+                break  # Spasi di ujung buffer bisa masih nyambung ke chunk berikutnya
+            paragraph = self._buffer[paragraph_start:match.start()].strip()
+            if paragraph:
+                paragraphs.append(paragraph)
+            paragraph_start = match.end()
+        if paragraph_start:
+            self._buffer = self._buffer[paragraph_start:]
+        return paragraphs
+
+    def flush(self) -> list:
+        """Keluarkan sisa teks sebagai paragraf terakhir (dipanggil setelah stream selesai)."""
+        paragraph = self._buffer.strip()
+        self._buffer = ''
+        return [paragraph] if paragraph else []
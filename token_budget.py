@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Perkiraan jumlah token yang dikalibrasi per model.
+
+Rasio karakter per token dipelajari dari `prompt_eval_count` yang dilaporkan
+Ollama (panjang prompt yang dikirim vs token yang dihitung tokenizer model),
+disimpan per model di cache disk, lalu dipakai buat ngatur panjang prompt dan
+`num_predict` tiap tugas supaya pas dengan jendela konteks.
+"""
+import math
+import statistics
+import threading
+from collections import deque
+
+from disk_cache import make_cache_key
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+TEMPLATE_OVERHEAD_TOKENS = 8  # Kira-kira token template prompt (penanda giliran, BOS) di luar teks prompt
+MIN_SAMPLE_CHARS = 200  # Prompt yang lebih pendek didominasi overhead template, jadi nggak dipakai
+# Rasio di luar rentang ini hampir pasti bukan tokenisasi penuh (misal awalan prompt kepakai
+# dari KV cache, jadi `prompt_eval_count` cuma menghitung sisanya)
+MIN_CHARS_PER_TOKEN = 1.5
+MAX_CHARS_PER_TOKEN = 8.0
+
+
+def round_up(value: float, step: int) -> int:
+    """Bulatkan ke atas ke kelipatan `step` (biar jatah token stabil & kunci cache generasi nggak gampang berubah)."""
+    return int(math.ceil(value / step) * step)
+
+
+class TokenEstimator:
+    """
+    Perkiraan token per model dari median rasio karakter/token sampel terakhir.
+    Aman dipanggil dari banyak thread.
+
+    Args:
+        cache (DiskCache): Tempat menyimpan sampel per model antar restart. None = cuma di memori.
+        default_chars_per_token (float): Rasio sebelum ada sampel.
+        max_samples (int): Jumlah sampel terbaru yang dipakai per model.
+    """
+
+    def __init__(self, cache=None, default_chars_per_token: float = DEFAULT_CHARS_PER_TOKEN, max_samples: int = 64):
+        self.cache = cache
+        self.default_chars_per_token = default_chars_per_token
+        self.max_samples = max_samples
+        self._samples = {}  # Model -> deque rasio
+        self._lock = threading.Lock()
+
+    def _model_samples(self, model: str) -> deque:
+        samples = self._samples.get(model)
+        if samples is None:
+            stored = self.cache.get(make_cache_key('chars_per_token', model)) if self.cache is not None else None
+            samples = deque(stored or [], maxlen=self.max_samples)
+            self._samples[model] = samples
+        return samples
+
+    def observe(self, model: str, prompt_chars: int, prompt_tokens: int) -> bool:
+        """
+        Catat satu sampel dari generasi yang selesai.
+
+        Args:
+            model (str): Nama model.
+            prompt_chars (int): Panjang prompt yang dikirim (karakter).
+            prompt_tokens (int): `prompt_eval_count` dari chunk terakhir Ollama.
+
+        Returns:
+            bool: True kalau sampelnya dipakai.
+        """
+        if not prompt_tokens or prompt_chars < MIN_SAMPLE_CHARS:
+            return False
+        ratio = prompt_chars / max(prompt_tokens - TEMPLATE_OVERHEAD_TOKENS, 1)
+        if not MIN_CHARS_PER_TOKEN <= ratio <= MAX_CHARS_PER_TOKEN:
+            return False
+        with self._lock:
+            samples = self._model_samples(model)
+            samples.append(round(ratio, 3))
+            snapshot = list(samples)
+        if self.cache is not None:
+            self.cache.set(make_cache_key('chars_per_token', model), snapshot)
+        return True
+
+    def chars_per_token(self, model: str) -> float:
+        """Rasio karakter per token model ini (dibulatkan 0,1 biar stabil)."""
+        with self._lock:
+            samples = self._model_samples(model)
+            ratio = statistics.median(samples) if samples else self.default_chars_per_token
+        return round(ratio, 1)
+
+    def count(self, model: str, text: str) -> int:
+        """Perkiraan jumlah token `text`."""
+        return int(math.ceil(len(text) / self.chars_per_token(model)))
+
+    def chars_for(self, model: str, tokens: int) -> int:
+        """Perkiraan jumlah karakter yang muat di `tokens` token."""
+        return int(tokens * self.chars_per_token(model))
+
+    def output_tokens(self, model: str, chars: float, slack: float = 1.25, extra: int = 16) -> int:
+        """
+        `num_predict` buat output yang panjangnya kira-kira `chars` karakter.
+
+        Args:
+            slack (float): Kelonggaran relatif (model jarang pas persis sesuai panjang yang diminta).
+            extra (int): Kelonggaran tetap (kalimat pembuka, tanda kutip, dll).
+        """
+        return round_up(chars * slack / self.chars_per_token(model) + extra, 16)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {model: {'chars_per_token': round(statistics.median(samples), 2) if samples else None,
+                            'samples': len(samples)}
+                    for model, samples in self._samples.items()}
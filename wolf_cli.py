@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+CLI batch: jalankan tugas SEO dari file JSONL (atau stdin) tanpa browser.
+
+Satu baris = satu job, misal:
+    {"id": "a1", "task": "keywords", "topic": "kopi susu", "count": 15}
+    {"id": "a2", "task": "meta_title", "topic": "kopi susu", "max_length": 60}
+    {"id": "a3", "task": "article", "prompt": "tips seduh kopi", "max_len": 600, "humanize": true, "tidy": true}
+    {"id": "a4", "task": "analyze", "url": "https://contoh.com/artikel", "mode": "metrics", "keyword": "kopi susu"}
+    {"id": "a5", "task": "cluster", "keywords": ["kopi susu", "kopi susu gula aren", "..."], "clusters": 5}
+    {"id": "a6", "task": "seo_pack", "topic": "kopi susu", "count": 10, "variants": 3}
+
+Tugas: keywords, meta_title, meta_description, seo_pack, article, humanize, tidy, analyze, cluster.
+seo_pack = keyword + kandidat title + kandidat description sekali generasi (JSON), bukan tiga.
+Mode analyze: quick (default), deep, metrics (cek otomatis aja, tanpa Ollama).
+Hasil ditulis satu baris JSONL begitu tiap job selesai (urutan selesai, bukan urutan input):
+    {"id": "a1", "task": "keywords", "status": "ok", "result": ["..."], "error": null, "seconds": 1.23}
+
+Contoh:
+    python wolf_cli.py jobs.jsonl -o hasil.jsonl --workers 8
+    cat jobs.jsonl | python wolf_cli.py > hasil.jsonl
+    python wolf_cli.py jobs.jsonl -o hasil.jsonl --resume   # Lewati job yang sudah sukses di hasil.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import seo_tasks
+from generation_scheduler import PRIORITY_BULK, GenerationScheduler
+
+
+def _require(job: dict, field: str):
+    value = job.get(field)
+    if value in (None, ""):
+        raise ValueError(f"Field '{field}' wajib diisi buat tugas '{job.get('task')}'.")
+    return value
+
+
+def _run_keywords(job: dict):
+    chunks = seo_tasks.stream_keywords(_require(job, 'topic'), int(job.get('count', 10)), raise_errors=True,
+                                       priority=PRIORITY_BULK)
+    return seo_tasks.parse_keywords("".join(chunks))
+
+
+def _run_meta_title(job: dict):
+    return "".join(seo_tasks.stream_meta_title(_require(job, 'topic'), int(job.get('max_length', 60)),
+                                               variant=int(job.get('variant', 0)), raise_errors=True)).strip()
+
+
+def _run_meta_description(job: dict):
+    return "".join(seo_tasks.stream_meta_description(_require(job, 'topic'), int(job.get('max_length', 160)),
+                                                     variant=int(job.get('variant', 0)), raise_errors=True)).strip()
+
+
+def _run_seo_pack(job: dict):
+    return seo_tasks.generate_seo_pack(_require(job, 'topic'), int(job.get('count', 10)), int(job.get('variants', 3)),
+                                       int(job.get('title_max_length', 60)), int(job.get('description_max_length', 160)),
+                                       priority=PRIORITY_BULK)
+
+
+def _run_article(job: dict):
+    text = "".join(seo_tasks.stream_article_generator(_require(job, 'prompt'), int(job.get('max_len', 400)),
+                                                      raise_errors=True))
+    if job.get('humanize'):
+        text = "".join(seo_tasks.humanize_text_chunked(text, raise_errors=True))
+    if job.get('tidy'):
+        text = seo_tasks.tidy_text(text)
+    return text
+
+
+def _run_humanize(job: dict):
+    return "".join(seo_tasks.humanize_text_chunked(_require(job, 'text'), raise_errors=True))
+
+
+def _run_tidy(job: dict):
+    return seo_tasks.tidy_text(_require(job, 'text'))
+
+
+def _run_analyze(job: dict):
+    return seo_tasks.analyze_url(_require(job, 'url'), mode=job.get('mode', 'quick'), focus_keyword=job.get('keyword'))
+
+
+def _run_cluster(job: dict):
+    keywords = _require(job, 'keywords')
+    if not isinstance(keywords, list):
+        raise ValueError("Field 'keywords' harus list keyword.")
+    clusters = job.get('clusters')
+    return seo_tasks.dedupe_and_cluster_keywords(keywords, int(clusters) if clusters else None)
+
+
+TASKS = {
+    'keywords': _run_keywords,
+    'meta_title': _run_meta_title,
+    'meta_description': _run_meta_description,
+    'seo_pack': _run_seo_pack,
+    'article': _run_article,
+    'humanize': _run_humanize,
+    'tidy': _run_tidy,
+    'analyze': _run_analyze,
+    'cluster': _run_cluster,
+}
+
+
+def run_job(job: dict) -> dict:
+    """
+    Jalankan satu job; error apa pun dicatat di hasil (nggak menghentikan batch).
+
+    Returns:
+        dict: `id`, `task`, `status` (`'ok'` / `'error'`), `result`, `error`, `seconds`.
+    """
+    started = time.perf_counter()
+    result = {'id': job.get('id'), 'task': job.get('task'), 'status': 'ok', 'result': None, 'error': None}
+    try:
+        runner = TASKS.get(job.get('task'))
+        if runner is None:
+            raise ValueError(f"Tugas '{job.get('task')}' nggak dikenal. Pilihan: {', '.join(TASKS)}.")
+        result['result'] = runner(job)
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def read_jobs(lines, skip_ids: set = frozenset()):
+    """
+    Baca job dari baris JSONL. Baris kosong dilewati; baris rusak jadi hasil error.
+    Job tanpa `id` dapat id nomor barisnya.
+
+    Yields:
+        dict: Job, atau hasil error (`status='error'`) untuk baris yang nggak valid.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("Job harus objek JSON.")
+        except ValueError as e:
+            yield {'id': line_number, 'task': None, 'status': 'error', 'result': None,
+                   'error': f"Baris {line_number} bukan JSON yang valid: {e}", 'seconds': 0.0}
+            continue
+        job.setdefault('id', line_number)
+        if job['id'] in skip_ids:
+            continue
+        yield job
+
+
+def run_jobs(jobs, workers: int):
+    """
+    Jalankan job lewat worker pool. Input dibaca bertahap (maks `workers * 2`
+    job yang antre), jadi ribuan job nggak dimuat sekaligus ke memori.
+
+    Yields:
+        dict: Hasil per job sesuai urutan selesai.
+    """
+    max_pending = max(workers, 1) * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wolf-cli") as executor:
+        pending = set()
+        for job in jobs:
+            if job.get('status') == 'error':  # Baris rusak dari read_jobs
+                yield job
+                continue
+            pending.add(executor.submit(run_job, job))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def load_done_ids(path: str) -> set:
+    """ID job yang sudah sukses di file hasil (buat `--resume`)."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # Baris terakhir bisa kepotong kalau proses sebelumnya mati
+            if result.get('status') == 'ok':
+                done.add(result.get('id'))
+    return done
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Jalankan tugas SEO dari JSONL tanpa browser")
+    parser.add_argument("input", nargs="?", default="-", help="File JSONL job (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="File JSONL hasil (default: stdout)")
+    parser.add_argument("--workers", type=int,
+                        default=seo_tasks.GENERATION_SLOTS_PER_HOST * len(seo_tasks.OLLAMA_HOSTS),
+                        help="Job yang jalan bareng (default: total slot generasi semua host)")
+    parser.add_argument("--resume", action="store_true", help="Lewati job yang sudah sukses di file output")
+    args = parser.parse_args()
+
+    if args.resume and args.output == "-":
+        parser.error("--resume butuh --output berupa file.")
+    # Penjadwal khusus CLI: jumlah job yang jalan sudah dibatasi di sini, jadi antreannya nggak perlu dibatasi
+    seo_tasks.load_generation_scheduler.install(GenerationScheduler(
+        max_concurrent=seo_tasks.GENERATION_SLOTS_PER_HOST * len(seo_tasks.OLLAMA_HOSTS), max_queue=None))
+
+    skip_ids = load_done_ids(args.output) if args.resume else frozenset()
+    source = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8')
+    sink = sys.stdout if args.output == "-" else open(args.output, 'a' if args.resume else 'w', encoding='utf-8')
+    counts = {'ok': 0, 'error': 0}
+    started = time.perf_counter()
+    try:
+        for result in run_jobs(read_jobs(source, skip_ids), args.workers):
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            sink.flush()  # Hasil langsung kelihatan / aman kalau proses mati di tengah
+            counts[result['status']] += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"Selesai: {counts['ok']} sukses, {counts['error']} gagal, {time.perf_counter() - started:.1f} detik"
+          + (f" ({len(skip_ids)} dilewati)" if skip_ids else ""), file=sys.stderr)
+    return 0 if counts['error'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())